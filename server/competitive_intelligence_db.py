@@ -225,18 +225,7 @@ class CompetitiveIntelligenceDB:
                             title, content, sentiment, rating, relevance_score,
                             confidence_score, extraction_date
                         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        company_id, dimension_id,
-                        item.get('source_type', 'unknown'),
-                        item.get('source_url'),
-                        item.get('title'),
-                        item.get('content', ''),
-                        item.get('sentiment'),
-                        item.get('rating'),
-                        item.get('relevance_score', 0.0),
-                        item.get('confidence_score', 0.0),
-                        item.get('extraction_date', datetime.now().isoformat())
-                    ))
+                    """, self._intelligence_row(company_id, dimension_id, item))
                     
                     inserted_count += 1
                 
@@ -252,36 +241,101 @@ class CompetitiveIntelligenceDB:
             logger.error(f"Error inserting competitive intelligence for {company_name} - {dimension}: {e}")
             raise
     
-    def _update_aggregated_scores(self, company_id: int, dimension_id: int):
-        """Update aggregated scores for a company and dimension"""
+    def insert_competitive_intelligence_bulk(self, company_name: str,
+                                             data_by_dimension: Dict[str, List[Dict[str, Any]]]) -> Dict[str, int]:
+        """Insert competitive intelligence data for several dimensions of a company in one transaction"""
         try:
+            company_id = self.insert_company(company_name)
+            inserted_counts = {}
+            
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                # Calculate aggregated score
-                cursor.execute("""
-                    SELECT AVG(relevance_score), COUNT(*)
-                    FROM competitive_intelligence
-                    WHERE company_id = ? AND dimension_id = ?
-                """, (company_id, dimension_id))
-                
-                result = cursor.fetchone()
-                if result and result[0]:
-                    avg_score = result[0]
-                    count = result[1]
+                cursor.execute("SELECT name, id FROM dimensions")
+                dimension_ids = dict(cursor.fetchall())
+                
+                rows = []
+                updated_dimension_ids = []
+                for dimension, data in data_by_dimension.items():
+                    dimension_id = dimension_ids.get(dimension)
+                    if not dimension_id:
+                        logger.error(f"Dimension {dimension} not found")
+                        inserted_counts[dimension] = 0
+                        continue
                     
-                    # Insert or update aggregated score
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO dimension_scores 
-                        (company_id, dimension_id, aggregated_score, data_points_count, last_updated)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (company_id, dimension_id, avg_score, count, datetime.now()))
+                    rows.extend(self._intelligence_row(company_id, dimension_id, item) for item in data)
+                    inserted_counts[dimension] = len(data)
+                    if data:
+                        updated_dimension_ids.append(dimension_id)
+                
+                cursor.executemany("""
+                    INSERT INTO competitive_intelligence (
+                        company_id, dimension_id, source_type, source_url,
+                        title, content, sentiment, rating, relevance_score,
+                        confidence_score, extraction_date
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                
+                # Update aggregated scores in the same transaction
+                for dimension_id in updated_dimension_ids:
+                    self._write_aggregated_score(cursor, company_id, dimension_id)
                 
                 conn.commit()
+                logger.info(f"Inserted {len(rows)} competitive intelligence records for {company_name} "
+                            f"across {len(updated_dimension_ids)} dimensions")
+                
+                return inserted_counts
+                
+        except Exception as e:
+            logger.error(f"Error bulk inserting competitive intelligence for {company_name}: {e}")
+            raise
+    
+    @staticmethod
+    def _intelligence_row(company_id: int, dimension_id: int, item: Dict[str, Any]) -> Tuple:
+        return (
+            company_id, dimension_id,
+            item.get('source_type', 'unknown'),
+            item.get('source_url'),
+            item.get('title'),
+            item.get('content', ''),
+            item.get('sentiment'),
+            item.get('rating'),
+            item.get('relevance_score', 0.0),
+            item.get('confidence_score', 0.0),
+            item.get('extraction_date', datetime.now().isoformat())
+        )
+    
+    def _update_aggregated_scores(self, company_id: int, dimension_id: int):
+        """Update aggregated scores for a company and dimension"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                self._write_aggregated_score(cursor, company_id, dimension_id)
+                conn.commit()
                 
         except Exception as e:
             logger.error(f"Error updating aggregated scores: {e}")
     
+    def _write_aggregated_score(self, cursor, company_id: int, dimension_id: int):
+        # Calculate aggregated score
+        cursor.execute("""
+            SELECT AVG(relevance_score), COUNT(*)
+            FROM competitive_intelligence
+            WHERE company_id = ? AND dimension_id = ?
+        """, (company_id, dimension_id))
+        
+        result = cursor.fetchone()
+        if result and result[0]:
+            avg_score = result[0]
+            count = result[1]
+            
+            # Insert or update aggregated score
+            cursor.execute("""
+                INSERT OR REPLACE INTO dimension_scores 
+                (company_id, dimension_id, aggregated_score, data_points_count, last_updated)
+                VALUES (?, ?, ?, ?, ?)
+            """, (company_id, dimension_id, avg_score, count, datetime.now()))
+    
     def get_competitive_intelligence(self, company_name: str, dimension: str) -> List[Dict[str, Any]]:
         """Get competitive intelligence data for a company and dimension"""
         try:
@@ -1,14 +1,11 @@
 # competitive_intelligence_scraper.py
 import os
 import json
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Tuple
 import logging
 from dotenv import load_dotenv
-import time
-import re
 from urllib.parse import urlparse, urljoin
 import hashlib
 import feedparser
@@ -16,7 +13,21 @@ from bs4 import BeautifulSoup
 import csv
 import markdown
 import docx
-from functools import wraps
+
+from concurrent_scrape_engine import ConcurrentScrapeEngine, ScrapeJob
+from rate_limiter import acquire as acquire_rate_limit
+from resilience import resilient_get
+from http_cache import get_http_cache
+from http_client import create_session
+from robots_cache import ensure_allowed as ensure_robots_allowed
+from raw_html_archive import archive_body
+from parsed_document import ParsedDocument
+from extraction_pool import get_extraction_pool
+from keyword_matcher import KeywordHits, KeywordTaxonomy
+from extraction_patterns import (
+    AUTH_PATTERNS, CODE_STRUCTURE_PATTERN, CONTENT_TYPE_PATTERNS, ENDPOINT_URL_PATTERN, HTTP_METHOD_PATH_PATTERN,
+    OPENAPI_URL_PATTERNS, RATE_LIMIT_PATTERNS, SPEC_URL_PATTERNS, FoldedText
+)
 
 # Load environment variables
 load_dotenv()
@@ -32,23 +43,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def rate_limited(max_per_second=2):
-    """Simple rate limiting decorator for respectful crawling"""
-    def decorator(func):
-        last_called = {}
-        
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            now = time.time()
-            if func.__name__ in last_called:
-                time_since_last = now - last_called[func.__name__]
-                if time_since_last < 1.0 / max_per_second:
-                    time.sleep(1.0 / max_per_second - time_since_last)
-            
-            last_called[func.__name__] = time.time()
-            return func(*args, **kwargs)
-        return wrapper
-    return decorator
+# Strategic dimensions: indicator -> (terms, weight). An item counts towards an
+# indicator when any of its terms occurs in the item's text.
+STRATEGIC_INDICATORS = {
+    'api_first_architecture': {
+        'api_documentation': (['api', 'endpoint', 'api documentation'], 20),
+        'rest_graphql': (['rest', 'graphql', 'swagger', 'openapi'], 20),
+        'sdk_libraries': (['sdk', 'client library', 'npm', 'pip', 'maven'], 15),
+        'webhooks': (['webhook', 'callback', 'event-driven'], 15),
+        'authentication': (['authentication', 'oauth', 'api key', 'jwt'], 15),
+        'versioning': (['versioning', 'v1', 'v2', 'v3', 'api version'], 15),
+    },
+    'cloud_native_features': {
+        'multi_cloud': (['multi-cloud', 'hybrid cloud', 'cross-cloud'], 20),
+        'auto_scaling': (['auto-scaling', 'elastic', 'auto-scale', 'dynamic scaling'], 20),
+        'serverless': (['serverless', 'lambda', 'function as a service', 'faas'], 20),
+        'containers': (['container', 'kubernetes', 'docker', 'orchestration'], 15),
+        'microservices': (['microservices', 'distributed', 'service mesh'], 15),
+        'infrastructure_as_code': (['infrastructure as code', 'terraform', 'cloudformation', 'iac'], 10),
+    },
+    'data_integration': {
+        'real_time': (['real-time', 'streaming', 'live data', 'instant'], 20),
+        'etl_pipelines': (['etl', 'elt', 'data pipeline', 'data transformation'], 20),
+        'connectors': (['connector', 'integration', 'plugin', 'add-on'], 20),
+        'data_warehouses': (['data warehouse', 'snowflake', 'bigquery', 'redshift'], 15),
+        'data_mesh': (['data mesh', 'data fabric', 'distributed data'], 15),
+        'open_formats': (['open format', 'parquet', 'avro', 'json', 'csv'], 10),
+    },
+    'developer_experience': {
+        'self_service': (['self-service', 'provisioning', 'self-provision'], 25),
+        'ci_cd': (['ci/cd', 'pipeline', 'deployment', 'continuous'], 20),
+        'documentation': (['developer documentation', 'getting started', 'tutorial'], 20),
+        'examples': (['sample code', 'example', 'code sample', 'demo'], 15),
+        'community': (['community', 'forum', 'support', 'developer portal'], 10),
+        'playground': (['playground', 'sandbox', 'api explorer', 'interactive'], 10),
+    },
+    'modern_analytics': {
+        'ai_ml': (['ai', 'machine learning', 'ml', 'artificial intelligence'], 20),
+        'real_time_analytics': (['real-time analytics', 'streaming analytics', 'live insights'], 20),
+        'collaboration': (['collaborative', 'team analytics', 'shared workspace'], 20),
+        'natural_language': (['natural language', 'nlp', 'conversational', 'chat'], 15),
+        'automation': (['automated insights', 'auto-discovery', 'smart suggestions'], 15),
+        'governance': (['governance', 'compliance', 'security', 'data lineage'], 10),
+    },
+}
+
+# All indicator terms compiled into one matcher, keyed by (dimension, indicator)
+STRATEGIC_TAXONOMY = KeywordTaxonomy({
+    (dimension, indicator): terms
+    for dimension, indicators in STRATEGIC_INDICATORS.items()
+    for indicator, (terms, _) in indicators.items()
+})
+
+def determine_positioning(overall_score):
+    """Competitive positioning for an overall strategic score"""
+    if overall_score >= 80:
+        return 'Leader'
+    elif overall_score >= 60:
+        return 'Transitioning'
+    else:
+        return 'Legacy'
 
 class CompetitiveIntelligenceScraper:
     """
@@ -58,11 +112,19 @@ class CompetitiveIntelligenceScraper:
     
     def __init__(self, firecrawl_api_key: Optional[str] = None):
         self.firecrawl_api_key = firecrawl_api_key or os.getenv('FIRECRAWL_API_KEY')
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         
+        # Conditional-GET cache shared with the other scrapers
+        self.http_cache = get_http_cache()
+        
+        # Concurrent engine: hosts in parallel, politeness applied per host
+        self.scrape_engine = ConcurrentScrapeEngine(
+            max_workers=int(os.getenv('SCRAPE_MAX_WORKERS', '8')),
+            per_host_delay=float(os.getenv('SCRAPE_PER_HOST_DELAY', '2.0'))
+        )
+        
         # Initialize preset competitor groups
         self.preset_groups = self._initialize_preset_groups()
         
@@ -99,35 +161,8 @@ class CompetitiveIntelligenceScraper:
             'data democratization', 'self-service analytics', 'embedded analytics'
         ]
         
-        # Content type detection patterns
-        self.content_patterns = {
-            'api_docs': [
-                r'\b(api|endpoint|rest|graphql|swagger|openapi)\b',
-                r'https?://[^\s]+\.json',
-                r'https?://[^\s]+\.yaml',
-                r'https?://[^\s]+\.yml',
-                r'POST|GET|PUT|DELETE|PATCH',
-                r'status code|response code|error code'
-            ],
-            'sdk_docs': [
-                r'\b(sdk|client library|download|install|npm|pip|maven|gradle)\b',
-                r'github\.com|gitlab\.com|bitbucket\.org',
-                r'package\.json|requirements\.txt|pom\.xml|build\.gradle',
-                r'installation guide|getting started|quick start'
-            ],
-            'pricing': [
-                r'\b(price|plan|tier|billing|subscription|cost|pricing|enterprise)\b',
-                r'\$\d+|\d+\s*(per month|per year|monthly|yearly)',
-                r'contact sales|request quote|pricing calculator',
-                r'free|starter|professional|enterprise|custom'
-            ],
-            'deployment': [
-                r'\b(deploy|installation|setup|configuration|environment)\b',
-                r'docker|kubernetes|aws|azure|gcp|on-premise',
-                r'installation guide|deployment guide|setup instructions',
-                r'requirements|prerequisites|system requirements'
-            ]
-        }
+        # Content type detection patterns (compiled once, shared)
+        self.content_patterns = CONTENT_TYPE_PATTERNS
         
         # Company-specific technical keywords
         self.company_technical_keywords = {
@@ -138,6 +173,8 @@ class CompetitiveIntelligenceScraper:
             'looker': ['lookml', 'explore', 'dashboard', 'block', 'looker studio', 'bigquery', 'data warehouse'],
             'qlik': ['qlikview', 'qliksense', 'script', 'load script', 'qlik engine', 'associative engine']
         }
+        # Every company's keywords compiled into one matcher
+        self.company_keyword_taxonomy = KeywordTaxonomy(self.company_technical_keywords)
         
     def _initialize_preset_groups(self) -> Dict[str, Dict[str, Any]]:
         """Initialize preset competitor groups for quick analysis"""
@@ -214,6 +251,30 @@ class CompetitiveIntelligenceScraper:
     def scrape_company_data(self, company: str, urls: Dict[str, str], 
                            categories: List[str], page_limit: int = 10) -> Dict[str, Any]:
         """Scrape data for a single company across specified categories"""
+        jobs = self._build_category_jobs(company, urls, categories, page_limit)
+        outcomes = self.scrape_engine.run(jobs)
+        return self._assemble_company_data(company, urls, categories, outcomes)
+    
+    def _build_category_jobs(self, company: str, urls: Dict[str, str], categories: List[str],
+                             page_limit: int, key_prefix: Tuple = ()) -> List[ScrapeJob]:
+        """Build one engine job per category that has a URL configured"""
+        jobs = []
+        for category in categories:
+            if category in urls and urls[category]:
+                jobs.append(ScrapeJob(
+                    key_prefix + (company, category), urls[category],
+                    self._scrape_category_job, company, category, urls[category], page_limit
+                ))
+        return jobs
+    
+    def _scrape_category_job(self, company: str, category: str, url: str, page_limit: int) -> Dict[str, Any]:
+        """Engine entry point for a single company/category scrape"""
+        logger.info(f"Scraping {category} for {company}")
+        return self._scrape_category(company, category, url, page_limit)
+    
+    def _assemble_company_data(self, company: str, urls: Dict[str, str], categories: List[str],
+                               outcomes: Dict[Tuple, Tuple[bool, Any]], key_prefix: Tuple = ()) -> Dict[str, Any]:
+        """Assemble engine outcomes into the per-company result structure, in category order"""
         company_data = {
             'company': company,
             'scraped_at': datetime.now().isoformat(),
@@ -229,29 +290,25 @@ class CompetitiveIntelligenceScraper:
         
         for category in categories:
             if category in urls and urls[category]:
-                try:
-                    logger.info(f"Scraping {category} for {company}")
-                    category_data = self._scrape_category(
-                        company, category, urls[category], page_limit
-                    )
-                    company_data['categories'][category] = category_data
-                    
-                    # Update summary
-                    company_data['summary']['total_items'] += len(category_data.get('items', []))
-                    company_data['summary']['total_words'] += category_data.get('total_words', 0)
-                    company_data['summary']['total_links'] += category_data.get('total_links', 0)
-                    company_data['summary']['total_images'] += category_data.get('total_images', 0)
-                    company_data['summary']['rich_content_count'] += category_data.get('rich_content_count', 0)
-                    
-                    # Add delay to avoid overwhelming servers
-                    time.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {category} for {company}: {str(e)}")
+                ok, category_data = outcomes.get(
+                    key_prefix + (company, category), (False, RuntimeError('scrape job did not run'))
+                )
+                if not ok:
+                    logger.error(f"Error scraping {category} for {company}: {str(category_data)}")
                     company_data['categories'][category] = {
-                        'error': str(e),
+                        'error': str(category_data),
                         'status': 'failed'
                     }
+                    continue
+                
+                company_data['categories'][category] = category_data
+                
+                # Update summary
+                company_data['summary']['total_items'] += len(category_data.get('items', []))
+                company_data['summary']['total_words'] += category_data.get('total_words', 0)
+                company_data['summary']['total_links'] += category_data.get('total_links', 0)
+                company_data['summary']['total_images'] += category_data.get('total_images', 0)
+                company_data['summary']['rich_content_count'] += category_data.get('rich_content_count', 0)
         
         return company_data
     
@@ -315,8 +372,8 @@ class CompetitiveIntelligenceScraper:
                 
         except Exception as e:
             logger.error(f"Error scraping marketing site: {str(e)}")
-            # Return mock data for demonstration
-            items = self._generate_mock_marketing_data(url, page_limit)
+            # Surface the failure to the category instead of substituting mock data
+            raise
         
         return items
     
@@ -332,7 +389,7 @@ class CompetitiveIntelligenceScraper:
                 
         except Exception as e:
             logger.error(f"Error scraping documentation: {str(e)}")
-            items = self._generate_mock_documentation_data(url, page_limit)
+            raise
         
         return items
     
@@ -385,11 +442,16 @@ class CompetitiveIntelligenceScraper:
         return self._generate_mock_data_for_category(url, page_limit, category)
     
     def _scrape_with_requests(self, url: str, page_limit: int, category: str) -> List[Dict[str, Any]]:
-        """Basic scraping using requests and BeautifulSoup"""
+        """Basic scraping using requests and BeautifulSoup
+        
+        Fetch failures (after the shared retry policy, or a host whose circuit
+        breaker is open) are raised rather than replaced by mock data.
+        """
         items = []
         
         try:
-            response = self.session.get(url, timeout=10)
+            ensure_robots_allowed(url)
+            response = resilient_get(self.session, url, timeout=10, before_attempt=lambda: acquire_rate_limit(url))
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -423,8 +485,8 @@ class CompetitiveIntelligenceScraper:
             items.append(item)
             
         except Exception as e:
-            logger.error(f"Error in basic scraping: {str(e)}")
-            items = self._generate_mock_data_for_category(url, page_limit, category)
+            logger.error(f"Error in basic scraping of {url}: {str(e)}")
+            raise
         
         return items
     
@@ -453,23 +515,15 @@ class CompetitiveIntelligenceScraper:
         else:
             processed_item['content_quality'] = 'basic'
         
-        # Extract links if not already present
+        # Extract links and images if not already present (parsing the HTML at most once)
+        content_html = item.get('content_html', '')
+        doc = ParsedDocument(content_html) if content_html and (
+            'link_count' not in processed_item or 'image_count' not in processed_item) else None
         if 'link_count' not in processed_item:
-            content_html = item.get('content_html', '')
-            if content_html:
-                soup = BeautifulSoup(content_html, 'html.parser')
-                processed_item['link_count'] = len(soup.find_all('a', href=True))
-            else:
-                processed_item['link_count'] = 0
+            processed_item['link_count'] = len(doc.links) if doc else 0
         
-        # Extract images if not already present
         if 'image_count' not in processed_item:
-            content_html = item.get('content_html', '')
-            if content_html:
-                soup = BeautifulSoup(content_html, 'html.parser')
-                processed_item['image_count'] = len(soup.find_all('img'))
-            else:
-                processed_item['image_count'] = 0
+            processed_item['image_count'] = len(doc.images) if doc else 0
         
         # Generate unique ID
         processed_item['id'] = self._generate_item_id(processed_item)
@@ -483,6 +537,31 @@ class CompetitiveIntelligenceScraper:
     
     def batch_scrape_group(self, group: Dict[str, Any], page_limit: int = 10) -> Dict[str, Any]:
         """Scrape data for an entire competitor group"""
+        jobs, failed_companies = self._build_group_jobs(group, page_limit)
+        outcomes = self.scrape_engine.run(jobs)
+        return self._assemble_group_results(group, outcomes, failed_companies)
+    
+    def _build_group_jobs(self, group: Dict[str, Any], page_limit: int,
+                          key_prefix: Tuple = ()) -> Tuple[List[ScrapeJob], Dict[str, str]]:
+        """Build engine jobs for every company in a group, collecting per-company setup errors"""
+        jobs: List[ScrapeJob] = []
+        failed_companies: Dict[str, str] = {}
+        
+        for company in group['companies']:
+            try:
+                company_urls = group['company_urls'].get(company, {})
+                jobs.extend(self._build_category_jobs(
+                    company, company_urls, group['categories'], page_limit, key_prefix
+                ))
+            except Exception as e:
+                logger.error(f"Error scraping {company}: {str(e)}")
+                failed_companies[company] = str(e)
+        
+        return jobs, failed_companies
+    
+    def _assemble_group_results(self, group: Dict[str, Any], outcomes: Dict[Tuple, Tuple[bool, Any]],
+                                failed_companies: Dict[str, str], key_prefix: Tuple = ()) -> Dict[str, Any]:
+        """Assemble engine outcomes into the per-group result structure"""
         group_results = {
             'group_name': group['name'],
             'group_key': group.get('group_key', 'custom'),
@@ -499,28 +578,24 @@ class CompetitiveIntelligenceScraper:
         }
         
         for company in group['companies']:
-            try:
-                logger.info(f"Scraping data for {company}")
-                company_urls = group['company_urls'].get(company, {})
-                company_data = self.scrape_company_data(
-                    company, company_urls, group['categories'], page_limit
-                )
-                
-                group_results['companies'][company] = company_data
-                
-                # Update group summary
-                group_results['summary']['total_items'] += company_data['summary']['total_items']
-                group_results['summary']['total_words'] += company_data['summary']['total_words']
-                group_results['summary']['total_links'] += company_data['summary']['total_links']
-                group_results['summary']['total_images'] += company_data['summary']['total_images']
-                group_results['summary']['rich_content_count'] += company_data['summary']['rich_content_count']
-                
-            except Exception as e:
-                logger.error(f"Error scraping {company}: {str(e)}")
+            if company in failed_companies:
                 group_results['companies'][company] = {
-                    'error': str(e),
+                    'error': failed_companies[company],
                     'status': 'failed'
                 }
+                continue
+            
+            company_data = self._assemble_company_data(
+                company, group['company_urls'].get(company, {}), group['categories'], outcomes, key_prefix
+            )
+            group_results['companies'][company] = company_data
+            
+            # Update group summary
+            group_results['summary']['total_items'] += company_data['summary']['total_items']
+            group_results['summary']['total_words'] += company_data['summary']['total_words']
+            group_results['summary']['total_links'] += company_data['summary']['total_links']
+            group_results['summary']['total_images'] += company_data['summary']['total_images']
+            group_results['summary']['rich_content_count'] += company_data['summary']['rich_content_count']
         
         return group_results
     
@@ -537,17 +612,17 @@ class CompetitiveIntelligenceScraper:
             }
         }
         
-        for group_key, group in self.preset_groups.items():
+        # Queue every group's jobs into a single engine run so that all hosts
+        # across all groups are scraped in parallel
+        loaded_groups: Dict[str, Tuple[Dict[str, Any], Dict[str, str]]] = {}
+        jobs: List[ScrapeJob] = []
+        for group_key in self.preset_groups:
             try:
+                group = self.load_preset_group(group_key)
                 logger.info(f"Starting mass scrape for group: {group['name']}")
-                group_results = self.batch_scrape_group(group, page_limit)
-                all_results['groups'][group_key] = group_results
-                
-                # Update overall summary
-                all_results['overall_summary']['total_companies'] += group_results['summary']['total_companies']
-                all_results['overall_summary']['total_items'] += group_results['summary']['total_items']
-                all_results['overall_summary']['total_words'] += group_results['summary']['total_words']
-                
+                group_jobs, failed_companies = self._build_group_jobs(group, page_limit, (group_key,))
+                jobs.extend(group_jobs)
+                loaded_groups[group_key] = (group, failed_companies)
             except Exception as e:
                 logger.error(f"Error in mass scrape for group {group_key}: {str(e)}")
                 all_results['groups'][group_key] = {
@@ -555,6 +630,20 @@ class CompetitiveIntelligenceScraper:
                     'status': 'failed'
                 }
         
+        outcomes = self.scrape_engine.run(jobs)
+        
+        for group_key in self.preset_groups:
+            if group_key not in loaded_groups:
+                continue
+            group, failed_companies = loaded_groups[group_key]
+            group_results = self._assemble_group_results(group, outcomes, failed_companies, (group_key,))
+            all_results['groups'][group_key] = group_results
+            
+            # Update overall summary
+            all_results['overall_summary']['total_companies'] += group_results['summary']['total_companies']
+            all_results['overall_summary']['total_items'] += group_results['summary']['total_items']
+            all_results['overall_summary']['total_words'] += group_results['summary']['total_words']
+        
         all_results['mass_scrape_completed'] = datetime.now().isoformat()
         return all_results
     
@@ -815,46 +904,64 @@ class CompetitiveIntelligenceScraper:
             return []
 
     def enhanced_technical_scraping(self, company: str, urls: Dict[str, str]) -> Dict[str, Any]:
-        """Enhanced scraping with technical content focus - 12-hour MVP enhancement"""
+        """Enhanced scraping with technical content focus - 12-hour MVP enhancement
+        
+        Pages are fetched here and parsed on the extraction process pool, so the
+        next fetch overlaps with the previous page's extraction.
+        """
         results = {}
+        pending = {}
+        pool = get_extraction_pool()
         
         for category, url in urls.items():
             try:
                 logger.info(f"Enhanced technical scraping for {company} - {category}")
                 
                 # Use existing scraping logic
-                content = self._scrape_url(url)
-                
-                # Enhanced content extraction
-                structured_data = self._extract_technical_content(content, company)
+                content = self._scrape_url(url, category, company=company)
                 
-                # Quality scoring
-                quality_score = self._calculate_content_quality(structured_data)
-                
-                # Technical relevance assessment
-                technical_relevance = self._assess_technical_relevance(category, content)
+                # Extraction and scoring run on a worker process
+                pending[category] = (url, pool.submit(content, url, company, category))
                 
+            except Exception as e:
+                logger.error(f"Error in enhanced technical scraping for {category}: {str(e)}")
+                results[category] = {'error': str(e)}
+        
+        for category in urls:
+            if category not in pending:
+                continue
+            url, future = pending[category]
+            try:
                 results[category] = {
-                    'content': structured_data,
-                    'quality_score': quality_score,
-                    'technical_relevance': technical_relevance,
+                    **future.result(),
                     'scraped_at': datetime.now().isoformat(),
                     'url': url
                 }
-                
             except Exception as e:
                 logger.error(f"Error in enhanced technical scraping for {category}: {str(e)}")
                 results[category] = {'error': str(e)}
         
-        return results
+        return {category: results[category] for category in urls}
 
-    def _extract_technical_content(self, html_content: str, company: str = "") -> Dict[str, Any]:
+    def _extract_page(self, html: str, url: str, company: str, category: str) -> Dict[str, Any]:
+        """Extraction, quality and relevance of one fetched page (the extraction pool's task)"""
+        # Enhanced content extraction (the page is parsed once for every extractor)
+        structured_data = self._extract_technical_content(ParsedDocument(html, url), company)
+        return {
+            'content': structured_data,
+            'quality_score': self._calculate_content_quality(structured_data),
+            'technical_relevance': self._assess_technical_relevance(category, html)
+        }
+
+    def _extract_technical_content(self, html_content: Union[str, ParsedDocument], company: str = "") -> Dict[str, Any]:
         """Extract technical content using enhanced BeautifulSoup - Phase 1 implementation"""
+        doc = html_content if isinstance(html_content, ParsedDocument) else None
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            doc = doc or ParsedDocument(html_content)
+            soup = doc.soup
             
             # Extract tables (existing functionality)
-            tables = soup.find_all('table')
+            tables = doc.tables
             table_data = []
             for table in tables:
                 table_data.append({
@@ -865,14 +972,14 @@ class CompetitiveIntelligenceScraper:
                 })
             
             # Extract code blocks with enhanced analysis
-            code_blocks = soup.find_all(['code', 'pre'])
+            code_blocks = doc.code_blocks
             code_data = []
             for block in code_blocks:
                 code_info = self._analyze_code_block(block)
                 code_data.append(code_info)
             
             # Extract links with technical relevance scoring
-            links = soup.find_all('a')
+            links = doc.links
             link_data = []
             for link in links:
                 href = link.get('href')
@@ -884,20 +991,23 @@ class CompetitiveIntelligenceScraper:
             technical_metadata = self._extract_technical_metadata(soup)
             
             # Detect OpenAPI specifications
-            openapi_specs = self.detect_openapi_specs(html_content)
+            openapi_specs = self.detect_openapi_specs(doc)
             
             # Classify overall content
-            text_content = soup.get_text(strip=True)
-            content_classification = self.classify_technical_content(text_content, company)
+            text_content = doc.text
+            content_classification = self.classify_technical_content(doc, company)
+            
+            # Lowercased once for the pattern extractors below
+            folded_text = FoldedText(text_content, doc.text_lower)
             
             # Extract API endpoints from text content
-            api_endpoints = self._extract_api_endpoints_from_text(text_content)
+            api_endpoints = self._extract_api_endpoints_from_text(folded_text)
             
             # Extract authentication patterns
-            auth_patterns = self._extract_authentication_patterns(text_content)
+            auth_patterns = self._extract_authentication_patterns(folded_text)
             
             # Extract rate limiting information
-            rate_limit_info = self._extract_rate_limit_info(text_content)
+            rate_limit_info = self._extract_rate_limit_info(folded_text)
             
             return {
                 'tables': table_data,
@@ -911,7 +1021,7 @@ class CompetitiveIntelligenceScraper:
                 'authentication_patterns': auth_patterns,
                 'rate_limit_info': rate_limit_info,
                 'has_forms': len(soup.find_all('form')) > 0,
-                'has_images': len(soup.find_all('img')) > 0,
+                'has_images': len(doc.images) > 0,
                 'has_videos': len(soup.find_all(['video', 'iframe'])) > 0,
                 'extraction_timestamp': datetime.now().isoformat()
             }
@@ -920,7 +1030,7 @@ class CompetitiveIntelligenceScraper:
             logger.error(f"Error extracting technical content: {str(e)}")
             return {
                 'error': str(e),
-                'text_content': html_content[:1000] if html_content else '',
+                'text_content': (doc.html if doc else html_content or '')[:1000],
                 'tables': [],
                 'code_blocks': [],
                 'links': [],
@@ -931,21 +1041,22 @@ class CompetitiveIntelligenceScraper:
         """Enhanced code block analysis with technical indicators"""
         try:
             code_text = code_block.get_text(strip=True)
+            code_lower = code_text.lower()
             language = self._detect_code_language(code_block)
             
             # Extract technical indicators
             technical_indicators = []
-            if 'api' in code_text.lower() or 'endpoint' in code_text.lower():
+            if 'api' in code_lower or 'endpoint' in code_lower:
                 technical_indicators.append('api_related')
-            if 'auth' in code_text.lower() or 'token' in code_text.lower():
+            if 'auth' in code_lower or 'token' in code_lower:
                 technical_indicators.append('authentication')
-            if 'sdk' in code_text.lower() or 'client' in code_text.lower():
+            if 'sdk' in code_lower or 'client' in code_lower:
                 technical_indicators.append('sdk_related')
-            if 'config' in code_text.lower() or 'setup' in code_text.lower():
+            if 'config' in code_lower or 'setup' in code_lower:
                 technical_indicators.append('configuration')
             
             # Calculate complexity score
-            complexity_score = self._calculate_code_complexity(code_text)
+            complexity_score = self._calculate_code_complexity(code_text, code_lower)
             
             return {
                 'html': str(code_block),
@@ -974,6 +1085,7 @@ class CompetitiveIntelligenceScraper:
         try:
             href = link.get('href')
             link_text = link.get_text(strip=True)
+            link_text_lower = link_text.lower()
             
             # Score technical relevance
             technical_score = 0.0
@@ -982,28 +1094,29 @@ class CompetitiveIntelligenceScraper:
             # Check link text for technical keywords
             for category, keywords in self.technical_keywords.items():
                 for keyword in keywords:
-                    if keyword.lower() in link_text.lower():
+                    if keyword.lower() in link_text_lower:
                         technical_score += 0.1
                         technical_indicators.append(f"{category}:{keyword}")
             
             # Check URL for technical patterns
             if href:
-                if any(pattern in href.lower() for pattern in ['/api/', '/docs/', '/developers/', '/reference/']):
+                href_lower = href.lower()
+                if any(pattern in href_lower for pattern in ['/api/', '/docs/', '/developers/', '/reference/']):
                     technical_score += 0.3
                     technical_indicators.append('technical_url_pattern')
-                if any(ext in href.lower() for ext in ['.json', '.yaml', '.yml', '.md']):
+                if any(ext in href_lower for ext in ['.json', '.yaml', '.yml', '.md']):
                     technical_score += 0.2
                     technical_indicators.append('technical_file_extension')
             
             # Company-specific relevance
             if company:
                 company_lower = company.lower()
-                for comp, keywords in self.company_technical_keywords.items():
+                company_hits = self.company_keyword_taxonomy.scan(link_text_lower, lowered=True)
+                for comp in self.company_technical_keywords:
                     if comp in company_lower:
-                        for keyword in keywords:
-                            if keyword.lower() in link_text.lower():
-                                technical_score += 0.2
-                                technical_indicators.append(f"company_specific:{keyword}")
+                        for keyword in company_hits.present(comp):
+                            technical_score += 0.2
+                            technical_indicators.append(f"company_specific:{keyword}")
             
             return {
                 'url': href,
@@ -1036,9 +1149,10 @@ class CompetitiveIntelligenceScraper:
         else:
             return 'non_technical'
 
-    def _calculate_code_complexity(self, code_text: str) -> float:
+    def _calculate_code_complexity(self, code_text: str, code_lower: Optional[str] = None) -> float:
         """Calculate code complexity score"""
         try:
+            code_lower = code_lower if code_lower is not None else code_text.lower()
             complexity_score = 0.0
             
             # Basic complexity indicators
@@ -1049,17 +1163,17 @@ class CompetitiveIntelligenceScraper:
             elif len(code_text) > 100:
                 complexity_score += 0.1
             
-            # Function/class complexity
-            function_count = len(re.findall(r'\b(def|function|class)\b', code_text, re.IGNORECASE))
+            # Function/class and import/dependency keywords, counted in one scan
+            keyword_groups = [m.lastgroup for m in CODE_STRUCTURE_PATTERN.finditer(FoldedText(code_text, code_lower))]
+            function_count = keyword_groups.count('definitions')
             complexity_score += min(0.3, function_count * 0.05)
             
-            # Import/dependency complexity
-            import_count = len(re.findall(r'\b(import|from|require|include)\b', code_text, re.IGNORECASE))
+            import_count = keyword_groups.count('imports')
             complexity_score += min(0.2, import_count * 0.03)
             
             # Error handling complexity
             error_patterns = ['try:', 'catch', 'except', 'finally', 'error', 'exception']
-            error_count = sum(1 for pattern in error_patterns if pattern in code_text.lower())
+            error_count = sum(1 for pattern in error_patterns if pattern in code_lower)
             complexity_score += min(0.2, error_count * 0.05)
             
             return min(1.0, complexity_score)
@@ -1067,14 +1181,13 @@ class CompetitiveIntelligenceScraper:
         except Exception:
             return 0.0
 
-    def _extract_api_endpoints_from_text(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_api_endpoints_from_text(self, text: Union[str, FoldedText]) -> List[Dict[str, Any]]:
         """Extract API endpoint patterns from text content"""
         try:
             endpoints = []
             
             # Look for URL patterns that might be API endpoints
-            url_pattern = r'https?://[^\s]+(/api/[^\s]+|/v\d+/[^\s]+|/[a-z]+/[a-z0-9_-]+)'
-            url_matches = re.findall(url_pattern, text, re.IGNORECASE)
+            url_matches = ENDPOINT_URL_PATTERN.findall(text)
             
             for match in url_matches:
                 if any(keyword in match.lower() for keyword in ['api', 'v1', 'v2', 'v3', 'rest', 'graphql']):
@@ -1085,8 +1198,7 @@ class CompetitiveIntelligenceScraper:
                     })
             
             # Look for HTTP method + path patterns
-            http_pattern = r'\b(GET|POST|PUT|DELETE|PATCH)\s+([/\w-]+)'
-            http_matches = re.findall(http_pattern, text, re.IGNORECASE)
+            http_matches = HTTP_METHOD_PATH_PATTERN.findall(text)
             
             for method, path in http_matches:
                 if any(keyword in path.lower() for keyword in ['api', 'endpoint', 'v1', 'v2', 'v3']):
@@ -1103,65 +1215,24 @@ class CompetitiveIntelligenceScraper:
             logger.error(f"Error extracting API endpoints: {str(e)}")
             return []
 
-    def _extract_authentication_patterns(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_authentication_patterns(self, text: Union[str, FoldedText]) -> List[Dict[str, Any]]:
         """Extract authentication patterns from text content"""
         try:
             auth_patterns = []
+            text = FoldedText.of(text)
             
-            # OAuth patterns
-            oauth_patterns = [
-                r'oauth\s*2\.0',
-                r'client_id\s*[:=]\s*[\w-]+',
-                r'client_secret\s*[:=]\s*[\w-]+',
-                r'authorization_code',
-                r'access_token',
-                r'refresh_token'
-            ]
-            
-            for pattern in oauth_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    auth_patterns.append({
-                        'type': 'oauth2',
-                        'pattern': pattern,
-                        'matches': matches,
-                        'confidence': 'high'
-                    })
-            
-            # API key patterns
-            api_key_patterns = [
-                r'api_key\s*[:=]\s*[\w-]+',
-                r'x-api-key',
-                r'authorization\s*:\s*bearer',
-                r'x-auth-token'
-            ]
-            
-            for pattern in api_key_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    auth_patterns.append({
-                        'type': 'api_key',
-                        'pattern': pattern,
-                        'matches': matches,
-                        'confidence': 'medium'
-                    })
-            
-            # Basic auth patterns
-            basic_auth_patterns = [
-                r'basic\s+authentication',
-                r'username\s*[:=]\s*[\w-]+',
-                r'password\s*[:=]\s*[\w-]+'
-            ]
-            
-            for pattern in basic_auth_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                if matches:
-                    auth_patterns.append({
-                        'type': 'basic_auth',
-                        'pattern': pattern,
-                        'matches': matches,
-                        'confidence': 'medium'
-                    })
+            # OAuth, API key and basic auth patterns
+            confidence = {'oauth2': 'high', 'api_key': 'medium', 'basic_auth': 'medium'}
+            for auth_type, patterns in AUTH_PATTERNS.items():
+                for pattern in patterns:
+                    matches = pattern.findall(text)
+                    if matches:
+                        auth_patterns.append({
+                            'type': auth_type,
+                            'pattern': pattern.pattern,
+                            'matches': matches,
+                            'confidence': confidence[auth_type]
+                        })
             
             return auth_patterns
             
@@ -1169,22 +1240,14 @@ class CompetitiveIntelligenceScraper:
             logger.error(f"Error extracting authentication patterns: {str(e)}")
             return []
 
-    def _extract_rate_limit_info(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_rate_limit_info(self, text: Union[str, FoldedText]) -> List[Dict[str, Any]]:
         """Extract rate limiting information from text content"""
         try:
             rate_limit_info = []
+            text = FoldedText.of(text)
             
-            # Rate limit patterns
-            rate_patterns = [
-                r'rate\s+limit[:\s]+(\d+)\s+(requests?|calls?)\s+per\s+(second|minute|hour|day)',
-                r'(\d+)\s+(requests?|calls?)\s+per\s+(second|minute|hour|day)',
-                r'throttling[:\s]+(\d+)\s+(requests?|calls?)',
-                r'quota[:\s]+(\d+)\s+(requests?|calls?)',
-                r'maximum\s+(\d+)\s+(requests?|calls?)'
-            ]
-            
-            for pattern in rate_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
+            for pattern in RATE_LIMIT_PATTERNS:
+                matches = pattern.findall(text)
                 if matches:
                     for match in matches:
                         if isinstance(match, tuple):
@@ -1198,7 +1261,7 @@ class CompetitiveIntelligenceScraper:
                             'limit': int(limit),
                             'unit': unit,
                             'time_period': time_period,
-                            'pattern': pattern,
+                            'pattern': pattern.pattern,
                             'confidence': 'medium'
                         })
             
@@ -1312,10 +1375,11 @@ class CompetitiveIntelligenceScraper:
             logger.error(f"Error assessing technical relevance: {str(e)}")
             return 0.5
 
-    def classify_technical_content(self, content: str, company: str = "") -> Dict[str, Any]:
+    def classify_technical_content(self, content: Union[str, ParsedDocument], company: str = "") -> Dict[str, Any]:
         """Classify content by technical type and relevance - Phase 1.3 implementation"""
         try:
-            content_lower = content.lower()
+            doc = content if isinstance(content, ParsedDocument) else ParsedDocument.from_text(content)
+            content_lower = doc.text_lower
             classification = {
                 'content_type': 'unknown',
                 'technical_depth': 0.0,
@@ -1331,11 +1395,12 @@ class CompetitiveIntelligenceScraper:
             
             # Determine content type based on pattern matching
             content_type_scores = {}
+            folded = FoldedText(content_lower, content_lower)
             for content_type, patterns in self.content_patterns.items():
                 score = 0.0
                 matched_patterns = []
                 for pattern in patterns:
-                    matches = re.findall(pattern, content_lower, re.IGNORECASE)
+                    matches = pattern.findall(folded)
                     if matches:
                         score += len(matches) * 0.1
                         matched_patterns.extend(matches)
@@ -1362,17 +1427,15 @@ class CompetitiveIntelligenceScraper:
                     classification['integrations_relevance'] = self._calculate_keyword_relevance(content_lower, keywords)
             
             # Calculate technical depth based on content characteristics
-            classification['technical_depth'] = self._calculate_technical_depth(content)
+            classification['technical_depth'] = self._calculate_technical_depth(doc)
             
             # Add company-specific technical keyword matching
             if company:
                 company_lower = company.lower()
-                for comp, keywords in self.company_technical_keywords.items():
+                company_hits = self.company_keyword_taxonomy.scan(content_lower, lowered=True)
+                for comp in self.company_technical_keywords:
                     if comp in company_lower:
-                        company_matches = []
-                        for keyword in keywords:
-                            if keyword.lower() in content_lower:
-                                company_matches.append(keyword)
+                        company_matches = company_hits.present(comp)
                         if company_matches:
                             classification['company_specific_matches'] = company_matches
                             # Boost overall score for company-specific content
@@ -1417,9 +1480,11 @@ class CompetitiveIntelligenceScraper:
         except Exception:
             return 0.0
     
-    def _calculate_technical_depth(self, content: str) -> float:
+    def _calculate_technical_depth(self, content: Union[str, ParsedDocument]) -> float:
         """Calculate technical depth based on content characteristics"""
         try:
+            doc = content if isinstance(content, ParsedDocument) else ParsedDocument.from_text(content)
+            content = doc.text
             depth_score = 0.0
             
             # Code blocks and technical elements
@@ -1428,13 +1493,12 @@ class CompetitiveIntelligenceScraper:
             
             # Technical terminology density
             technical_terms = ['api', 'endpoint', 'authentication', 'sdk', 'deployment', 'configuration']
-            term_count = sum(1 for term in technical_terms if term in content.lower())
+            term_count = sum(1 for term in technical_terms if term in doc.text_lower)
             depth_score += min(0.3, term_count * 0.05)
             
             # URL patterns (API endpoints, documentation links)
-            url_patterns = [r'https?://[^\s]+\.json', r'https?://[^\s]+\.yaml', r'https?://[^\s]+\.yml']
-            for pattern in url_patterns:
-                if re.search(pattern, content):
+            for pattern in SPEC_URL_PATTERNS:
+                if pattern.search(content):
                     depth_score += 0.2
             
             # HTTP methods
@@ -1447,20 +1511,16 @@ class CompetitiveIntelligenceScraper:
         except Exception:
             return 0.0
 
-    def detect_openapi_specs(self, html_content: str) -> List[Dict]:
+    def detect_openapi_specs(self, html_content: Union[str, ParsedDocument]) -> List[Dict]:
         """Detect OpenAPI specifications in HTML content - Phase 1.1 implementation"""
         try:
+            doc = html_content if isinstance(html_content, ParsedDocument) else ParsedDocument(html_content)
+            html_content = doc.html
             openapi_specs = []
             
             # Look for direct OpenAPI file references
-            openapi_patterns = [
-                r'https?://[^\s"\']+\.json',
-                r'https?://[^\s"\']+\.yaml',
-                r'https?://[^\s"\']+\.yml'
-            ]
-            
-            for pattern in openapi_patterns:
-                matches = re.findall(pattern, html_content)
+            for pattern in OPENAPI_URL_PATTERNS:
+                matches = pattern.findall(html_content)
                 for match in matches:
                     if any(keyword in match.lower() for keyword in ['openapi', 'swagger', 'api']):
                         openapi_specs.append({
@@ -1470,8 +1530,7 @@ class CompetitiveIntelligenceScraper:
                         })
             
             # Look for OpenAPI links in HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-            for link in soup.find_all('a', href=True):
+            for link in doc.links:
                 href = link.get('href')
                 if href and any(keyword in href.lower() for keyword in ['openapi', 'swagger', 'api.json', 'api.yaml']):
                     openapi_specs.append({
@@ -1482,7 +1541,7 @@ class CompetitiveIntelligenceScraper:
                     })
             
             # Look for OpenAPI content in script tags
-            for script in soup.find_all('script'):
+            for script in doc.scripts:
                 if script.string:
                     script_content = script.string
                     # Look for OpenAPI spec content embedded in scripts
@@ -1502,7 +1561,8 @@ class CompetitiveIntelligenceScraper:
     def parse_openapi_spec(self, spec_url: str) -> Dict[str, Any]:
         """Parse OpenAPI specification and extract technical information"""
         try:
-            response = self.session.get(spec_url, timeout=15)
+            response = resilient_get(self.session, spec_url, timeout=15,
+                                     before_attempt=lambda: acquire_rate_limit(spec_url))
             response.raise_for_status()
             
             spec_content = response.text
@@ -1627,12 +1687,22 @@ class CompetitiveIntelligenceScraper:
             logger.error(f"Error calculating content quality: {str(e)}")
             return 5.0
 
-    @rate_limited(max_per_second=1)
-    def _scrape_url(self, url: str) -> str:
-        """Scrape URL with rate limiting - 12-hour MVP enhancement"""
+    def _scrape_url(self, url: str, category: str = 'default', company: str = '') -> str:
+        """Scrape URL with rate limiting and conditional-GET caching - 12-hour MVP enhancement
+
+        Bodies fetched from the network are archived under ``company``; cache hits are not.
+        """
         try:
-            response = self.session.get(url, timeout=30)
+            ensure_robots_allowed(url)
+            # Fresh cache hits never touch the network, so only network attempts take a token
+            response = self.http_cache.get(
+                self.session, url, category=category, timeout=30,
+                send=lambda session, u, **kw: resilient_get(
+                    session, u, before_attempt=lambda: acquire_rate_limit(u, rate=1), **kw)
+            )
             response.raise_for_status()
+            if not response.from_cache:
+                archive_body(url, response.text, company, category)
             return response.text
         except Exception as e:
             logger.error(f"Error scraping URL {url}: {str(e)}")
@@ -1640,12 +1710,14 @@ class CompetitiveIntelligenceScraper:
 
     def extract_strategic_comparison_data(self, scraped_content):
         """Extract strategic comparison data across cloud-native favorable dimensions"""
+        # One keyword scan per item serves all five dimensions
+        hits = self._strategic_hits(scraped_content)
         comparison_data = {
-            'api_first_architecture': self._analyze_api_first_architecture(scraped_content),
-            'cloud_native_features': self._analyze_cloud_native_features(scraped_content),
-            'data_integration': self._analyze_data_integration(scraped_content),
-            'developer_experience': self._analyze_developer_experience(scraped_content),
-            'modern_analytics': self._analyze_modern_analytics(scraped_content)
+            'api_first_architecture': self._analyze_api_first_architecture(scraped_content, hits),
+            'cloud_native_features': self._analyze_cloud_native_features(scraped_content, hits),
+            'data_integration': self._analyze_data_integration(scraped_content, hits),
+            'developer_experience': self._analyze_developer_experience(scraped_content, hits),
+            'modern_analytics': self._analyze_modern_analytics(scraped_content, hits)
         }
         
         overall_score = sum(comparison_data.values()) / len(comparison_data)
@@ -1654,209 +1726,45 @@ class CompetitiveIntelligenceScraper:
         
         return comparison_data
     
-    def _analyze_api_first_architecture(self, content):
-        """Analyze API-first architecture capabilities"""
-        score = 0
-        indicators = {
-            'api_documentation': 0,
-            'rest_graphql': 0,
-            'sdk_libraries': 0,
-            'webhooks': 0,
-            'authentication': 0,
-            'versioning': 0
-        }
-        
-        for item in content:
-            text = item.get('text_content', '').lower()
-            
-            if any(term in text for term in ['api', 'endpoint', 'api documentation']):
-                indicators['api_documentation'] += 1
-            if any(term in text for term in ['rest', 'graphql', 'swagger', 'openapi']):
-                indicators['rest_graphql'] += 1
-            if any(term in text for term in ['sdk', 'client library', 'npm', 'pip', 'maven']):
-                indicators['sdk_libraries'] += 1
-            if any(term in text for term in ['webhook', 'callback', 'event-driven']):
-                indicators['webhooks'] += 1
-            if any(term in text for term in ['authentication', 'oauth', 'api key', 'jwt']):
-                indicators['authentication'] += 1
-            if any(term in text for term in ['versioning', 'v1', 'v2', 'v3', 'api version']):
-                indicators['versioning'] += 1
-        
-        score = (
-            indicators['api_documentation'] * 20 +
-            indicators['rest_graphql'] * 20 +
-            indicators['sdk_libraries'] * 15 +
-            indicators['webhooks'] * 15 +
-            indicators['authentication'] * 15 +
-            indicators['versioning'] * 15
+    def _strategic_hits(self, content) -> List[KeywordHits]:
+        """Scan each item's text once for every strategic indicator term"""
+        return [STRATEGIC_TAXONOMY.scan(item.get('text_content', '')) for item in content]
+    
+    def _score_strategic_dimension(self, dimension: str, content, hits: Optional[List[KeywordHits]] = None):
+        """Weighted share of items showing each indicator of ``dimension`` (capped at 100)"""
+        if hits is None:
+            hits = self._strategic_hits(content)
+        
+        score = sum(
+            weight * sum(1 for item_hits in hits if item_hits.any((dimension, indicator)))
+            for indicator, (_, weight) in STRATEGIC_INDICATORS[dimension].items()
         ) / max(len(content), 1)
         
         return min(100, score)
     
-    def _analyze_cloud_native_features(self, content):
+    def _analyze_api_first_architecture(self, content, hits=None):
+        """Analyze API-first architecture capabilities"""
+        return self._score_strategic_dimension('api_first_architecture', content, hits)
+    
+    def _analyze_cloud_native_features(self, content, hits=None):
         """Analyze cloud-native platform capabilities"""
-        score = 0
-        indicators = {
-            'multi_cloud': 0,
-            'auto_scaling': 0,
-            'serverless': 0,
-            'containers': 0,
-            'microservices': 0,
-            'infrastructure_as_code': 0
-        }
-        
-        for item in content:
-            text = item.get('text_content', '').lower()
-            
-            if any(term in text for term in ['multi-cloud', 'hybrid cloud', 'cross-cloud']):
-                indicators['multi_cloud'] += 1
-            if any(term in text for term in ['auto-scaling', 'elastic', 'auto-scale', 'dynamic scaling']):
-                indicators['auto_scaling'] += 1
-            if any(term in text for term in ['serverless', 'lambda', 'function as a service', 'faas']):
-                indicators['serverless'] += 1
-            if any(term in text for term in ['container', 'kubernetes', 'docker', 'orchestration']):
-                indicators['containers'] += 1
-            if any(term in text for term in ['microservices', 'distributed', 'service mesh']):
-                indicators['microservices'] += 1
-            if any(term in text for term in ['infrastructure as code', 'terraform', 'cloudformation', 'iac']):
-                indicators['infrastructure_as_code'] += 1
-        
-        score = (
-            indicators['multi_cloud'] * 20 +
-            indicators['auto_scaling'] * 20 +
-            indicators['serverless'] * 20 +
-            indicators['containers'] * 15 +
-            indicators['microservices'] * 15 +
-            indicators['infrastructure_as_code'] * 10
-        ) / max(len(content), 1)
-        
-        return min(100, score)
+        return self._score_strategic_dimension('cloud_native_features', content, hits)
     
-    def _analyze_data_integration(self, content):
+    def _analyze_data_integration(self, content, hits=None):
         """Analyze data integration and connector capabilities"""
-        score = 0
-        indicators = {
-            'real_time': 0,
-            'etl_pipelines': 0,
-            'connectors': 0,
-            'data_warehouses': 0,
-            'data_mesh': 0,
-            'open_formats': 0
-        }
-        
-        for item in content:
-            text = item.get('text_content', '').lower()
-            
-            if any(term in text for term in ['real-time', 'streaming', 'live data', 'instant']):
-                indicators['real_time'] += 1
-            if any(term in text for term in ['etl', 'elt', 'data pipeline', 'data transformation']):
-                indicators['etl_pipelines'] += 1
-            if any(term in text for term in ['connector', 'integration', 'plugin', 'add-on']):
-                indicators['connectors'] += 1
-            if any(term in text for term in ['data warehouse', 'snowflake', 'bigquery', 'redshift']):
-                indicators['data_warehouses'] += 1
-            if any(term in text for term in ['data mesh', 'data fabric', 'distributed data']):
-                indicators['data_mesh'] += 1
-            if any(term in text for term in ['open format', 'parquet', 'avro', 'json', 'csv']):
-                indicators['open_formats'] += 1
-        
-        score = (
-            indicators['real_time'] * 20 +
-            indicators['etl_pipelines'] * 20 +
-            indicators['connectors'] * 20 +
-            indicators['data_warehouses'] * 15 +
-            indicators['data_mesh'] * 15 +
-            indicators['open_formats'] * 10
-        ) / max(len(content), 1)
-        
-        return min(100, score)
+        return self._score_strategic_dimension('data_integration', content, hits)
     
-    def _analyze_developer_experience(self, content):
+    def _analyze_developer_experience(self, content, hits=None):
         """Analyze developer experience and self-service capabilities"""
-        score = 0
-        indicators = {
-            'self_service': 0,
-            'ci_cd': 0,
-            'documentation': 0,
-            'examples': 0,
-            'community': 0,
-            'playground': 0
-        }
-        
-        for item in content:
-            text = item.get('text_content', '').lower()
-            
-            if any(term in text for term in ['self-service', 'provisioning', 'self-provision']):
-                indicators['self_service'] += 1
-            if any(term in text for term in ['ci/cd', 'pipeline', 'deployment', 'continuous']):
-                indicators['ci_cd'] += 1
-            if any(term in text for term in ['developer documentation', 'getting started', 'tutorial']):
-                indicators['documentation'] += 1
-            if any(term in text for term in ['sample code', 'example', 'code sample', 'demo']):
-                indicators['examples'] += 1
-            if any(term in text for term in ['community', 'forum', 'support', 'developer portal']):
-                indicators['community'] += 1
-            if any(term in text for term in ['playground', 'sandbox', 'api explorer', 'interactive']):
-                indicators['playground'] += 1
-        
-        score = (
-            indicators['self_service'] * 25 +
-            indicators['ci_cd'] * 20 +
-            indicators['documentation'] * 20 +
-            indicators['examples'] * 15 +
-            indicators['community'] * 10 +
-            indicators['playground'] * 10
-        ) / max(len(content), 1)
-        
-        return min(100, score)
+        return self._score_strategic_dimension('developer_experience', content, hits)
     
-    def _analyze_modern_analytics(self, content):
+    def _analyze_modern_analytics(self, content, hits=None):
         """Analyze modern analytics and AI capabilities"""
-        score = 0
-        indicators = {
-            'ai_ml': 0,
-            'real_time_analytics': 0,
-            'collaboration': 0,
-            'natural_language': 0,
-            'automation': 0,
-            'governance': 0
-        }
-        
-        for item in content:
-            text = item.get('text_content', '').lower()
-            
-            if any(term in text for term in ['ai', 'machine learning', 'ml', 'artificial intelligence']):
-                indicators['ai_ml'] += 1
-            if any(term in text for term in ['real-time analytics', 'streaming analytics', 'live insights']):
-                indicators['real_time_analytics'] += 1
-            if any(term in text for term in ['collaborative', 'team analytics', 'shared workspace']):
-                indicators['collaboration'] += 1
-            if any(term in text for term in ['natural language', 'nlp', 'conversational', 'chat']):
-                indicators['natural_language'] += 1
-            if any(term in text for term in ['automated insights', 'auto-discovery', 'smart suggestions']):
-                indicators['automation'] += 1
-            if any(term in text for term in ['governance', 'compliance', 'security', 'data lineage']):
-                indicators['governance'] += 1
-        
-        score = (
-            indicators['ai_ml'] * 20 +
-            indicators['real_time_analytics'] * 20 +
-            indicators['collaboration'] * 20 +
-            indicators['natural_language'] * 15 +
-            indicators['automation'] * 15 +
-            indicators['governance'] * 10
-        ) / max(len(content), 1)
-        
-        return min(100, score)
+        return self._score_strategic_dimension('modern_analytics', content, hits)
     
     def _determine_positioning(self, overall_score):
         """Determine competitive positioning based on overall score"""
-        if overall_score >= 80:
-            return 'Leader'
-        elif overall_score >= 60:
-            return 'Transitioning'
-        else:
-            return 'Legacy'
+        return determine_positioning(overall_score)
 
 
 # Example usage and testing
@@ -2,28 +2,97 @@
 """
 Coverage Gap Resolver - Phase 3 Implementation
 Investigates and fixes coverage gaps for companies with 0 scraped items
+
+Every URL in an investigation (domain root, original roots and fallback
+candidates) is fetched once, concurrently, in a single probe stage; the status,
+redirect chain and content preview are reused by every later step. Finished
+investigations are cached per company/domain for COVERAGE_CACHE_TTL seconds.
 """
 
-import requests
+import os
+import json
+import sqlite3
+import threading
 import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from urllib.parse import urlparse, urljoin
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional, Any
 import time
 import logging
+from robots_cache import get_robots_cache, allowed as robots_allowed
+from rate_limiter import acquire as acquire_rate_limit
+from http_client import create_session
+from stream_fetch import stream_get
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+COVERAGE_CACHE_PATH = Path(os.getenv('COVERAGE_CACHE_PATH', str(Path(__file__).parent / 'coverage_investigations.db')))
+COVERAGE_CACHE_TTL = int(os.getenv('COVERAGE_CACHE_TTL', str(24 * 3600)))   # 0 disables the cache
+COVERAGE_PROBE_WORKERS = int(os.getenv('COVERAGE_PROBE_WORKERS', '8'))
+PROBE_MAX_BYTES = 64 * 1024
+
+
+class InvestigationCache:
+    """SQLite cache of finished investigations keyed by company, domain and roots"""
+
+    def __init__(self, db_path: Path = COVERAGE_CACHE_PATH, ttl: int = COVERAGE_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS coverage_investigations (
+                cache_key TEXT PRIMARY KEY,
+                investigation TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(company_name: str, domain: str, roots: List[str]) -> str:
+        return json.dumps([company_name.lower(), domain, sorted(roots)])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT investigation, created_at FROM coverage_investigations WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, investigation: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO coverage_investigations (cache_key, investigation, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(investigation, default=str), time.time()),
+            )
+            self._conn.commit()
+
+
 class CoverageGapResolver:
     """Resolves coverage gaps by investigating failed companies and implementing fallback discovery"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, cache: Optional[InvestigationCache] = None, max_workers: int = COVERAGE_PROBE_WORKERS):
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.max_workers = max_workers
+        # Probe results by URL, shared by every step of an investigation
+        self._probes: Dict[str, Dict[str, Any]] = {}
+        self._probe_lock = threading.Lock()
+        self.cache = cache
+        if self.cache is None and COVERAGE_CACHE_TTL > 0:
+            try:
+                self.cache = InvestigationCache()
+            except sqlite3.Error as e:
+                logger.warning(f"Coverage investigation cache unavailable: {e}")
         
         # Common documentation paths to try
         self.common_doc_paths = [
@@ -104,6 +173,14 @@ class CoverageGapResolver:
     
     def investigate_coverage_gaps(self, company_name: str, domain: str, original_roots: List[str]) -> Dict[str, Any]:
         """Investigate why a company has 0 docs/RSS and suggest fixes"""
+        cache_key = InvestigationCache.key(company_name, domain, original_roots)
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached:
+            logger.info(f"Reusing cached coverage investigation for {company_name}")
+            with self._probe_lock:
+                self._probes.update(cached.get('probes', {}))
+            return cached
+        
         logger.info(f"Investigating coverage gaps for {company_name}")
         
         investigation = {
@@ -118,6 +195,12 @@ class CoverageGapResolver:
             'investigation_timestamp': time.time()
         }
         
+        # Find fallback URLs
+        investigation['fallback_urls'] = self._find_fallback_urls(company_name, domain)
+        
+        # Single concurrent probe stage: every URL below is fetched once
+        self._probe_all([domain] + list(original_roots) + [u['url'] for u in investigation['fallback_urls']])
+        
         # Test URL accessibility
         investigation['url_accessibility'] = self._test_url_accessibility(domain, original_roots)
         
@@ -130,46 +213,69 @@ class CoverageGapResolver:
         # Generate suggested fixes
         investigation['suggested_fixes'] = self._suggest_fixes(company_name, domain, investigation)
         
-        # Find fallback URLs
-        investigation['fallback_urls'] = self._find_fallback_urls(company_name, domain)
+        with self._probe_lock:
+            investigation['probes'] = dict(self._probes)
+        if self.cache:
+            self.cache.put(cache_key, investigation)
         
         return investigation
     
-    def _test_url_accessibility(self, domain: str, roots: List[str]) -> Dict[str, Any]:
-        """Test if URLs are accessible and return status codes"""
-        accessibility = {}
-        
-        # Test domain root
+    def _probe_url(self, url: str) -> Dict[str, Any]:
+        """GET a URL once, following redirects, recording first-hop status, redirect chain and a content preview"""
+        if not robots_allowed(url):
+            return {'status_code': 'robots_disallowed', 'accessible': False, 'error': 'Disallowed by robots.txt'}
         try:
-            response = self.session.get(domain, timeout=10, allow_redirects=False)
-            accessibility['domain_root'] = {
-                'status_code': response.status_code,
-                'accessible': response.status_code < 400,
-                'content_type': response.headers.get('content-type', ''),
-                'redirects_to': response.headers.get('location', '')
+            acquire_rate_limit(url)
+            # Any content type is worth reporting; only the start of the body is needed
+            response = stream_get(self.session, url, accept=None, max_bytes=PROBE_MAX_BYTES, truncate=True,
+                                  timeout=10, allow_redirects=True)
+            first = response.history[0] if response.history else response
+            return {
+                'status_code': first.status_code,
+                'accessible': first.status_code < 400,
+                'content_type': first.headers.get('content-type', ''),
+                'redirects_to': first.headers.get('location', '') if response.history else '',
+                'final_url': response.url,
+                'final_status_code': response.status_code,
+                'redirect_count': len(response.history),
+                'redirect_chain': [r.url for r in response.history] + [response.url],
+                'content_preview': response.text[:1000],
             }
         except Exception as e:
-            accessibility['domain_root'] = {
-                'status_code': 'error',
-                'accessible': False,
-                'error': str(e)
-            }
+            return {'status_code': 'error', 'accessible': False, 'error': str(e)}
+    
+    def _probe_all(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Probe every not-yet-probed URL concurrently and return results for all of ``urls``"""
+        with self._probe_lock:
+            pending = [u for u in dict.fromkeys(urls) if u not in self._probes]
+        if pending:
+            # Politeness comes from the shared per-host rate limiter
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+                results = dict(zip(pending, executor.map(self._probe_url, pending)))
+            with self._probe_lock:
+                self._probes.update(results)
+        with self._probe_lock:
+            return {u: self._probes[u] for u in urls}
+    
+    def _test_url_accessibility(self, domain: str, roots: List[str]) -> Dict[str, Any]:
+        """Test if URLs are accessible and return status codes"""
+        accessibility = {}
+        probes = self._probe_all([domain] + list(roots))
         
-        # Test original roots
-        for root in roots:
-            try:
-                response = self.session.get(root, timeout=10, allow_redirects=False)
-                accessibility[root] = {
-                    'status_code': response.status_code,
-                    'accessible': response.status_code < 400,
-                    'content_type': response.headers.get('content-type', ''),
-                    'redirects_to': response.headers.get('location', '')
-                }
-            except Exception as e:
-                accessibility[root] = {
-                    'status_code': 'error',
+        for key, url in [('domain_root', domain)] + [(root, root) for root in roots]:
+            probe = probes[url]
+            if 'error' in probe:
+                accessibility[key] = {
+                    'status_code': probe['status_code'],
                     'accessible': False,
-                    'error': str(e)
+                    'error': probe['error']
+                }
+            else:
+                accessibility[key] = {
+                    'status_code': probe['status_code'],
+                    'accessible': probe['accessible'],
+                    'content_type': probe['content_type'],
+                    'redirects_to': probe['redirects_to']
                 }
         
         return accessibility
@@ -177,32 +283,19 @@ class CoverageGapResolver:
     def _follow_redirects(self, domain: str, roots: List[str]) -> Dict[str, Any]:
         """Follow redirect chains to find actual endpoints"""
         redirects = {}
+        probes = self._probe_all([domain] + list(roots))
         
-        # Follow domain redirects
-        try:
-            response = self.session.get(domain, timeout=10, allow_redirects=True)
-            redirects['domain_final'] = {
-                'final_url': response.url,
-                'redirect_count': len(response.history),
-                'redirect_chain': [r.url for r in response.history] + [response.url]
-            }
-        except Exception as e:
-            redirects['domain_final'] = {
-                'error': str(e)
-            }
-        
-        # Follow root redirects
-        for root in roots:
-            try:
-                response = self.session.get(root, timeout=10, allow_redirects=True)
-                redirects[root] = {
-                    'final_url': response.url,
-                    'redirect_count': len(response.history),
-                    'redirect_chain': [r.url for r in response.history] + [response.url]
+        for key, url in [('domain_final', domain)] + [(root, root) for root in roots]:
+            probe = probes[url]
+            if 'error' in probe:
+                redirects[key] = {
+                    'error': probe['error']
                 }
-            except Exception as e:
-                redirects[root] = {
-                    'error': str(e)
+            else:
+                redirects[key] = {
+                    'final_url': probe['final_url'],
+                    'redirect_count': probe['redirect_count'],
+                    'redirect_chain': probe['redirect_chain']
                 }
         
         return redirects
@@ -212,11 +305,10 @@ class CoverageGapResolver:
         robots_info = {}
         
         try:
-            robots_url = urljoin(domain, '/robots.txt')
-            response = self.session.get(robots_url, timeout=10)
+            rules = get_robots_cache().rules_for(domain)
             
-            if response.status_code == 200:
-                robots_content = response.text
+            if rules.status == 200:
+                robots_content = rules.text
                 robots_info['accessible'] = True
                 robots_info['content_length'] = len(robots_content)
                 robots_info['has_user_agent'] = 'User-agent:' in robots_content
@@ -227,13 +319,16 @@ class CoverageGapResolver:
                 disallow_patterns = re.findall(r'Disallow:\s*(.+)', robots_content)
                 robots_info['disallow_patterns'] = disallow_patterns
                 
+                robots_info['crawl_delay'] = rules.crawl_delay
+                robots_info['sitemaps'] = rules.sitemaps
+                
                 # Check if docs paths are blocked
-                docs_blocked = any('docs' in pattern or 'documentation' in pattern for pattern in disallow_patterns)
+                docs_blocked = not all(rules.can_fetch(urljoin(domain, p)) for p in ('/docs/', '/documentation/'))
                 robots_info['docs_blocked'] = docs_blocked
                 
             else:
                 robots_info['accessible'] = False
-                robots_info['status_code'] = response.status_code
+                robots_info['status_code'] = rules.status or 'error'
                 
         except Exception as e:
             robots_info['accessible'] = False
@@ -342,36 +437,31 @@ class CoverageGapResolver:
         return fallback_urls
     
     def test_fallback_urls(self, fallback_urls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Test fallback URLs to see which ones are accessible"""
+        """Test fallback URLs to see which ones are accessible (reusing probes from the investigation)"""
         tested_urls = []
+        probes = self._probe_all([url_info['url'] for url_info in fallback_urls])
         
         for url_info in fallback_urls:
-            url = url_info['url']
-            try:
-                response = self.session.get(url, timeout=10, allow_redirects=False)
-                url_info['tested'] = True
-                url_info['status_code'] = response.status_code
-                url_info['accessible'] = response.status_code < 400
-                url_info['content_type'] = response.headers.get('content-type', '')
-                
-                # Test if it's actually useful content
-                if url_info['accessible']:
-                    content = response.text[:1000]  # First 1000 chars
-                    url_info['has_content'] = len(content) > 100
-                    url_info['content_preview'] = content[:200]
-                    
-                    # Check for technical indicators
-                    technical_indicators = ['api', 'documentation', 'docs', 'help', 'guide', 'tutorial']
-                    url_info['technical_relevance'] = sum(1 for indicator in technical_indicators if indicator.lower() in content.lower())
+            probe = probes[url_info['url']]
+            url_info['tested'] = True
+            url_info['status_code'] = probe['status_code']
+            url_info['accessible'] = probe['accessible']
+            if 'error' in probe:
+                url_info['error'] = probe['error']
+            else:
+                url_info['content_type'] = probe['content_type']
+            
+            # Test if it's actually useful content
+            if url_info['accessible']:
+                content = probe['content_preview']  # First 1000 chars
+                url_info['has_content'] = len(content) > 100
+                url_info['content_preview'] = content[:200]
                 
-            except Exception as e:
-                url_info['tested'] = True
-                url_info['status_code'] = 'error'
-                url_info['accessible'] = False
-                url_info['error'] = str(e)
+                # Check for technical indicators
+                technical_indicators = ['api', 'documentation', 'docs', 'help', 'guide', 'tutorial']
+                url_info['technical_relevance'] = sum(1 for indicator in technical_indicators if indicator.lower() in content.lower())
             
             tested_urls.append(url_info)
-            time.sleep(1)  # Be respectful
         
         return tested_urls
     
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Crawl Checkpoint
+
+SQLite checkpoint for long monitoring runs. Each run records per-company
+progress, finished company stats, and the in-flight state of the current
+company (crawl frontier, seen-set and partial results per stage), so a run
+that crashes or is killed can be continued with ``--resume`` instead of
+re-fetching every company from scratch.
+"""
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PATH = Path(os.getenv('CRAWL_CHECKPOINT_PATH', str(Path(__file__).parent / 'crawl_checkpoint.db')))
+CHECKPOINT_EVERY = int(os.getenv('CRAWL_CHECKPOINT_EVERY', '5'))  # pages between crawl saves
+
+SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS checkpoint_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS checkpoint_companies (
+    run_id INTEGER NOT NULL,
+    company TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stats TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, company)
+);
+CREATE TABLE IF NOT EXISTS checkpoint_stages (
+    run_id INTEGER NOT NULL,
+    company TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    frontier TEXT,
+    results TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, company, stage)
+);
+"""
+
+
+class CrawlCheckpoint:
+    """Progress and partial state of one monitoring run"""
+
+    def __init__(self, name: str, run_id: int, conn: sqlite3.Connection):
+        self.name = name
+        self.run_id = run_id
+        self._conn = conn
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, name: str, resume: bool = False, db_path: Path = CHECKPOINT_PATH) -> 'CrawlCheckpoint':
+        """Start a new run, or continue the latest unfinished run named ``name`` when ``resume`` is set"""
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.executescript(SCHEMA_SQL)
+        now = datetime.now().isoformat()
+
+        row = None
+        if resume:
+            row = conn.execute(
+                "SELECT run_id FROM checkpoint_runs WHERE name = ? AND status = 'running' ORDER BY run_id DESC LIMIT 1",
+                (name,),
+            ).fetchone()
+            if row is None:
+                logger.info(f"No unfinished '{name}' run to resume; starting a new one")
+
+        if row is not None:
+            run_id = row[0]
+            conn.execute("UPDATE checkpoint_runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+        else:
+            # A fresh run supersedes whatever was left unfinished
+            conn.execute("UPDATE checkpoint_runs SET status = 'abandoned' WHERE name = ? AND status = 'running'", (name,))
+            cursor = conn.execute(
+                "INSERT INTO checkpoint_runs (name, status, started_at, updated_at) VALUES (?, 'running', ?, ?)",
+                (name, now, now),
+            )
+            run_id = cursor.lastrowid
+        conn.commit()
+        return cls(name, run_id, conn)
+
+    def last_completed_start(self) -> Optional[datetime]:
+        """Start time of the most recent completed run with this name, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT started_at FROM checkpoint_runs WHERE name = ? AND status = 'completed' ORDER BY run_id DESC LIMIT 1",
+                (self.name,),
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def completed_companies(self) -> Dict[str, Dict[str, Any]]:
+        """Stats of companies already finished in this run"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT company, stats FROM checkpoint_companies WHERE run_id = ? AND status = 'done'",
+                (self.run_id,),
+            ).fetchall()
+        return {company: json.loads(stats or '{}') for company, stats in rows}
+
+    def mark_company_started(self, company: str):
+        self._upsert_company(company, 'in_progress', None)
+
+    def mark_company_done(self, company: str, stats: Dict[str, Any]):
+        """Record a finished company and drop its in-flight stage state"""
+        self._upsert_company(company, 'done', stats)
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM checkpoint_stages WHERE run_id = ? AND company = ?",
+                (self.run_id, company),
+            )
+            self._conn.commit()
+
+    def save_stage(self, company: str, stage: str, results: Any,
+                   frontier: Optional[Dict[str, Any]] = None, complete: bool = False):
+        """Persist partial results (and optionally a frontier snapshot) for one stage of a company"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO checkpoint_stages
+                    (run_id, company, stage, frontier, results, complete, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    self.run_id, company, stage,
+                    json.dumps(frontier) if frontier is not None else None,
+                    json.dumps(results, default=str),
+                    int(complete),
+                    datetime.now().isoformat(),
+                ),
+            )
+            self._conn.commit()
+
+    def load_stage(self, company: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Saved ``{'results', 'frontier', 'complete'}`` for a stage, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT frontier, results, complete FROM checkpoint_stages WHERE run_id = ? AND company = ? AND stage = ?",
+                (self.run_id, company, stage),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'frontier': json.loads(row[0]) if row[0] else None,
+            'results': json.loads(row[1]) if row[1] else None,
+            'complete': bool(row[2]),
+        }
+
+    def finish(self):
+        """Mark the run completed and discard any leftover stage state"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE checkpoint_runs SET status = 'completed', updated_at = ? WHERE run_id = ?",
+                (datetime.now().isoformat(), self.run_id),
+            )
+            self._conn.execute("DELETE FROM checkpoint_stages WHERE run_id = ?", (self.run_id,))
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def _upsert_company(self, company: str, status: str, stats: Optional[Dict[str, Any]]):
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_companies (run_id, company, status, stats, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, company, status, json.dumps(stats, default=str) if stats is not None else None, now),
+            )
+            self._conn.execute("UPDATE checkpoint_runs SET updated_at = ? WHERE run_id = ?", (now, self.run_id))
+            self._conn.commit()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Crawl Frontier
+
+Priority frontier for documentation crawls. Candidates are kept in a binary heap
+keyed on (technical_score desc, depth asc, insertion order), so push and pop are
+O(log n) and membership checks against the seen-set are O(1). An optional
+per-host mode keeps a sub-queue per host so schedulers can pick the best URL for
+a host that is currently allowed to be fetched. A ``url_filter`` (e.g. the
+robots.txt check) prunes URLs before they are ever queued.
+"""
+
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+
+def _host(url: str) -> str:
+    try:
+        return (urlparse(url).hostname or '').lower()
+    except Exception:
+        return ''
+
+
+class CrawlFrontier:
+    """Heap-based crawl frontier with an O(1) seen-set and optional per-host sub-queues"""
+
+    def __init__(self, per_host: bool = False, url_filter: Optional[Callable[[str], bool]] = None):
+        self.per_host = per_host
+        self.url_filter = url_filter
+        self.pruned = 0
+        self._heap: List[Tuple[float, int, int, str, Dict[str, Any]]] = []
+        self._host_heaps: Dict[str, List[Tuple[float, int, int, str, Dict[str, Any]]]] = defaultdict(list)
+        self._host_pending: Dict[str, int] = defaultdict(int)
+        self._consumed: Set[int] = set()
+        self._seen: Set[str] = set()
+        self._counter = itertools.count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._seen
+
+    def mark_seen(self, url: str):
+        """Record a URL as seen without queueing it"""
+        self._seen.add(url)
+
+    def add(self, url_info: Dict[str, Any], depth: int = 0) -> bool:
+        """Queue a candidate unless its URL has been seen or is filtered out; returns True if queued"""
+        url = url_info['url']
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        if self.url_filter is not None and not self.url_filter(url):
+            self.pruned += 1
+            return False
+        self._push(url_info, depth)
+        return True
+
+    def extend(self, candidates: Iterable[Dict[str, Any]], depth: int = 0) -> int:
+        """Queue several candidates at one depth; returns how many were new"""
+        return sum(1 for info in candidates if self.add(info, depth))
+
+    def pop(self) -> Tuple[Dict[str, Any], int]:
+        """Remove and return the best ``(url_info, depth)`` across all hosts"""
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[2] in self._consumed:
+                self._consumed.discard(entry[2])
+                continue
+            return self._take(entry)
+        raise IndexError('pop from empty crawl frontier')
+
+    def pop_host(self, host: str) -> Tuple[Dict[str, Any], int]:
+        """Remove and return the best ``(url_info, depth)`` for one host (per-host mode only)"""
+        if not self.per_host:
+            raise ValueError('pop_host requires a per-host frontier')
+        heap = self._host_heaps.get(host, [])
+        while heap:
+            entry = heapq.heappop(heap)
+            if entry[2] in self._consumed:
+                self._consumed.discard(entry[2])
+                continue
+            return self._take(entry)
+        raise IndexError(f'no queued URLs for host {host}')
+
+    def hosts(self) -> List[str]:
+        """Hosts that still have queued URLs"""
+        return [h for h, n in self._host_pending.items() if n > 0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable state: pending candidates (best first) and the seen-set"""
+        # The global heap holds every queued entry; consumed ones are skipped
+        pending = sorted((e for e in self._heap if e[2] not in self._consumed), key=lambda e: e[:3])
+        return {
+            'pending': [{'url_info': e[4], 'depth': e[1]} for e in pending],
+            'seen': sorted(self._seen),
+        }
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any], per_host: bool = False,
+                url_filter: Optional[Callable[[str], bool]] = None) -> 'CrawlFrontier':
+        """Rebuild a frontier from ``snapshot()`` output"""
+        frontier = cls(per_host=per_host, url_filter=url_filter)
+        frontier._seen.update(state.get('seen', []))
+        for item in state.get('pending', []):
+            frontier._seen.add(item['url_info']['url'])
+            frontier._push(item['url_info'], item['depth'])
+        return frontier
+
+    def _push(self, url_info: Dict[str, Any], depth: int):
+        host = _host(url_info['url'])
+        entry = (-float(url_info.get('technical_score', 0.0) or 0.0), depth, next(self._counter), host, url_info)
+        if self.per_host:
+            # Entries live in both heaps; whichever pops first marks the other copy consumed
+            heapq.heappush(self._host_heaps[host], entry)
+        heapq.heappush(self._heap, entry)
+        self._host_pending[host] += 1
+        self._size += 1
+
+    def _take(self, entry) -> Tuple[Dict[str, Any], int]:
+        if self.per_host:
+            self._consumed.add(entry[2])
+        host = entry[3]
+        self._host_pending[host] -= 1
+        if self._host_pending[host] <= 0:
+            del self._host_pending[host]
+        self._size -= 1
+        return entry[4], entry[1]
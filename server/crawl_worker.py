@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Crawl Worker
+
+Enqueues competitor crawl jobs and drains them from the shared work queue.
+Run any number of workers, on one machine (SQLite queue) or several
+(``WORK_QUEUE_URL=redis://...``):
+
+    python crawl_worker.py --enqueue --categories docs,marketing
+    python crawl_worker.py --worker            # in as many processes as wanted
+
+``docs`` jobs run ``crawl_docs_enhanced`` from the job's root URL, claiming
+each page in the queue first so overlapping crawls never fetch a page twice;
+other categories go through ``enhanced_technical_scraping``.
+Each process starts its own extraction pool; with many worker processes on
+one machine, set ``EXTRACTION_WORKERS`` so the pools together fit the cores.
+"""
+
+import os
+import sys
+import time
+import socket
+import logging
+import argparse
+import sqlite3
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from competitor_targeting import COMPETITORS
+from store_scrape_to_sqlite import init_db, insert_item, update_item
+from rss_batch_scrape_and_insights import find_existing_item
+from targeted_bi_monitor import crawl_docs_enhanced, store_doc_pages, DRY_RUN, MAX_DOC_PAGES_PER_COMPANY, MAX_DEPTH
+from page_fingerprints import PageFingerprints
+from work_queue import open_work_queue, LEASE_SECONDS, DEAD
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IDLE_POLL_SECONDS = float(os.getenv('CRAWL_WORKER_POLL_SECONDS', '5'))
+
+
+def enqueue_competitors(queue, categories=('docs',), requeue: bool = False) -> int:
+    """Queue one job per docs root (``docs``) or per company domain (other categories)"""
+    added = 0
+    for comp in COMPETITORS:
+        for category in categories:
+            urls = comp.get('docs', []) if category == 'docs' else [comp['domain']]
+            for url in urls:
+                added += queue.put(comp['name'], category, url, requeue_done=requeue)
+    return added
+
+
+def handle_docs(job: Dict[str, Any], queue, worker_id: str, conn, fingerprints=None) -> Dict[str, Any]:
+    last_extend = [time.monotonic()]
+
+    def claim(url: str) -> bool:
+        # Page claims are also the heartbeat that keeps the job's lease alive
+        if time.monotonic() - last_extend[0] > LEASE_SECONDS / 3:
+            queue.extend(job)
+            last_extend[0] = time.monotonic()
+        # Claimed per job, so a retry of this job may fetch its own pages again
+        return queue.claim(f"{job['company']}|docs|{url}", f"job:{job['job_id']}")
+
+    root = {'url': job['url'], 'technical_score': 1.0, 'source': 'work_queue'}
+    pages = crawl_docs_enhanced(job['company'], [root], job['payload'].get('cap', MAX_DOC_PAGES_PER_COMPANY),
+                                job['payload'].get('max_depth', MAX_DEPTH), fingerprints=fingerprints, claim=claim)
+    if not DRY_RUN and conn is not None:
+        store_doc_pages(conn, job['company'], pages, fingerprints)
+    return {'docs_count': len(pages)}
+
+
+def handle_technical(job: Dict[str, Any], queue, worker_id: str, conn, fingerprints=None) -> Dict[str, Any]:
+    from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
+
+    result = CompetitiveIntelligenceScraper().enhanced_technical_scraping(
+        job['company'], {job['category']: job['url']})[job['category']]
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    if not DRY_RUN and conn is not None:
+        existing_id = find_existing_item(conn, job['company'], job['category'], job['url'])
+        if existing_id:
+            update_item(conn, existing_id, result['content'], result['quality_score'],
+                        result['technical_relevance'], result['scraped_at'])
+        else:
+            insert_item(conn, job['company'], job['category'], job['url'], result['content'],
+                        result['quality_score'], result['technical_relevance'], result['scraped_at'])
+    return {'quality_score': result['quality_score']}
+
+
+HANDLERS: Dict[str, Callable] = {'docs': handle_docs}
+
+
+def run_worker(queue, worker_id: Optional[str] = None, conn=None, fingerprints=None,
+               handlers: Optional[Dict[str, Callable]] = None, exit_when_idle: bool = True,
+               max_jobs: Optional[int] = None) -> Dict[str, int]:
+    """Lease and process jobs until the queue is drained (or forever without ``exit_when_idle``)"""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    handlers = handlers or HANDLERS
+    counts = {'done': 0, 'retried': 0, 'dead': 0}
+    while max_jobs is None or sum(counts.values()) < max_jobs:
+        job = queue.lease(worker_id)
+        if job is None:
+            if exit_when_idle:
+                break
+            time.sleep(IDLE_POLL_SECONDS)
+            continue
+        handler = handlers.get(job['category'], handle_technical)
+        try:
+            outcome = handler(job, queue, worker_id, conn, fingerprints)
+        except Exception as e:
+            status = queue.fail(job, f"{type(e).__name__}: {e}")
+            counts['dead' if status == DEAD else 'retried'] += 1
+            logger.warning(f"[{worker_id}] {job['company']} {job['category']} {job['url']} failed "
+                           f"(attempt {job['attempts']}/{job['max_attempts']}): {e}")
+            continue
+        queue.complete(job)
+        counts['done'] += 1
+        logger.info(f"[{worker_id}] {job['company']} {job['category']} {job['url']}: {outcome}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed crawl worker")
+    parser.add_argument('--enqueue', action='store_true', help='Queue crawl jobs for every competitor')
+    parser.add_argument('--categories', default='docs',
+                        help='Comma-separated categories to enqueue (docs, or any enhanced_technical_scraping category)')
+    parser.add_argument('--requeue', action='store_true', help='Re-run jobs that already finished or were dead-lettered')
+    parser.add_argument('--worker', action='store_true', help='Process jobs until the queue is empty')
+    parser.add_argument('--forever', action='store_true', help='With --worker, keep polling for new jobs')
+    parser.add_argument('--incremental', action='store_true', help='Reuse stored page fingerprints for docs jobs')
+    parser.add_argument('--stats', action='store_true', help='Print queue counts and dead-lettered jobs')
+    args = parser.parse_args()
+
+    queue = open_work_queue()
+    if args.enqueue:
+        categories = tuple(c.strip() for c in args.categories.split(',') if c.strip())
+        print(f"📥 Queued {enqueue_competitors(queue, categories, args.requeue)} new jobs")
+
+    if args.worker:
+        conn = None
+        if not DRY_RUN:
+            try:
+                # Several workers write to the same scrape database
+                conn = init_db()
+                conn.execute("PRAGMA busy_timeout = 30000")
+            except (OSError, sqlite3.Error):
+                conn = None
+        fingerprints = PageFingerprints(conn) if args.incremental and conn is not None else None
+        counts = run_worker(queue, conn=conn, fingerprints=fingerprints, exit_when_idle=not args.forever)
+        print(f"✅ Worker finished: {counts['done']} done, {counts['retried']} retried, {counts['dead']} dead-lettered "
+              f"({datetime.now().isoformat()})")
+
+    if args.stats or not (args.enqueue or args.worker):
+        print(f"📊 Queue: {queue.stats()}")
+        for job in queue.dead_letters():
+            print(f"   💀 {job['company']} {job['category']} {job['url']} after {job['attempts']} attempts: {job['last_error']}")
+    queue.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,39 +10,32 @@ import requests
 import time
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Any
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime, timedelta
-import random
+
+from rate_limiter import get_rate_limiter
+from http_client import create_session
+from keyword_matcher import KeywordTaxonomy
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class RateLimiter:
-    """Rate limiter for respectful scraping"""
+    """Rate limiter for respectful scraping, backed by the shared per-host token buckets"""
     
-    def __init__(self, min_delay: float = 1.0, max_delay: float = 3.0):
+    def __init__(self, min_delay: float = 1.0):
         self.min_delay = min_delay
-        self.max_delay = max_delay
-        self.last_request_time = 0
+        self.limiter = get_rate_limiter()
     
-    def wait(self):
-        """Wait appropriate time between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_delay:
-            sleep_time = self.min_delay - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-        
-        # Add random delay for additional respectfulness
-        random_delay = random.uniform(0.5, 1.5)
-        time.sleep(random_delay)
+    def wait(self, url: str = ''):
+        """Wait until the host of ``url`` has budget for another request"""
+        self.limiter.acquire(url, rate=1.0 / self.min_delay if self.min_delay > 0 else None)
 
 class UserAgentRotator:
     """Rotate user agents to avoid detection"""
@@ -56,11 +49,13 @@ class UserAgentRotator:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:89.0) Gecko/20100101 Firefox/89.0'
         ]
         self.current_index = 0
+        self._lock = threading.Lock()
     
     def get_user_agent(self) -> str:
         """Get next user agent in rotation"""
-        user_agent = self.user_agents[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.user_agents)
+        with self._lock:
+            user_agent = self.user_agents[self.current_index]
+            self.current_index = (self.current_index + 1) % len(self.user_agents)
         return user_agent
 
 class ContentAnalyzer:
@@ -110,24 +105,28 @@ class ContentAnalyzer:
                 'audit trail', 'data flow', 'source'
             ]
         }
+        # All dimensions' keywords compiled into one matcher
+        self.keyword_taxonomy = KeywordTaxonomy(self.dimension_keywords)
     
     def analyze_content_relevance(self, content: str, dimension: str) -> Dict[str, Any]:
         """Analyze content relevance to specific dimension"""
-        if dimension not in self.dimension_keywords:
-            return {'relevance_score': 0.0, 'confidence': 0.0}
-        
-        keywords = self.dimension_keywords[dimension]
-        content_lower = content.lower()
-        
-        # Count keyword matches
-        keyword_matches = sum(1 for keyword in keywords if keyword in content_lower)
-        
+        return self.analyze_all_dimensions(content, [dimension])[dimension]
+    
+    def analyze_all_dimensions(self, content: str, dimensions: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Analyze content relevance to every dimension with one keyword scan"""
+        hits = self.keyword_taxonomy.scan(content)
+        content_length = len(content)
+        return {
+            dimension: self._score_relevance(hits.count(dimension), content_length, len(self.dimension_keywords[dimension]))
+            if dimension in self.dimension_keywords else {'relevance_score': 0.0, 'confidence': 0.0}
+            for dimension in (dimensions or self.dimension_keywords)
+        }
+    
+    def _score_relevance(self, keyword_matches: int, content_length: int, max_keywords: int) -> Dict[str, Any]:
         # Calculate relevance score (0-1)
-        max_keywords = len(keywords)
         relevance_score = min(keyword_matches / max_keywords, 1.0)
         
         # Calculate confidence based on content length and keyword density
-        content_length = len(content)
         keyword_density = keyword_matches / content_length if content_length > 0 else 0
         
         confidence = min(relevance_score * 0.7 + keyword_density * 1000, 1.0)
@@ -183,11 +182,19 @@ class DynamicBulkScraper:
     """Main scraper for third-party sources"""
     
     def __init__(self):
-        self.session = self._create_session()
-        self.rate_limiter = RateLimiter()
         self.user_agent_rotator = UserAgentRotator()
         self.content_analyzer = ContentAnalyzer()
         
+        # Third-party sources, scraped concurrently; each has its own session and limiter
+        self.sources = {
+            'reddit': self._scrape_reddit,
+            'g2': self._scrape_g2,
+            'capterra': self._scrape_capterra,
+            'trustradius': self._scrape_trustradius,
+        }
+        self.sessions = {source: self._create_session() for source in self.sources}
+        self.rate_limiters = {source: RateLimiter() for source in self.sources}
+        
         # URL patterns for different sources
         self.url_patterns = {
             'g2': {
@@ -221,61 +228,24 @@ class DynamicBulkScraper:
     
     def _create_session(self) -> requests.Session:
         """Create requests session with proper headers"""
-        session = requests.Session()
-        session.headers.update({
+        return create_session({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
-        return session
     
     def scrape_company_dimension(self, company_name: str, dimension: str) -> List[Dict[str, Any]]:
         """Scrape content for a specific company and dimension"""
         logger.info(f"Scraping {company_name} for dimension: {dimension}")
         
-        results = []
-        
-        # Scrape from different sources
-        try:
-            # Reddit scraping
-            reddit_results = self._scrape_reddit(company_name, dimension)
-            results.extend(reddit_results)
-            
-            # G2 scraping
-            g2_results = self._scrape_g2(company_name, dimension)
-            results.extend(g2_results)
-            
-            # Capterra scraping
-            capterra_results = self._scrape_capterra(company_name, dimension)
-            results.extend(capterra_results)
-            
-            # TrustRadius scraping
-            trustradius_results = self._scrape_trustradius(company_name, dimension)
-            results.extend(trustradius_results)
-            
-        except Exception as e:
-            logger.error(f"Error scraping {company_name} for {dimension}: {e}")
+        scored_by_source = self._fan_out(
+            company_name, dimension, lambda results: self._score_results(results, dimension),
+            f"{company_name} / {dimension}"
+        )
         
-        # Analyze and score results
-        scored_results = []
-        for result in results:
-            relevance = self.content_analyzer.analyze_content_relevance(
-                result.get('content', ''), dimension
-            )
-            
-            if relevance['relevance_score'] > 0.3:  # Only include relevant content
-                scored_result = {
-                    **result,
-                    'relevance_score': relevance['relevance_score'],
-                    'confidence_score': relevance['confidence'],
-                    'sentiment': self.content_analyzer.extract_sentiment(result.get('content', '')),
-                    'rating': self.content_analyzer.extract_rating(result.get('content', '')),
-                    'extraction_date': datetime.now().isoformat(),
-                    'dimension': dimension
-                }
-                scored_results.append(scored_result)
+        # Merge in source order so ties keep a stable order
+        scored_results = [r for source in self.sources for r in scored_by_source.get(source, [])]
         
         # Sort by relevance score
         scored_results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
@@ -283,7 +253,75 @@ class DynamicBulkScraper:
         logger.info(f"Found {len(scored_results)} relevant results for {company_name} - {dimension}")
         return scored_results
     
-    def _scrape_reddit(self, company_name: str, dimension: str) -> List[Dict[str, Any]]:
+    def scrape_company_all_dimensions(self, company_name: str,
+                                      dimensions: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch every source once for a company and score the content against all dimensions"""
+        dimensions = list(dimensions or self.content_analyzer.dimension_keywords)
+        logger.info(f"Scraping {company_name} once for {len(dimensions)} dimensions")
+        
+        # The sources do not depend on the dimension, so one fetch serves all of them
+        scored_by_source = self._fan_out(
+            company_name, None, lambda results: self._score_results_all(results, dimensions),
+            f"{company_name} / all dimensions"
+        )
+        
+        results_by_dimension = {}
+        for dimension in dimensions:
+            scored_results = [r for source in self.sources
+                              for r in scored_by_source.get(source, {}).get(dimension, [])]
+            scored_results.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+            results_by_dimension[dimension] = scored_results
+        
+        logger.info(f"Found {sum(len(r) for r in results_by_dimension.values())} relevant results "
+                    f"for {company_name} across {len(dimensions)} dimensions")
+        return results_by_dimension
+    
+    def _fan_out(self, company_name: str, dimension: Optional[str], score, label: str) -> Dict[str, Any]:
+        """Scrape all sources at once (different hosts) and score each as it completes"""
+        scored_by_source: Dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=len(self.sources)) as executor:
+            futures = {
+                executor.submit(scrape, company_name, dimension): source
+                for source, scrape in self.sources.items()
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    scored_by_source[source] = score(future.result())
+                except Exception as e:
+                    logger.error(f"Error scraping {source} for {label}: {e}")
+        return scored_by_source
+    
+    def _score_results(self, results: List[Dict[str, Any]], dimension: str) -> List[Dict[str, Any]]:
+        """Analyze and score results, keeping only relevant content"""
+        return self._score_results_all(results, [dimension])[dimension]
+    
+    def _score_results_all(self, results: List[Dict[str, Any]],
+                           dimensions: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Score results against several dimensions, keeping only relevant content per dimension"""
+        scored_results = {dimension: [] for dimension in dimensions}
+        for result in results:
+            content = result.get('content', '')
+            relevances = self.content_analyzer.analyze_all_dimensions(content, dimensions)
+            sentiment = rating = None
+            
+            for dimension, relevance in relevances.items():
+                if relevance['relevance_score'] > 0.3:  # Only include relevant content
+                    if sentiment is None:
+                        sentiment = self.content_analyzer.extract_sentiment(content)
+                        rating = self.content_analyzer.extract_rating(content)
+                    scored_results[dimension].append({
+                        **result,
+                        'relevance_score': relevance['relevance_score'],
+                        'confidence_score': relevance['confidence'],
+                        'sentiment': sentiment,
+                        'rating': rating,
+                        'extraction_date': datetime.now().isoformat(),
+                        'dimension': dimension
+                    })
+        return scored_results
+    
+    def _scrape_reddit(self, company_name: str, dimension: Optional[str] = None) -> List[Dict[str, Any]]:
         """Scrape Reddit for company and dimension-specific content"""
         results = []
         
@@ -297,10 +335,10 @@ class DynamicBulkScraper:
                 
                 full_url = urljoin(self.url_patterns['reddit']['base_url'], search_url)
                 
-                self.rate_limiter.wait()
-                self.session.headers['User-Agent'] = self.user_agent_rotator.get_user_agent()
-                
-                response = self.session.get(full_url, timeout=30)
+                self.rate_limiters['reddit'].wait(full_url)
+                response = self.sessions['reddit'].get(
+                    full_url, headers={'User-Agent': self.user_agent_rotator.get_user_agent()}, timeout=30
+                )
                 if response.status_code == 200:
                     soup = BeautifulSoup(response.content, 'html.parser')
                     
@@ -335,7 +373,7 @@ class DynamicBulkScraper:
         
         return results
     
-    def _scrape_g2(self, company_name: str, dimension: str) -> List[Dict[str, Any]]:
+    def _scrape_g2(self, company_name: str, dimension: Optional[str] = None) -> List[Dict[str, Any]]:
         """Scrape G2 for company reviews and comparisons"""
         results = []
         
@@ -347,10 +385,10 @@ class DynamicBulkScraper:
             
             full_url = urljoin(self.url_patterns['g2']['base_url'], reviews_url)
             
-            self.rate_limiter.wait()
-            self.session.headers['User-Agent'] = self.user_agent_rotator.get_user_agent()
-            
-            response = self.session.get(full_url, timeout=30)
+            self.rate_limiters['g2'].wait(full_url)
+            response = self.sessions['g2'].get(
+                full_url, headers={'User-Agent': self.user_agent_rotator.get_user_agent()}, timeout=30
+            )
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -377,7 +415,7 @@ class DynamicBulkScraper:
         
         return results
     
-    def _scrape_capterra(self, company_name: str, dimension: str) -> List[Dict[str, Any]]:
+    def _scrape_capterra(self, company_name: str, dimension: Optional[str] = None) -> List[Dict[str, Any]]:
         """Scrape Capterra for company reviews and alternatives"""
         results = []
         
@@ -389,10 +427,10 @@ class DynamicBulkScraper:
             
             full_url = urljoin(self.url_patterns['capterra']['base_url'], company_url)
             
-            self.rate_limiter.wait()
-            self.session.headers['User-Agent'] = self.user_agent_rotator.get_user_agent()
-            
-            response = self.session.get(full_url, timeout=30)
+            self.rate_limiters['capterra'].wait(full_url)
+            response = self.sessions['capterra'].get(
+                full_url, headers={'User-Agent': self.user_agent_rotator.get_user_agent()}, timeout=30
+            )
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
@@ -419,7 +457,7 @@ class DynamicBulkScraper:
         
         return results
     
-    def _scrape_trustradius(self, company_name: str, dimension: str) -> List[Dict[str, Any]]:
+    def _scrape_trustradius(self, company_name: str, dimension: Optional[str] = None) -> List[Dict[str, Any]]:
         """Scrape TrustRadius for company reviews and alternatives"""
         results = []
         
@@ -431,10 +469,10 @@ class DynamicBulkScraper:
             
             full_url = urljoin(self.url_patterns['trustradius']['base_url'], company_url)
             
-            self.rate_limiter.wait()
-            self.session.headers['User-Agent'] = self.user_agent_rotator.get_user_agent()
-            
-            response = self.session.get(full_url, timeout=30)
+            self.rate_limiters['trustradius'].wait(full_url)
+            response = self.sessions['trustradius'].get(
+                full_url, headers={'User-Agent': self.user_agent_rotator.get_user_agent()}, timeout=30
+            )
             if response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
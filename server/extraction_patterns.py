@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Extraction Pattern Registry
+
+Every regular expression the technical extractors run over page text,
+compiled once at import and shared by the scrapers.
+
+Case-insensitive patterns are ``FoldedPattern``s: they are matched with a
+lowercased pattern against the lowercased text, which lets the regex engine use
+its literal-prefix search (``re.IGNORECASE`` disables it and makes these scans
+several times slower). Results are sliced from the original text at the same
+offsets, so they keep their original case. Texts where lowercasing could change
+what matches -- the length changes when lowercased, or they contain characters
+that case-insensitive matching folds onto ASCII letters (such as the long s or
+the Kelvin sign) -- are matched case-insensitively on the original text instead.
+
+Patterns are kept as separate scans unless they cannot overlap: an alternation
+of unrelated patterns loses the literal-prefix search and is slower than
+running them one after the other.
+"""
+
+import re
+from typing import Iterator, List, Optional, Union
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+FOLD_SPECIAL = re.compile('[\u0130\u0131\u017f\u212a]')
+
+
+def _lower_pattern(pattern: str) -> str:
+    """Lowercase a pattern's literal characters, leaving escapes (``\\S``, ``\\D``) and ``(?P`` alone"""
+    return re.sub(r'\\.|\(\?P|[A-Z]+', lambda m: m.group() if m.group()[0] in '\\(' else m.group().lower(), pattern)
+
+
+class FoldedText:
+    """A text, its lowercased form and whether matching the latter is exact"""
+
+    __slots__ = ('text', 'lower', 'exact')
+
+    def __init__(self, text: str, lower: Optional[str] = None):
+        self.text = text or ''
+        self.lower = self.text.lower() if lower is None else lower
+        self.exact = len(self.lower) == len(self.text) and (self.text.isascii() or not FOLD_SPECIAL.search(self.text))
+
+    @classmethod
+    def of(cls, text: Union[str, 'FoldedText']) -> 'FoldedText':
+        return text if isinstance(text, FoldedText) else cls(text)
+
+
+class FoldedPattern:
+    """Case-insensitive pattern matched against lowercased text"""
+
+    __slots__ = ('pattern', 'regex', 'lowered')
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        self.lowered = re.compile(_lower_pattern(pattern))
+
+    def findall(self, text: Union[str, FoldedText]) -> List:
+        """Same result as ``re.findall(pattern, text, re.IGNORECASE)``"""
+        folded = FoldedText.of(text)
+        if not folded.exact:
+            return self.regex.findall(folded.text)
+        if folded.lower is folded.text:
+            return self.lowered.findall(folded.text)
+        return [self._result(match, folded.text) for match in self.lowered.finditer(folded.lower)]
+
+    def search(self, text: Union[str, FoldedText]) -> bool:
+        folded = FoldedText.of(text)
+        if not folded.exact:
+            return self.regex.search(folded.text) is not None
+        return self.lowered.search(folded.lower) is not None
+
+    def finditer(self, text: Union[str, FoldedText]) -> Iterator[re.Match]:
+        """Matches for their spans and group names (over the lowercased text when exact)"""
+        folded = FoldedText.of(text)
+        if not folded.exact:
+            return self.regex.finditer(folded.text)
+        return self.lowered.finditer(folded.lower)
+
+    def _result(self, match: re.Match, text: str):
+        """``findall`` item for ``match``, taken from the original text"""
+        groups = self.lowered.groups
+        if groups == 0:
+            return text[match.start():match.end()]
+        values = tuple(text[s:e] if s >= 0 else '' for s, e in (match.span(g) for g in range(1, groups + 1)))
+        return values[0] if groups == 1 else values
+
+
+# Content type detection (classify_technical_content)
+CONTENT_TYPE_PATTERNS = {
+    'api_docs': [FoldedPattern(p) for p in (
+        r'\b(api|endpoint|rest|graphql|swagger|openapi)\b',
+        r'https?://[^\s]+\.json',
+        r'https?://[^\s]+\.yaml',
+        r'https?://[^\s]+\.yml',
+        r'POST|GET|PUT|DELETE|PATCH',
+        r'status code|response code|error code'
+    )],
+    'sdk_docs': [FoldedPattern(p) for p in (
+        r'\b(sdk|client library|download|install|npm|pip|maven|gradle)\b',
+        r'github\.com|gitlab\.com|bitbucket\.org',
+        r'package\.json|requirements\.txt|pom\.xml|build\.gradle',
+        r'installation guide|getting started|quick start'
+    )],
+    'pricing': [FoldedPattern(p) for p in (
+        r'\b(price|plan|tier|billing|subscription|cost|pricing|enterprise)\b',
+        r'\$\d+|\d+\s*(per month|per year|monthly|yearly)',
+        r'contact sales|request quote|pricing calculator',
+        r'free|starter|professional|enterprise|custom'
+    )],
+    'deployment': [FoldedPattern(p) for p in (
+        r'\b(deploy|installation|setup|configuration|environment)\b',
+        r'docker|kubernetes|aws|azure|gcp|on-premise',
+        r'installation guide|deployment guide|setup instructions',
+        r'requirements|prerequisites|system requirements'
+    )]
+}
+
+# Links to machine-readable specs in page text (case-sensitive)
+SPEC_URL_PATTERNS = [re.compile(p) for p in (
+    r'https?://[^\s]+\.json', r'https?://[^\s]+\.yaml', r'https?://[^\s]+\.yml'
+)]
+
+# Spec file references in raw HTML (detect_openapi_specs)
+OPENAPI_URL_PATTERNS = [re.compile(p) for p in (
+    r'https?://[^\s"\']+\.json',
+    r'https?://[^\s"\']+\.yaml',
+    r'https?://[^\s"\']+\.yml'
+)]
+
+# API endpoints in text
+ENDPOINT_URL_PATTERN = FoldedPattern(r'https?://[^\s]+(/api/[^\s]+|/v\d+/[^\s]+|/[a-z]+/[a-z0-9_-]+)')
+HTTP_METHOD_PATH_PATTERN = FoldedPattern(r'\b(GET|POST|PUT|DELETE|PATCH)\s+([/\w-]+)')
+
+# Authentication schemes, by type
+AUTH_PATTERNS = {
+    'oauth2': [FoldedPattern(p) for p in (
+        r'oauth\s*2\.0',
+        r'client_id\s*[:=]\s*[\w-]+',
+        r'client_secret\s*[:=]\s*[\w-]+',
+        r'authorization_code',
+        r'access_token',
+        r'refresh_token'
+    )],
+    'api_key': [FoldedPattern(p) for p in (
+        r'api_key\s*[:=]\s*[\w-]+',
+        r'x-api-key',
+        r'authorization\s*:\s*bearer',
+        r'x-auth-token'
+    )],
+    'basic_auth': [FoldedPattern(p) for p in (
+        r'basic\s+authentication',
+        r'username\s*[:=]\s*[\w-]+',
+        r'password\s*[:=]\s*[\w-]+'
+    )]
+}
+
+# Rate limits
+RATE_LIMIT_PATTERNS = [FoldedPattern(p) for p in (
+    r'rate\s+limit[:\s]+(\d+)\s+(requests?|calls?)\s+per\s+(second|minute|hour|day)',
+    r'(\d+)\s+(requests?|calls?)\s+per\s+(second|minute|hour|day)',
+    r'throttling[:\s]+(\d+)\s+(requests?|calls?)',
+    r'quota[:\s]+(\d+)\s+(requests?|calls?)',
+    r'maximum\s+(\d+)\s+(requests?|calls?)'
+)]
+
+# Code structure keywords: whole words, so one scan counts both groups
+CODE_STRUCTURE_PATTERN = FoldedPattern(
+    r'\b(?:(?P<definitions>def|function|class)|(?P<imports>import|from|require|include))\b'
+)
+
+# URL path versions (matched against lowercased URLs)
+VERSION_PATH_PATTERN = re.compile(r'/v\d+/')
+API_VERSION_PATH_PATTERN = re.compile(r'/api/v\d+/')
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Extraction Process Pool
+
+CPU stage of the scrape pipeline. Fetching threads hand raw bodies to a pool
+of worker processes that parse them and run the technical extractors, so HTML
+parsing and extraction use every core instead of sharing one GIL with the
+fetchers. Workers send back only the extracted dictionaries, never parse trees.
+
+Bodies are handed over with as little copying as possible: small ones travel
+pickled with the task, larger ones are written once into a shared memory block
+that the worker decodes in place (or, when shared memory is unavailable, into
+a spill file). At most ``max_pending`` bodies are in flight; ``submit`` blocks
+until a worker finishes one, so fast fetchers cannot pile up unbounded bodies
+in memory.
+
+Workers start with ``forkserver`` (``spawn`` where that is unavailable) rather
+than forking a server that already runs threads. If a worker dies (OOM, crash)
+the pool is rebuilt and the affected tasks are retried once.
+
+``EXTRACTION_WORKERS=0`` runs extraction inline on the calling thread.
+"""
+
+import os
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_all_start_methods, get_context, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+EXTRACTION_MAX_PENDING = int(os.getenv('EXTRACTION_MAX_PENDING', '0'))  # 0: twice the workers
+SHARED_MEMORY_THRESHOLD = int(os.getenv('EXTRACTION_SHARED_MEMORY_THRESHOLD', str(64 * 1024)))
+# Forking a process that runs threads (the Flask server's refreshers) can copy held locks into workers
+EXTRACTION_START_METHOD = os.getenv('EXTRACTION_START_METHOD') or (
+    'forkserver' if 'forkserver' in get_all_start_methods() else 'spawn')
+SPILL_DIR = os.getenv('EXTRACTION_SPILL_DIR') or tempfile.gettempdir()
+
+# (kind, payload, size): ('inline', text, 0), ('shm', block name, bytes), ('file', path, bytes)
+BodyRef = Tuple[str, str, int]
+
+_worker_scraper = None
+
+
+def _scraper():
+    """Scraper instance of this worker process, created on its first task"""
+    global _worker_scraper
+    if _worker_scraper is None:
+        from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
+        _worker_scraper = CompetitiveIntelligenceScraper()
+    return _worker_scraper
+
+
+def read_body(ref: BodyRef) -> str:
+    """Decode a body handed over by ``ExtractionPool`` (worker side)"""
+    kind, payload, size = ref
+    if kind == 'inline':
+        return payload
+    if kind == 'shm':
+        block = SharedMemory(name=payload)
+        try:
+            with block.buf[:size] as view:
+                return str(view, 'utf-8')
+        finally:
+            block.close()
+    with open(payload, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+def extract_body(ref: BodyRef, url: str, company: str, category: str) -> Dict[str, Any]:
+    """Worker task: parse one body and return its extraction and scores"""
+    return _scraper()._extract_page(read_body(ref), url, company, category)
+
+
+class ExtractionPool:
+    """Bounded process pool for parsing and technical extraction"""
+
+    def __init__(self, max_workers: int = EXTRACTION_WORKERS, max_pending: int = EXTRACTION_MAX_PENDING,
+                 shared_memory_threshold: int = SHARED_MEMORY_THRESHOLD,
+                 start_method: Optional[str] = EXTRACTION_START_METHOD):
+        self.max_workers = max(0, int(max_workers))
+        self.max_pending = max(1, int(max_pending) or 2 * self.max_workers)
+        self.shared_memory_threshold = shared_memory_threshold
+        self.start_method = start_method
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        if self.max_workers:
+            # Workers must share the parent's tracker, or each one would unlink the blocks it saw on exit
+            resource_tracker.ensure_running()
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor() if self.max_workers else None
+        self._stats_lock = threading.Lock()
+        self.stats = {'submitted': 0, 'shared_memory': 0, 'spilled': 0, 'waited': 0, 'rebuilt': 0, 'retried': 0}
+
+    def submit(self, html: str, url: str = '', company: str = '', category: str = '') -> Future:
+        """Queue a body for extraction, blocking while ``max_pending`` bodies are in flight"""
+        if self._executor is None:
+            return self._run_inline(html, url, company, category)
+
+        if not self._slots.acquire(blocking=False):
+            self._count('waited')
+            self._slots.acquire()
+        try:
+            ref, release = self._hand_over(html or '')
+        except BaseException:
+            self._slots.release()
+            raise
+        self._count('submitted')
+        result: Future = Future()
+        self._dispatch(result, (ref, url, company, category), release, retry=True)
+        return result
+
+    def extract(self, html: str, url: str = '', company: str = '', category: str = '') -> Dict[str, Any]:
+        return self.submit(html, url, company, category).result()
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context(self.start_method))
+
+    def _rebuild(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """Replace ``broken`` (once, however many tasks noticed it) and return the live executor"""
+        with self._executor_lock:
+            if self._executor is broken:
+                logger.warning("Extraction worker died; restarting the process pool")
+                self._executor = self._new_executor()
+                broken.shutdown(wait=False)
+                self._count('rebuilt')
+            return self._executor
+
+    def _dispatch(self, result: Future, args: tuple, release: Callable[[], None], retry: bool):
+        """Run ``extract_body(*args)`` on the pool and settle ``result``, retrying once if the pool breaks"""
+        executor = self._executor
+        try:
+            try:
+                future = executor.submit(extract_body, *args)
+            except BrokenProcessPool:
+                executor = self._rebuild(executor)
+                future = executor.submit(extract_body, *args)
+        except BaseException as e:
+            self._settle(result, release, error=e)
+            return
+
+        def done(future: Future):
+            if retry and isinstance(future.exception(), BrokenProcessPool):
+                self._rebuild(executor)
+                self._count('retried')
+                self._dispatch(result, args, release, retry=False)
+            else:
+                self._settle(result, release, future)
+
+        future.add_done_callback(done)
+
+    def _settle(self, result: Future, release: Callable[[], None], future: Optional[Future] = None,
+                error: Optional[BaseException] = None):
+        if future is not None and future.cancelled():
+            result.cancel()
+        elif future is not None and future.exception() is None:
+            result.set_result(future.result())
+        else:
+            result.set_exception(error or future.exception())
+        # The result is visible before the slot frees up, so a blocked submit sees earlier tasks done
+        release()
+        self._slots.release()
+
+    def _hand_over(self, html: str) -> Tuple[BodyRef, Callable[[], None]]:
+        """Reference the worker can read the body from, and how to free it afterwards"""
+        if len(html) < self.shared_memory_threshold:
+            return ('inline', html, 0), lambda: None
+        data = html.encode('utf-8')
+        try:
+            block = SharedMemory(create=True, size=max(1, len(data)))
+        except OSError as e:
+            logger.warning(f"Shared memory unavailable ({e}), spilling body to disk")
+            fd, path = tempfile.mkstemp(prefix='extract_', suffix='.html', dir=SPILL_DIR)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            self._count('spilled')
+            return ('file', path, len(data)), lambda: _remove(path)
+        block.buf[:len(data)] = data
+        self._count('shared_memory')
+
+        def release():
+            block.close()
+            block.unlink()
+
+        return ('shm', block.name, len(data)), release
+
+    def _run_inline(self, html: str, url: str, company: str, category: str) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(_scraper()._extract_page(html, url, company, category))
+        except Exception as e:
+            future.set_exception(e)
+        self._count('submitted')
+        return future
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_shared_pool: Optional[ExtractionPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """Process-wide extraction pool, started on first use"""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = ExtractionPool()
+                logger.info(f"Extraction pool: {_shared_pool.max_workers} workers, "
+                            f"{_shared_pool.max_pending} bodies in flight")
+    return _shared_pool
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Feed Probe Cache
+
+Persistent record of feed-path probe outcomes per URL: paths that turned out
+to be feeds, and paths that were missing (404/410 or an HTML page). Later RSS
+discovery runs reuse known feeds without probing and skip known-missing paths
+until their entry expires.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path(os.getenv('FEED_PROBE_CACHE_PATH', str(Path(__file__).parent / 'feed_probe_cache.db')))
+DAY = 24 * 3600
+FEED_TTL = int(os.getenv('FEED_PROBE_FEED_TTL', str(30 * DAY)))        # re-probe known feeds monthly
+MISSING_TTL = int(os.getenv('FEED_PROBE_MISSING_TTL', str(7 * DAY)))   # re-probe dead paths weekly
+
+FEED = 'feed'
+MISSING = 'missing'
+
+SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS feed_probes (
+    url TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+class FeedProbeCache:
+    """Known feeds / known-missing feed paths with per-status TTLs"""
+
+    def __init__(self, db_path: Path = CACHE_PATH, feed_ttl: int = FEED_TTL, missing_ttl: int = MISSING_TTL):
+        self.ttls = {FEED: feed_ttl, MISSING: missing_ttl}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.commit()
+
+    def lookup(self, url: str) -> Optional[str]:
+        """``'feed'``, ``'missing'`` or None when the URL has no fresh probe result"""
+        with self._lock:
+            row = self._conn.execute("SELECT status, checked_at FROM feed_probes WHERE url = ?", (url,)).fetchone()
+        if row is None or time.time() - row[1] >= self.ttls.get(row[0], 0):
+            return None
+        return row[0]
+
+    def record(self, url: str, status: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feed_probes (url, status, checked_at) VALUES (?, ?, ?)",
+                (url, status, time.time()),
+            )
+            self._conn.commit()
+
+
+_shared_cache: Optional[FeedProbeCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_feed_probe_cache() -> Optional[FeedProbeCache]:
+    """Process-wide cache, or None if the database cannot be opened"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                try:
+                    _shared_cache = FeedProbeCache()
+                except sqlite3.Error as e:
+                    logger.warning(f"Feed probe cache unavailable: {e}")
+                    return None
+    return _shared_cache
@@ -6,29 +6,59 @@ Designed to support complete client functionality in the browser
 """
 
 import json
-import requests
 import time
 import random
 from datetime import datetime
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 from typing import Dict, List, Any, Optional
 import logging
 
+from http_cache import get_http_cache
+from http_client import create_session
+from robots_cache import ensure_allowed as ensure_robots_allowed
+from raw_html_archive import archive_body
+from keyword_matcher import KeywordTaxonomy
+from parsed_document import ParsedDocument
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Strategic dimensions: keywords and description
+STRATEGIC_DIMENSIONS = {
+    'api_first_architecture': (
+        ['api', 'rest', 'graphql', 'sdk', 'endpoint', 'webhook'],
+        'API-first design and developer experience'
+    ),
+    'cloud_native_features': (
+        ['kubernetes', 'docker', 'microservices', 'scaling', 'auto-scaling', 'serverless'],
+        'Cloud-native architecture and deployment'
+    ),
+    'data_integration': (
+        ['etl', 'connector', 'data_pipeline', 'integration', 'api_gateway', 'data_warehouse'],
+        'Data integration and pipeline capabilities'
+    ),
+    'developer_experience': (
+        ['developer', 'sdk', 'documentation', 'tutorial', 'example', 'getting_started'],
+        'Developer tools and experience quality'
+    ),
+    'modern_analytics_stack': (
+        ['analytics', 'bi', 'dashboard', 'visualization', 'machine_learning', 'ai'],
+        'Modern analytics and AI capabilities'
+    )
+}
+STRATEGIC_TAXONOMY = KeywordTaxonomy({dimension: keywords for dimension, (keywords, _) in STRATEGIC_DIMENSIONS.items()})
+
 class HardcodedCompetitorScraper:
     """Hardcoded competitor scraper for precision-targeted content extraction"""
     
     def __init__(self, content_map_file: str = "hardcoded_content_mapping_template.json"):
         """Initialize scraper with content mapping file"""
         self.content_map = self.load_content_map(content_map_file)
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
+        self.http_cache = get_http_cache()
         self.results = {}
         
     def load_content_map(self, content_map_file: str) -> Dict[str, Any]:
@@ -48,13 +78,16 @@ class HardcodedCompetitorScraper:
                 return None
                 
             logger.info(f"Scraping: {url}")
-            response = self.session.get(url, timeout=15)
+            ensure_robots_allowed(url)
+            response = self.http_cache.get(self.session, url, category=content_type, timeout=15)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                if not response.from_cache:
+                    archive_body(url, response.text, category=content_type)
+                doc = ParsedDocument(response.text, url)
                 
                 # Extract text content
-                text_content = self.extract_text_content(soup)
+                text_content = self.extract_text_content(doc.soup)
                 
                 # Score content based on type and technical relevance
                 technical_score = self.score_technical_relevance(text_content, content_type)
@@ -91,13 +124,9 @@ class HardcodedCompetitorScraper:
                 'scraped_at': datetime.now().isoformat()
             }
     
-    def extract_text_content(self, soup: BeautifulSoup) -> str:
-        """Extract clean text content from BeautifulSoup object"""
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text and clean it up
+    def extract_text_content(self, soup) -> str:
+        """Extract clean text content from a parsed page (``ParsedDocument.soup``)"""
+        # Get text and clean it up (script and style contents are not part of the text)
         text = soup.get_text()
         lines = (line.strip() for line in text.splitlines())
         chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
@@ -136,41 +165,17 @@ class HardcodedCompetitorScraper:
     
     def score_strategic_dimensions(self, content: str) -> Dict[str, Dict[str, Any]]:
         """Score content against strategic competitive dimensions"""
-        dimensions = {
-            'api_first_architecture': {
-                'keywords': ['api', 'rest', 'graphql', 'sdk', 'endpoint', 'webhook'],
-                'score': 0,
-                'description': 'API-first design and developer experience'
-            },
-            'cloud_native_features': {
-                'keywords': ['kubernetes', 'docker', 'microservices', 'scaling', 'auto-scaling', 'serverless'],
-                'score': 0,
-                'description': 'Cloud-native architecture and deployment'
-            },
-            'data_integration': {
-                'keywords': ['etl', 'connector', 'data_pipeline', 'integration', 'api_gateway', 'data_warehouse'],
-                'score': 0,
-                'description': 'Data integration and pipeline capabilities'
-            },
-            'developer_experience': {
-                'keywords': ['developer', 'sdk', 'documentation', 'tutorial', 'example', 'getting_started'],
-                'score': 0,
-                'description': 'Developer tools and experience quality'
-            },
-            'modern_analytics_stack': {
-                'keywords': ['analytics', 'bi', 'dashboard', 'visualization', 'machine_learning', 'ai'],
-                'score': 0,
-                'description': 'Modern analytics and AI capabilities'
+        hits = STRATEGIC_TAXONOMY.scan(content)
+        
+        # 10 points for each of a dimension's keywords found in the content
+        return {
+            dimension: {
+                'keywords': list(keywords),
+                'score': 10 * hits.count(dimension),
+                'description': description
             }
+            for dimension, (keywords, description) in STRATEGIC_DIMENSIONS.items()
         }
-        
-        # Score each dimension
-        for dimension, config in dimensions.items():
-            for keyword in config['keywords']:
-                if keyword in content.lower():
-                    config['score'] += 10
-        
-        return dimensions
     
     def scrape_company_strategic_content(self, company_name: str) -> Dict[str, Any]:
         """Scrape strategic content for a specific company"""
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Persistent Conditional-GET HTTP Cache
+
+SQLite-backed cache of response bodies and validators shared by every scraper.
+Entries younger than their category's TTL are served without touching the
+network; older entries are revalidated with If-None-Match / If-Modified-Since
+and a 304 is answered from the stored body.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path(os.getenv('HTTP_CACHE_PATH', str(Path(__file__).parent / 'http_cache.db')))
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Seconds an entry is trusted without revalidation, per content category.
+# Categories are matched exactly first, then by substring (e.g. 'api_docs' -> 'docs').
+DEFAULT_TTL_POLICY = {
+    'docs': 7 * DAY,
+    'reference': 7 * DAY,
+    'integrations': 7 * DAY,
+    'features': 3 * DAY,
+    'marketing': 1 * DAY,
+    'pricing': 1 * DAY,
+    'blog': 6 * HOUR,
+    'news': 6 * HOUR,
+    'rss': 1 * HOUR,
+    'robots': 1 * DAY,
+    'default': 1 * DAY,
+}
+
+# Response headers worth replaying from the cache. Bodies are stored decoded,
+# so Content-Encoding is deliberately not kept.
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control')
+
+SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    status_code INTEGER NOT NULL,
+    headers TEXT,
+    body BLOB,
+    etag TEXT,
+    last_modified TEXT,
+    category TEXT,
+    fetched_at REAL NOT NULL,
+    validated_at REAL NOT NULL
+);
+"""
+
+
+class HTTPCache:
+    """Conditional-GET cache with a per-category TTL policy"""
+
+    def __init__(self, db_path: Path = CACHE_PATH, ttl_policy: Optional[Dict[str, int]] = None):
+        self.db_path = Path(db_path)
+        self.ttl_policy = dict(DEFAULT_TTL_POLICY)
+        if ttl_policy:
+            self.ttl_policy.update(ttl_policy)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.commit()
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'misses': 0}
+
+    def ttl_for(self, category: str) -> int:
+        """TTL in seconds for a content category"""
+        category = (category or 'default').lower()
+        if category in self.ttl_policy:
+            return self.ttl_policy[category]
+        for key, ttl in self.ttl_policy.items():
+            if key != 'default' and key in category:
+                return ttl
+        return self.ttl_policy['default']
+
+    def get(self, session: Any, url: str, category: str = 'default',
+            headers: Optional[Dict[str, str]] = None,
+            before_request: Optional[Callable[[], Any]] = None,
+            send: Optional[Callable[..., requests.Response]] = None, **kwargs) -> requests.Response:
+        """
+        GET ``url`` through ``session`` (a requests.Session or the requests module).
+
+        ``before_request`` runs only when the network is actually used, which lets
+        callers skip rate limiting for fresh cache hits. ``send(session, url,
+        headers=..., **kwargs)`` replaces the plain ``session.get`` call (e.g.
+        ``stream_fetch.stream_get`` for capped downloads). Returns a
+        ``requests.Response``; responses served from the cache carry
+        ``from_cache = True``.
+        """
+        entry = self._lookup(url)
+        now = time.time()
+
+        if entry and now - entry['validated_at'] < self.ttl_for(category):
+            self.stats['fresh_hits'] += 1
+            return self._build_response(url, entry)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry['etag']:
+                request_headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        if before_request is not None:
+            before_request()
+        if send is not None:
+            response = send(session, url, headers=request_headers, **kwargs)
+        else:
+            response = session.get(url, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.stats['revalidated'] += 1
+            self._touch(url, now)
+            return self._build_response(url, entry)
+
+        self.stats['misses'] += 1
+        if response.status_code == 200:
+            self._store(url, response, category, now)
+        response.from_cache = False
+        return response
+
+    def invalidate(self, url: str):
+        """Drop a single cached URL"""
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def _lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, body, etag, last_modified, validated_at FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            'status_code': row[0],
+            'headers': json.loads(row[1] or '{}'),
+            'body': row[2] or b'',
+            'etag': row[3],
+            'last_modified': row[4],
+            'validated_at': row[5],
+        }
+
+    def _store(self, url: str, response: requests.Response, category: str, now: float):
+        stored_headers = {k: response.headers[k] for k in STORED_HEADERS if k in response.headers}
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO http_cache
+                    (url, status_code, headers, body, etag, last_modified, category, fetched_at, validated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    response.status_code,
+                    json.dumps(stored_headers),
+                    response.content,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    category,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+
+    def _touch(self, url: str, now: float):
+        with self._lock:
+            self._conn.execute("UPDATE http_cache SET validated_at = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+
+    @staticmethod
+    def _build_response(url: str, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = bytes(entry['body'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+_shared_cache: Optional[HTTPCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache:
+    """Process-wide cache shared by every scraper module"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = HTTPCache()
+    return _shared_cache
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client
+
+One connection-pool layer for every scraper module. All sessions built here
+mount the same ``HTTPAdapter`` instances, so keep-alive connections (and the
+TLS handshakes behind them) are reused per host across modules while each
+caller still gets its own headers and cookies. Also negotiates every
+compression scheme urllib3 can decode (gzip/deflate, plus brotli and zstd
+when their packages are installed) and caches DNS lookups with a TTL for the
+connections those adapters open (nothing else in the process is affected).
+"""
+
+import os
+import time
+import socket
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', '64'))   # hosts kept in the pool manager
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '10'))           # keep-alive connections per host
+DNS_CACHE_TTL = float(os.getenv('HTTP_DNS_CACHE_TTL', '300'))      # seconds; 0 disables DNS caching
+DNS_CACHE_SIZE = int(os.getenv('HTTP_DNS_CACHE_SIZE', '1024'))     # (host, port) entries kept
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+    # urllib3 advertises only the encodings it can actually decode here (br/zstd when installed)
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+_adapters: Optional[Tuple[HTTPAdapter, HTTPAdapter]] = None
+_shared_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+class DNSCache:
+    """Bounded LRU of resolved addresses per (host, port), each kept for ``ttl`` seconds"""
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL, max_entries: int = DNS_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max(max_entries, 1)
+        self._entries: 'OrderedDict[Tuple[str, int], Tuple[float, List[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def addresses(self, host: str, port: int) -> List[str]:
+        """IP addresses for ``host`` in resolver order (resolved on a miss or once expired)"""
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+        infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+dns_cache = DNSCache()
+
+
+class _CachedDNSConnectionMixin:
+    """Connects to the cached addresses of the host; TLS and Host headers still use the hostname"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = dns_cache.addresses(host, self.port)
+        except (OSError, UnicodeError):
+            addresses = []
+        if not addresses:
+            # Let urllib3 resolve again and raise its usual error
+            return super()._new_conn()
+        error: Optional[Exception] = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:
+                    error = e
+        finally:
+            self._dns_host = host
+        # None of the cached addresses answered: resolve afresh next time
+        dns_cache.forget(host, self.port)
+        raise error
+
+
+class _CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class ScraperAdapter(HTTPAdapter):
+    """HTTPAdapter whose direct connections go through the shared DNS cache"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if DNS_CACHE_TTL > 0:
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': _CachedDNSHTTPConnectionPool,
+                'https': _CachedDNSHTTPSConnectionPool,
+            }
+
+
+def _shared_adapters() -> Tuple[HTTPAdapter, HTTPAdapter]:
+    global _adapters
+    if _adapters is None:
+        with _lock:
+            if _adapters is None:
+                _adapters = (
+                    ScraperAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE),
+                    ScraperAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE),
+                )
+    return _adapters
+
+
+def create_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """New session with its own headers/cookies on top of the shared connection pools"""
+    session = requests.Session()
+    https_adapter, http_adapter = _shared_adapters()
+    session.mount('https://', https_adapter)
+    session.mount('http://', http_adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide session for module-level fetch helpers"""
+    global _shared_session
+    if _shared_session is None:
+        session = create_session()
+        with _lock:
+            if _shared_session is None:
+                _shared_session = session
+    return _shared_session
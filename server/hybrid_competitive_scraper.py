@@ -200,8 +200,13 @@ class HybridCompetitiveScraper:
         logger.info(f"Surgical scraping placeholder for {competitor_name} - {dimension}")
         return []
     
-    def scrape_competitor_all_dimensions(self, competitor_name: str) -> Dict[str, Any]:
-        """Scrape all dimensions for a specific competitor"""
+    def scrape_competitor_all_dimensions(self, competitor_name: str, fetch_once: bool = True) -> Dict[str, Any]:
+        """Scrape all dimensions for a specific competitor
+        
+        With ``fetch_once`` each source is fetched a single time and scored against
+        every dimension, and all results are stored in one transaction; otherwise
+        every dimension is scraped separately.
+        """
         logger.info(f"Scraping all dimensions for {competitor_name}")
         
         results = {
@@ -211,36 +216,98 @@ class HybridCompetitiveScraper:
             'summary': {}
         }
         
-        total_results = 0
-        successful_dimensions = 0
+        if fetch_once:
+            results['dimension_results'] = self._scrape_competitor_dimensions_once(competitor_name)
+        else:
+            results['dimension_results'] = self._scrape_competitor_dimensions_separately(competitor_name)
+        
+        successful = [r for r in results['dimension_results'].values() if r.get('summary', {}).get('success')]
+        results['summary'] = {
+            'total_dimensions': len(self.dimensions),
+            'successful_dimensions': len(successful),
+            'total_results': sum(r['summary']['total_results'] for r in successful),
+            'success_rate': len(successful) / len(self.dimensions) if self.dimensions else 0
+        }
+        
+        return results
+    
+    def _scrape_competitor_dimensions_once(self, competitor_name: str) -> Dict[str, Dict[str, Any]]:
+        """Fetch the sources once, score every dimension and bulk-insert the results"""
+        scraping_timestamp = datetime.now().isoformat()
+        dimension_results = {}
+        
+        try:
+            dynamic_by_dimension = self.dynamic_scraper.scrape_company_all_dimensions(
+                competitor_name, self.dimensions
+            )
+            
+            data_by_dimension = {}
+            for dimension in self.dimensions:
+                dynamic_results = dynamic_by_dimension.get(dimension, [])
+                surgical_results = self._surgical_scrape_competitor_dimension(competitor_name, dimension)
+                all_results = dynamic_results + surgical_results
+                if all_results:
+                    data_by_dimension[dimension] = all_results
+                
+                dimension_results[dimension] = {
+                    'competitor': competitor_name,
+                    'dimension': dimension,
+                    'scraping_timestamp': scraping_timestamp,
+                    'dynamic_scraping_results': dynamic_results,
+                    'surgical_scraping_results': surgical_results,
+                    'summary': {
+                        'total_results': len(all_results),
+                        'dynamic_results': len(dynamic_results),
+                        'surgical_results': len(surgical_results),
+                        'success': True
+                    }
+                }
+            
+            if data_by_dimension:
+                inserted_counts = self.db.insert_competitive_intelligence_bulk(competitor_name, data_by_dimension)
+                logger.info(f"Stored {sum(inserted_counts.values())} competitive intelligence records")
+            
+        except Exception as e:
+            logger.error(f"Error scraping {competitor_name} for all dimensions: {e}")
+            dimension_results = {
+                dimension: {
+                    'competitor': competitor_name,
+                    'dimension': dimension,
+                    'scraping_timestamp': scraping_timestamp,
+                    'dynamic_scraping_results': [],
+                    'surgical_scraping_results': [],
+                    'summary': {
+                        'total_results': 0,
+                        'dynamic_results': 0,
+                        'surgical_results': 0,
+                        'success': False,
+                        'error': str(e)
+                    }
+                }
+                for dimension in self.dimensions
+            }
+        
+        return dimension_results
+    
+    def _scrape_competitor_dimensions_separately(self, competitor_name: str) -> Dict[str, Dict[str, Any]]:
+        """Scrape each dimension on its own (one fetch of every source per dimension)"""
+        dimension_results = {}
         
         for dimension in self.dimensions:
             try:
-                dimension_result = self.scrape_competitor_dimension(competitor_name, dimension)
-                results['dimension_results'][dimension] = dimension_result
-                
-                if dimension_result['summary']['success']:
-                    successful_dimensions += 1
-                    total_results += dimension_result['summary']['total_results']
+                dimension_results[dimension] = self.scrape_competitor_dimension(competitor_name, dimension)
                 
                 # Add delay between dimensions
                 time.sleep(2)
                 
             except Exception as e:
                 logger.error(f"Error scraping {competitor_name} for {dimension}: {e}")
-                results['dimension_results'][dimension] = {
+                dimension_results[dimension] = {
                     'error': str(e),
                     'success': False
                 }
         
-        results['summary'] = {
-            'total_dimensions': len(self.dimensions),
-            'successful_dimensions': successful_dimensions,
-            'total_results': total_results,
-            'success_rate': successful_dimensions / len(self.dimensions) if self.dimensions else 0
-        }
-        
-        return results
+        return dimension_results
     
     def scrape_all_competitors_dimension(self, dimension: str) -> Dict[str, Any]:
         """Scrape a specific dimension for all competitors"""
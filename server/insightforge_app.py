@@ -5,6 +5,7 @@ import os
 import json
 import logging
 import traceback
+import threading
 from dotenv import load_dotenv
 import pandas as pd
 import numpy as np
@@ -14,7 +15,7 @@ from typing import Dict, List, Optional, Any
 # Import our custom modules
 from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
 from ai_competitive_analyzer import AICompetitiveAnalyzer
-from real_data_scraper import RealDataCompetitiveScraper
+from real_data_scraper import RealDataCompetitiveScraper, get_real_data_cache, get_cached_competitor, ALL_COMPETITORS
 from competitor_targeting import COMPETITORS
 from enterprise_software_analyzer import EnterpriseSoftwareAnalyzer
 
@@ -1086,61 +1087,88 @@ def download_file(filename: str):
             'message': str(e)
         }), 500
 
+def get_db_connection():
+    """Connection to the scrape database (``scraped_items``)"""
+    import sqlite3
+    return sqlite3.connect('scraped_data.db')
+
+def _strategic_comparison_per_company(conn) -> Dict[str, Any]:
+    """Strategic comparison computed company by company (used without scikit-learn)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT company, category, url, text_content, quality_score, technical_relevance, scraped_at
+        FROM scraped_items 
+        ORDER BY company, scraped_at DESC
+    """)
+    
+    items = cursor.fetchall()
+    
+    # Group items by company
+    company_data = {}
+    for item in items:
+        company = item[0]
+        if company not in company_data:
+            company_data[company] = []
+        
+        company_data[company].append({
+            'company': item[0],
+            'category': item[1],
+            'url': item[2],
+            'text_content': item[3],
+            'quality_score': item[4],
+            'technical_relevance': item[5],
+            'scraped_at': item[6]
+        })
+    
+    # Analyze each company using the enhanced scraper
+    scraper = CompetitiveIntelligenceScraper()
+    
+    comparison_results = {}
+    for company, content in company_data.items():
+        try:
+            # Extract strategic comparison data
+            comparison_data = scraper.extract_strategic_comparison_data(content)
+            comparison_results[company] = comparison_data
+        except Exception as e:
+            print(f"Error analyzing {company}: {e}")
+            comparison_results[company] = {
+                'api_first_architecture': 0,
+                'cloud_native_features': 0,
+                'data_integration': 0,
+                'developer_experience': 0,
+                'modern_analytics': 0,
+                'overall_score': 0,
+                'positioning': 'Unknown'
+            }
+    return comparison_results
+
+def _warm_strategic_matrix():
+    """Build the strategic item matrix before the first request needs it"""
+    try:
+        from strategic_batch_scorer import get_strategic_batch_scorer
+        conn = get_db_connection()
+        try:
+            get_strategic_batch_scorer().score(conn)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"Could not warm strategic comparison matrix: {e}")
+
 @app.route('/api/strategic-comparison', methods=['GET'])
 def get_strategic_comparison():
     """Get strategic comparison data across competitive dimensions"""
     try:
-        # Get all scraped items
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT company, category, url, text_content, quality_score, technical_relevance, scraped_at
-            FROM scraped_items 
-            ORDER BY company, scraped_at DESC
-        """)
-        
-        items = cursor.fetchall()
-        conn.close()
-        
-        # Group items by company
-        company_data = {}
-        for item in items:
-            company = item[0]
-            if company not in company_data:
-                company_data[company] = []
-            
-            company_data[company].append({
-                'company': item[0],
-                'category': item[1],
-                'url': item[2],
-                'text_content': item[3],
-                'quality_score': item[4],
-                'technical_relevance': item[5],
-                'scraped_at': item[6]
-            })
-        
-        # Analyze each company using the enhanced scraper
-        from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
-        scraper = CompetitiveIntelligenceScraper()
-        
-        comparison_results = {}
-        for company, content in company_data.items():
+        try:
             try:
-                # Extract strategic comparison data
-                comparison_data = scraper.extract_strategic_comparison_data(content)
-                comparison_results[company] = comparison_data
-            except Exception as e:
-                print(f"Error analyzing {company}: {e}")
-                comparison_results[company] = {
-                    'api_first_architecture': 0,
-                    'cloud_native_features': 0,
-                    'data_integration': 0,
-                    'developer_experience': 0,
-                    'modern_analytics': 0,
-                    'overall_score': 0,
-                    'positioning': 'Unknown'
-                }
+                from strategic_batch_scorer import get_strategic_batch_scorer
+            except ImportError:
+                comparison_results = _strategic_comparison_per_company(conn)
+            else:
+                # Every company scored at once from the cached item x term matrix
+                comparison_results = get_strategic_batch_scorer().score(conn)
+        finally:
+            conn.close()
         
         return jsonify({
             'success': True,
@@ -1170,28 +1198,30 @@ def internal_error(error):
         'message': 'An unexpected error occurred'
     }), 500
 
-# Main execution
-if __name__ == '__main__':
-    # Ensure output directories exist
-    os.makedirs('competitive_intelligence_output', exist_ok=True)
-    os.makedirs('enterprise_software_output', exist_ok=True)
-    
-    # Run the Flask app
-    app.run(debug=True, host='0.0.0.0', port=5001) 
 # Real Data Integration Endpoints
+def _cache_info(entry) -> Dict[str, Any]:
+    """Freshness of a cached real-data result"""
+    return {
+        'cached_at': entry.cached_at,
+        'age_seconds': round(entry.age(), 1),
+        'stale': get_real_data_cache().is_stale(entry)
+    }
+
 @app.route('/api/real-competitor-data', methods=['GET'])
 def get_real_competitor_data():
     """Get real scraped data from all competitors in competitor_targeting.py"""
     try:
-        scraper = RealDataCompetitiveScraper()
-        real_data = scraper.scrape_all_competitors()
+        # Served from the refreshing cache; only the very first read waits for the scrape
+        entry = get_real_data_cache().get(ALL_COMPETITORS)
+        real_data = entry.value
         
         return jsonify({
             'success': True,
             'data': real_data,
             'timestamp': datetime.now().isoformat(),
             'data_source': 'competitor_targeting.py',
-            'total_competitors': len(real_data)
+            'total_competitors': len(real_data),
+            'cache': _cache_info(entry)
         })
         
     except Exception as e:
@@ -1205,16 +1235,23 @@ def get_real_competitor_data():
 def get_real_competitor(company_name):
     """Get real scraped data for a specific competitor"""
     try:
-        scraper = RealDataCompetitiveScraper()
-        competitor_data = scraper.scrape_competitor(company_name)
+        competitor_data, entry = get_cached_competitor(company_name)
         
         return jsonify({
             'success': True,
             'company': company_name,
             'data': competitor_data,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            'cache': _cache_info(entry)
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.now().isoformat()
+        }), 404
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1278,3 +1315,16 @@ def get_scraping_progress():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+# Main execution
+if __name__ == '__main__':
+    # Ensure output directories exist
+    os.makedirs('competitive_intelligence_output', exist_ok=True)
+    os.makedirs('enterprise_software_output', exist_ok=True)
+    
+    # Start loading real competitor data in the serving process (not the reloader parent)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_real_data_cache()
+        threading.Thread(target=_warm_strategic_matrix, name='strategic-matrix-warm', daemon=True).start()
+    
+    # Run the Flask app
+    app.run(debug=True, host='0.0.0.0', port=5001) 
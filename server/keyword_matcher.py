@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Keyword Taxonomy Matcher
+
+One matcher for every keyword-based scorer: a taxonomy (named categories of
+keywords) is normalized and compiled once, and a scan of a text answers any
+number of category questions (which keywords occur, how many, where).
+
+Matching keeps the semantics of ``keyword in text``: keywords match anywhere
+(also inside words) and occurrences may overlap. Presence is decided with
+CPython's substring search, once per distinct keyword per text and only for the
+categories actually asked about, so keywords shared between categories (or
+scorers) are not searched again. Occurrence offsets come from a single pass of
+a trie-shaped regular expression over the text: it reports the longest keyword
+starting at each match position, and every other keyword starting there is a
+prefix of it, filled in from a precomputed table.
+"""
+
+import re
+from collections import defaultdict
+from functools import cached_property
+from typing import Dict, Hashable, Iterable, List, Mapping
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching any of ``keywords``, factored by common prefix (longest match first)"""
+    root: Dict = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional group: a longer keyword wins over one ending here
+        return f'(?:{body})?' if '' in node else body
+
+    return build(root)
+
+
+class KeywordHits:
+    """Keyword matches in one (normalized) text, evaluated on demand and memoized"""
+
+    def __init__(self, taxonomy: 'KeywordTaxonomy', text: str):
+        self.taxonomy = taxonomy
+        self.text = text
+        self._found: Dict[str, bool] = {}
+
+    def _has(self, keyword: str) -> bool:
+        found = self._found.get(keyword)
+        if found is None:
+            found = self._found[keyword] = keyword in self.text
+        return found
+
+    def __contains__(self, keyword: str) -> bool:
+        return self._has(self.taxonomy.normalize(keyword))
+
+    @cached_property
+    def offsets(self) -> Dict[str, List[int]]:
+        """Start offsets of every occurrence, by keyword (one pass over the text)"""
+        return self.taxonomy.locate(self.text)
+
+    def found(self) -> List[str]:
+        """Every distinct keyword of the taxonomy that occurs in the text"""
+        return [k for k in self.taxonomy.keywords if self._has(k)]
+
+    def present(self, category: Hashable) -> List[str]:
+        """Keywords of ``category`` found in the text, in taxonomy order (repeats kept)"""
+        return [k for k in self.taxonomy.categories[category] if self._has(k)]
+
+    def count(self, category: Hashable) -> int:
+        """How many of the category's keywords occur (``sum(1 for k in keywords if k in text)``)"""
+        return sum(1 for k in self.taxonomy.categories[category] if self._has(k))
+
+    def any(self, category: Hashable) -> bool:
+        return any(self._has(k) for k in self.taxonomy.categories[category])
+
+    def occurrences(self, category: Hashable) -> int:
+        """Total number of occurrences of the category's (distinct) keywords"""
+        return sum(len(self.offsets.get(k, ())) for k in dict.fromkeys(self.taxonomy.categories[category]))
+
+    def category_offsets(self, category: Hashable) -> List[int]:
+        """Sorted start offsets of every occurrence of the category's keywords"""
+        return sorted(o for k in dict.fromkeys(self.taxonomy.categories[category]) for o in self.offsets.get(k, ()))
+
+    def counts(self) -> Dict[Hashable, int]:
+        return {category: self.count(category) for category in self.taxonomy.categories}
+
+
+class KeywordTaxonomy:
+    """Named keyword categories, normalized and compiled once"""
+
+    def __init__(self, categories: Mapping[Hashable, Iterable[str]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.categories: Dict[Hashable, List[str]] = {
+            category: [self.normalize(k) for k in keywords if k] for category, keywords in categories.items()
+        }
+        keywords = self.keywords = sorted({k for ks in self.categories.values() for k in ks})
+        # Every keyword that starts where ``longest`` starts is a prefix of it
+        self._starting_with: Dict[str, List[str]] = {
+            longest: [k for k in keywords if longest.startswith(k)] for longest in keywords
+        }
+        self._pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+
+    def normalize(self, keyword: str) -> str:
+        return keyword if self.case_sensitive else keyword.lower()
+
+    def scan(self, text: str, lowered: bool = False) -> KeywordHits:
+        """Matches in ``text`` (pass ``lowered=True`` if it is already lowercase)"""
+        text = text or ''
+        if not (self.case_sensitive or lowered):
+            text = text.lower()
+        return KeywordHits(self, text)
+
+    def locate(self, text: str) -> Dict[str, List[int]]:
+        """Start offsets of every keyword occurrence in an already normalized ``text``"""
+        if self._pattern is None:
+            return {}
+        offsets: Dict[str, List[int]] = defaultdict(list)
+        search = self._pattern.search
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            for keyword in self._starting_with[match.group()]:
+                offsets[keyword].append(start)
+            # Resume one character later so overlapping occurrences are found too
+            match = search(text, start + 1)
+        return dict(offsets)
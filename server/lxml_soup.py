@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+lxml Parser Backend
+
+Fast path for ``ParsedDocument``: the page is parsed by libxml2 (lxml) and
+wrapped in ``LxmlTag``s, which answer the part of the BeautifulSoup Tag API the
+extractors use (``find_all``/``find``, ``get``/``[]``, ``get_text``, ``text``,
+``string``, ``str()``) with the values BeautifulSoup's ``html.parser`` builder
+would give: ``class``/``rel`` as lists, whitespace-only strings collapsed,
+script, style and template text left out of ``get_text``, attributes
+serialized sorted.
+
+libxml2 repairs broken markup differently from ``html.parser`` (it closes an
+open ``<p>`` at a ``<div>``, never nests ``<a>`` tags, decodes ``&copy`` without
+its semicolon, ...). ``parse`` therefore first scans the source and rebuilds
+the element shape and strings ``html.parser`` would produce; the libxml2 tree is
+only used when the page tokenizes unambiguously and both trees have the same
+shape and strings.
+Otherwise ``parse`` returns None and the caller uses ``html.parser``, so the
+extracted values never depend on the backend.
+"""
+
+import re
+import threading
+from html import unescape
+from html.entities import html5
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution
+from bs4.element import Comment, Doctype, PreformattedString
+from bs4.formatter import HTMLFormatter
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# html.parser tree builder semantics
+VOID_ELEMENTS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
+STRING_CONTAINERS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+PRESERVE_WHITESPACE = frozenset(HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS)
+LIST_ATTRIBUTES = HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES
+CDATA_TAGS = frozenset(HTMLFormatter.REGISTRY['minimal'].cdata_containing_tags)
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+STRUCTURE_TAGS = ('html', 'head', 'body')
+
+# Attributes libxml2 fills with their own name when written without a value
+LIBXML_BOOLEAN_ATTRIBUTES = frozenset([
+    'checked', 'compact', 'declare', 'defer', 'disabled', 'ismap', 'multiple',
+    'nohref', 'noresize', 'noshade', 'nowrap', 'readonly', 'selected',
+])
+# Open element -> start tags that make libxml2 close it (html.parser nests them instead);
+# lets the source scan give up early, the shape comparison stays the real check
+LIBXML_CLOSED_BY = {tag: frozenset(closers.split()) for tag, closers in {
+    'a': 'a fieldset table td th',
+    'address': 'dd dl dt form li ul',
+    'b': 'center p td th', 'i': 'center p td th', 'u': 'p td th', 'font': 'center td th',
+    'big': 'p', 'small': 'p', 's': 'p', 'strike': 'p', 'tt': 'p', 'span': 'td th',
+    'caption': 'col colgroup tbody tfoot thead tr',
+    'colgroup': 'colgroup tbody tfoot thead tr',
+    'dd': 'dt', 'dt': 'dd dl', 'dl': 'form li',
+    'dir': 'dd dl dt form ul', 'menu': 'dd dl dt form ul', 'ul': 'address form menu pre', 'ol': 'form',
+    'form': 'form', 'li': 'li', 'option': 'optgroup option',
+    'h1': 'fieldset form li p table', 'h2': 'fieldset form li p table', 'h3': 'fieldset form li p table',
+    'h4': 'fieldset form li p table', 'h5': 'fieldset form li p table', 'h6': 'fieldset form li p table',
+    'p': ('address blockquote caption center col colgroup dd dir div dl dt fieldset form h1 h2 h3 h4 h5 h6 '
+          'hr li listing menu ol p pre table tbody td tfoot th tr ul xmp'),
+    'pre': 'dd dl dt fieldset form li table ul',
+    'tbody': 'tbody tfoot', 'thead': 'tbody tfoot', 'tfoot': 'tbody', 'tr': 'tbody tfoot tr',
+    'td': 'tbody td tfoot th tr', 'th': 'tbody td tfoot th tr',
+}.items()}
+RAW_TEXT_TAGS = frozenset(['script', 'style'])
+# Elements whose content libxml2 does not parse as markup
+TEXT_ONLY_TAGS = frozenset(['title', 'textarea', 'iframe', 'noembed', 'noframes', 'xmp', 'plaintext'])
+
+_ATTR_NAME = r"""[!#-&(-.0-;?-~]+"""
+_ATTRS = (r"""(?:[ \t\n]+""" + _ATTR_NAME
+          + r"""(?:[ \t\n]*=[ \t\n]*(?:"[^"]*"|'[^']*'|[^\s"'=<>`]+(?=[ \t\n>])))?)*""")
+# Text up to the next tag, then the tag; every group is non-empty when it matched
+_TOKEN = re.compile(r"""
+  (?P<text>[^<]*(?:<(?![a-zA-Z/!?])[^<]*)*)
+  (?:<(?:
+      (?P<comment>!--.*?--)>
+    | (?P<doctype>!(?i:doctype)[ \t\n][^<>]*)>
+    | /(?P<end>[a-zA-Z][a-zA-Z0-9-]*)[ \t\n]*>
+    | (?P<raw>(?i:script|style))(?P<raw_attrs>""" + _ATTRS + r""")[ \t\n]*>(?P<raw_text>.*?)</(?P=raw)[ \t\n]*>
+    | (?P<rc>(?i:title|textarea|iframe|noembed|noframes|xmp))(?P<rc_attrs>""" + _ATTRS + r""")[ \t\n]*>
+      (?P<rc_text>[^<]*)</(?P=rc)[ \t\n]*>
+    | (?P<start>[a-zA-Z][a-zA-Z0-9-]*)(?P<attrs>""" + _ATTRS + r""")[ \t\n]*(?P<close>/?)>
+    | (?P<bad>[a-zA-Z/!?])
+  )|$)
+""", re.S | re.X)
+_ATTR_PARTS = re.compile(r'(' + _ATTR_NAME + r')(?:[ \t\n]*(=)[ \t\n]*(?:"[^"]*"|\'[^\']*\'|[^\s"\'=<>`]+))?')
+_RAW_END = {name: re.compile(r'</\s*' + name) for name in RAW_TEXT_TAGS}
+_STRUCTURE_TAG = re.compile(r'<(?:html|head|body)[\s/>]', re.I)
+_HTML_TAG = re.compile(r'<html[\s/>]', re.I)
+_UNSAFE_CHARS = re.compile(r'[\x00-\x08\x0b-\x1f\x7f\ufeff\ufffe\uffff]')
+
+# Character references both parsers (and ``html.unescape`` for attributes) decode alike
+_REFERENCE = re.compile(r'&(?:#[xX]([0-9a-fA-F]+);|#([0-9]+);|([a-zA-Z][-.a-zA-Z0-9]*)(;?)|#)')
+_SAFE_NAMED = frozenset(name for name, char in EntitySubstitution.HTML_ENTITY_TO_CHARACTER.items()
+                        if html5.get(name + ';') == char)
+_BS4_NAMED = frozenset(EntitySubstitution.HTML_ENTITY_TO_CHARACTER)
+_LEGACY_PREFIX = re.compile('|'.join(sorted((name for name in html5 if not name.endswith(';')),
+                                            key=len, reverse=True)))
+_NONWHITESPACE = re.compile(r'\S+')
+_CHARSET = re.compile(r'((^|;)\s*charset=)([^;]*)', re.M)
+
+
+def _safe_codepoint(code: int) -> bool:
+    # Not whitespace either: libxml2 drops it in places where html.parser keeps a string
+    return (0x21 <= code <= 0x7e or 0xa0 <= code <= 0xd7ff
+            or 0xe000 <= code <= 0xfdcf or 0xfdf0 <= code <= 0xfffd or 0x10000 <= code <= 0x10fffd)
+
+
+def _references_safe(html: str) -> bool:
+    for match in _REFERENCE.finditer(html):
+        hex_code, code, name, semicolon = match.groups()
+        if hex_code is not None or code is not None:
+            if not _safe_codepoint(int(hex_code, 16) if hex_code is not None else int(code)):
+                return False
+        elif name is None:
+            return False
+        elif semicolon:
+            if name not in _SAFE_NAMED:
+                return False
+        elif name in _BS4_NAMED or _LEGACY_PREFIX.match(name):
+            return False
+    return True
+
+
+class SourceShape(NamedTuple):
+    """What ``html.parser`` makes of a page, as far as the libxml2 tree has to agree with it"""
+    shape: List[Tuple[str, int]]            # preorder (tag, depth); ('#', depth) strings, ('!', depth) comments
+    counts: Dict[str, int]                  # explicit html/head/body tags
+    outside: List[List[str]]                # doctype, comments and whitespace before/after the tree (libxml2 drops them)
+    valueless: List[Tuple[int, List[str]]]  # (element index, attributes libxml2 fills with their name)
+    texts: List[str]                        # the strings of the ('#', depth) entries, decoded
+
+
+def html_parser_shape(html: str) -> Optional[SourceShape]:
+    """Shape of the tree ``html.parser`` builds from ``html``
+
+    None when the source holds anything the two parsers might read differently.
+    """
+    if '\r' in html or _UNSAFE_CHARS.search(html) or '<![' in html or '<?' in html \
+            or ('&' in html and not _references_safe(html)):
+        return None
+    strict_structure = _STRUCTURE_TAG.search(html) is not None
+    explicit_html = _HTML_TAG.search(html) is not None
+    outside: List[List[str]] = [[], []]
+    valueless: List[Tuple[int, List[str]]] = []
+    elements = 0
+    shape: List[Tuple[str, int]] = []
+    add = shape.append
+    texts: List[str] = []
+    counts = dict.fromkeys(STRUCTURE_TAGS, 0)
+    stack: List[str] = []
+    open_counts: Dict[str, int] = {}
+    # html.parser ends the current string at every tag, libxml2 only at the ones it keeps
+    text_open = split_text = False
+    leading = not explicit_html
+    for (text, comment, doctype, end, raw, raw_attrs, raw_text, rc, rc_attrs, rc_text,
+         name, attrs, close, bad) in _TOKEN.findall(html):
+        if text:
+            if split_text:
+                return None
+            text_open = True
+            has_text = bool(text.strip(ASCII_SPACES))
+            if strict_structure and (not stack or stack[-1] in ('html', 'head')):
+                # libxml2 moves text outside the body into it, and drops the whitespace around <html>
+                if has_text or (not stack and not explicit_html):
+                    return None
+                if not stack:
+                    outside[counts['html']].append(_collapse(text, False))
+                    text = ''
+            elif leading:
+                # ... and the whitespace a fragment starts with
+                if not has_text:
+                    outside[0].append(_collapse(text, False))
+                    text = ''
+                elif text[0] in ASCII_SPACES:
+                    return None
+            if text:
+                if not (name or raw or rc or end or comment or doctype or bad) and '&' in text:
+                    # html.parser flushes a reference cut off by the end of the input its own way
+                    return None
+                add(('#', len(stack)))
+                texts.append(unescape(text))
+                leading = False
+
+        if name or raw or rc:
+            if name:
+                name = name.lower()
+                # Raw text elements only get here unclosed or with odd end tags
+                if name in RAW_TEXT_TAGS or name in TEXT_ONLY_TAGS:
+                    return None
+            elif raw:
+                name, attrs = raw.lower(), raw_attrs
+                content = raw_text.lower()
+                if _RAW_END[name].search(content) or ('<!--' in content and '<script' in content):
+                    return None
+            else:
+                name, attrs = rc.lower(), rc_attrs
+                if name not in ('title', 'textarea') and '&' in rc_text:
+                    return None
+            if attrs:
+                seen = set()
+                for attr, equals in _ATTR_PARTS.findall(attrs):
+                    attr = attr.lower()
+                    if attr in seen:
+                        return None
+                    seen.add(attr)
+                    if not equals and attr in LIBXML_BOOLEAN_ATTRIBUTES:
+                        if not valueless or valueless[-1][0] != elements:
+                            valueless.append((elements, []))
+                        valueless[-1][1].append(attr)
+            if name in counts:
+                if counts[name]:
+                    return None
+                counts[name] = 1
+            if explicit_html and not stack and name != 'html':
+                return None
+            if stack and name in LIBXML_CLOSED_BY.get(stack[-1], ()):
+                return None
+            add((name, len(stack)))
+            elements += 1
+            leading = text_open = split_text = False
+            if not (close or raw or rc) and name not in VOID_ELEMENTS:
+                stack.append(name)
+                open_counts[name] = open_counts.get(name, 0) + 1
+        elif end:
+            end = end.lower()
+            if open_counts.get(end):
+                # html.parser closes everything up to the most recent open tag of that name
+                while True:
+                    popped = stack.pop()
+                    open_counts[popped] -= 1
+                    if popped == end:
+                        break
+                text_open = split_text = False
+            else:
+                split_text = split_text or text_open
+        elif comment:
+            comment = comment[3:-2]
+            if '--' in comment or comment.startswith(('>', '->')):
+                return None
+            if stack or not strict_structure:
+                add(('!', len(stack)))
+            else:
+                outside[counts['html']].append(Comment(comment))
+            text_open = split_text = False
+        elif doctype:
+            # libxml2 keeps only a leading doctype, and outside the tree
+            if stack or shape:
+                return None
+            outside[0].append(Doctype(doctype[len('!DOCTYPE '):]))
+            text_open = False
+        elif bad:
+            return None
+    return SourceShape(shape, counts, outside, valueless, texts)
+
+
+def _collapse(text: str, preserve: bool) -> str:
+    """Whitespace-only strings as html.parser stores them"""
+    if preserve or text.strip(ASCII_SPACES):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def _is_element(node) -> bool:
+    return isinstance(node.tag, str)
+
+
+class LxmlTag:
+    """BeautifulSoup-compatible read-only view of an lxml element"""
+
+    __slots__ = ('element', 'document')
+
+    def __init__(self, element, document: 'LxmlDocument'):
+        self.element = element
+        self.document = document
+
+    @property
+    def name(self) -> str:
+        return self.element.tag
+
+    # Attributes
+
+    def _list_attribute(self, key: str) -> bool:
+        return key in LIST_ATTRIBUTES['*'] or key in LIST_ATTRIBUTES.get(self.name, ())
+
+    @property
+    def attrs(self) -> Dict[str, Any]:
+        return {key: _NONWHITESPACE.findall(value) if self._list_attribute(key) else value
+                for key, value in self.element.items()}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            value = self.element.get(key)
+        except ValueError:
+            # lxml refuses to look up names html.parser accepts (``a!``, ``[x]``)
+            value = dict(self.element.items()).get(key)
+        if value is None:
+            return default
+        return _NONWHITESPACE.findall(value) if self._list_attribute(key) else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def has_attr(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    # Text
+
+    def _context(self) -> Tuple[Optional[str], bool]:
+        """String container and whitespace preservation inherited from the ancestors"""
+        container, preserve = None, False
+        for ancestor in self.element.iterancestors():
+            if container is None and ancestor.tag in STRING_CONTAINERS:
+                container = ancestor.tag
+            preserve = preserve or ancestor.tag in PRESERVE_WHITESPACE
+        return container, preserve
+
+    def _strings(self) -> List[str]:
+        """Strings ``get_text`` would join, in document order"""
+        container, preserve = self._context()
+        wanted = self.name if self.name in STRING_CONTAINERS else None
+        strings: List[str] = []
+        append = strings.append
+
+        def walk(element, container, preserve):
+            tag = element.tag
+            if tag in STRING_CONTAINERS:
+                container = tag
+            if tag in PRESERVE_WHITESPACE:
+                preserve = True
+            keep = container == wanted
+            text = element.text
+            if keep and text:
+                append(text if preserve or text.strip(ASCII_SPACES) else '\n' if '\n' in text else ' ')
+            for child in element:
+                if isinstance(child.tag, str):
+                    walk(child, container, preserve)
+                text = child.tail
+                if keep and text:
+                    append(text if preserve or text.strip(ASCII_SPACES) else '\n' if '\n' in text else ' ')
+
+        walk(self.element, container, preserve)
+        return strings
+
+    def get_text(self, separator: str = '', strip: bool = False) -> str:
+        strings = self._strings()
+        if strip:
+            strings = [s for s in (s.strip() for s in strings) if s]
+        return separator.join(strings)
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+    @property
+    def string(self) -> Optional[str]:
+        contents = list(self._contents(self.element))
+        if len(contents) != 1:
+            return None
+        child = contents[0]
+        if isinstance(child, str):
+            return _collapse(child, self.name in PRESERVE_WHITESPACE or self._context()[1])
+        if _is_element(child):
+            return self.document.wrap(child).string
+        return _collapse(child.text or '', self._context()[1])
+
+    def _contents(self, element) -> Iterator:
+        """Strings and child nodes of ``element`` as html.parser nests them (implied elements flattened)"""
+        if element.text:
+            yield element.text
+        for child in element:
+            if child.tag in self.document.implied:
+                yield from self._contents(child)
+            else:
+                yield child
+            if child.tail:
+                yield child.tail
+
+    # Search
+
+    def _descendants(self, recursive: bool) -> Iterator:
+        if recursive:
+            return self.element.iterdescendants()
+        return (child for child in self._contents(self.element) if not isinstance(child, str))
+
+    def find_all(self, name: Any = None, attrs: Any = None, recursive: bool = True,
+                 limit: Optional[int] = None, **kwargs) -> List['LxmlTag']:
+        rules = dict(attrs) if isinstance(attrs, dict) else ({'class': attrs} if attrs else {})
+        for key, rule in kwargs.items():
+            rules['class' if key == 'class_' else key] = rule
+        names = None if name is None or name is True else ({name} if isinstance(name, str) else set(name))
+        implied = self.document.implied
+        results = []
+        for element in self._descendants(recursive):
+            tag = element.tag
+            if not isinstance(tag, str) or tag in implied or (names is not None and tag not in names):
+                continue
+            node = self.document.wrap(element)
+            if rules and not all(_attribute_matches(node.get(key), rule) for key, rule in rules.items()):
+                continue
+            results.append(node)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    __call__ = find_all
+
+    def find(self, name: Any = None, attrs: Any = None, recursive: bool = True, **kwargs) -> Optional['LxmlTag']:
+        found = self.find_all(name, attrs, recursive, limit=1, **kwargs)
+        return found[0] if found else None
+
+    # Serialization
+
+    def decode(self) -> str:
+        out: List[str] = []
+        self._serialize(self.element, out, self.name in PRESERVE_WHITESPACE or self._context()[1])
+        return ''.join(out)
+
+    __str__ = decode
+
+    def __repr__(self) -> str:
+        return self.decode()
+
+    def _serialize(self, element, out: List[str], preserve: bool):
+        tag = element.tag
+        if not isinstance(tag, str):
+            out.append('<!--' + _collapse(element.text or '', preserve) + '-->')
+            return
+        implied = tag in self.document.implied
+        preserve = preserve or tag in PRESERVE_WHITESPACE
+        if not implied:
+            out.append('<' + tag)
+            node = self.document.wrap(element)
+            for key, value in sorted(node.attrs.items()):
+                out.append(' ' + key + '=' + _quoted(_meta_value(element, key, value)))
+            if tag in VOID_ELEMENTS and not element.text and not len(element):
+                out.append('/>')
+                return
+            out.append('>')
+        cdata = tag in CDATA_TAGS
+        if element.text:
+            out.append(_text(_collapse(element.text, preserve), cdata))
+        for child in element:
+            self._serialize(child, out, preserve)
+            if child.tail:
+                out.append(_text(_collapse(child.tail, preserve), cdata))
+        if not implied:
+            out.append('</' + tag + '>')
+
+
+def _attribute_matches(value: Any, rule: Any) -> bool:
+    if rule is True:
+        return value is not None
+    if rule is False:
+        return value is None
+    candidates = [value] if not isinstance(value, list) else value + ([' '.join(value)] if len(value) > 1 else [])
+    if callable(rule):
+        return any(rule(candidate) for candidate in candidates) if candidates else rule(None)
+    if value is None:
+        return rule is None
+    if isinstance(rule, (list, tuple, set)):
+        return any(candidate in rule for candidate in candidates)
+    if isinstance(rule, re.Pattern):
+        return any(rule.search(candidate) for candidate in candidates)
+    return any(candidate == rule for candidate in candidates)
+
+
+def _meta_value(element, key: str, value: Any) -> str:
+    """Attribute value as BeautifulSoup prints it (lists joined, meta charsets rewritten to utf-8)"""
+    if isinstance(value, list):
+        return ' '.join(value)
+    if element.tag == 'meta':
+        if key == 'charset':
+            return 'utf-8'
+        if key == 'content' and (element.get('http-equiv') or '').lower() == 'content-type' \
+                and element.get('charset') is None:
+            return _CHARSET.sub(lambda m: m.group(1) + 'utf-8', value)
+    return value
+
+
+def _quoted(value: str) -> str:
+    value = EntitySubstitution.substitute_xml(value)
+    if '"' not in value:
+        return '"' + value + '"'
+    if "'" not in value:
+        return "'" + value + "'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+
+def _text(text: str, cdata: bool) -> str:
+    return text if cdata else EntitySubstitution.substitute_xml(text)
+
+
+class LxmlDocument(LxmlTag):
+    """Document root: searches and text cover the whole tree, implied html/head/body are invisible"""
+
+    __slots__ = ('implied', 'outside', '_text_strings')
+
+    def __init__(self, root, implied: frozenset, outside: Optional[List[List[str]]] = None):
+        self.implied = implied
+        self.outside = outside or [[], []]
+        self._text_strings: Optional[List[str]] = None
+        super().__init__(root, self)
+
+    name = '[document]'
+
+    def wrap(self, element) -> LxmlTag:
+        return LxmlTag(element, self)
+
+    def _context(self) -> Tuple[Optional[str], bool]:
+        return None, False
+
+    def _strings(self) -> List[str]:
+        if self._text_strings is None:
+            before, after = ([s for s in strings if not isinstance(s, PreformattedString)] for strings in self.outside)
+            self._text_strings = before + self.wrap(self.element)._strings() + after
+        return self._text_strings
+
+    def _descendants(self, recursive: bool) -> Iterator:
+        if recursive:
+            return self.element.iter()
+        if self.element.tag not in self.implied:
+            return iter([self.element])
+        return (child for child in self._contents(self.element) if not isinstance(child, str))
+
+    @property
+    def string(self) -> Optional[str]:
+        before, after = self.outside
+        top = list(self._contents(self.element)) if self.element.tag in self.implied else [self.element]
+        contents = before + top + after
+        if len(contents) != 1:
+            return None
+        child = contents[0]
+        if isinstance(child, str):
+            return child
+        return self.wrap(child).string if _is_element(child) else _collapse(child.text or '', False)
+
+    def decode(self) -> str:
+        before, after = self.outside
+        out: List[str] = [s.output_ready() if isinstance(s, PreformattedString) else s for s in before]
+        self._serialize(self.element, out, False)
+        out.extend(s.output_ready() if isinstance(s, PreformattedString) else s for s in after)
+        return ''.join(out)
+
+    __str__ = decode
+
+    def shape(self) -> Tuple[List[Tuple[str, int]], List[str]]:
+        """Preorder (tag, depth) list of the visible elements, with ('#', depth) texts and ('!', depth) comments,
+        and the strings of the texts"""
+        shape: List[Tuple[str, int]] = []
+        add = shape.append
+        texts: List[str] = []
+
+        def walk(element, depth):
+            tag = element.tag
+            if tag not in self.implied:
+                add((tag, depth))
+                depth += 1
+            if element.text and tag not in RAW_TEXT_TAGS and tag not in TEXT_ONLY_TAGS:
+                add(('#', depth))
+                texts.append(element.text)
+            for child in element:
+                if isinstance(child.tag, str):
+                    walk(child, depth)
+                else:
+                    add(('!', depth))
+                if child.tail:
+                    add(('#', depth))
+                    texts.append(child.tail)
+
+        walk(self.element, 0)
+        return shape, texts
+
+
+_parsers = threading.local()
+
+
+def _parser():
+    parser = getattr(_parsers, 'parser', None)
+    if parser is None:
+        parser = _parsers.parser = etree.HTMLParser()
+    return parser
+
+
+def parse(html: str) -> Optional[LxmlDocument]:
+    """lxml tree of ``html`` with html.parser semantics, or None when it could differ from ``html.parser``"""
+    if not LXML_AVAILABLE or not isinstance(html, str) or not html.strip(ASCII_SPACES):
+        return None
+    expected = html_parser_shape(html)
+    if expected is None:
+        return None
+    try:
+        root = etree.fromstring(html, _parser())
+    except (etree.LxmlError, ValueError):
+        return None
+    if root is None or root.tag != 'html':
+        return None
+    implied = frozenset(tag for tag in STRUCTURE_TAGS if not expected.counts[tag])
+    document = LxmlDocument(root, implied, expected.outside)
+    if document.shape() != (expected.shape, expected.texts):
+        return None
+    if expected.valueless:
+        visible = [e for e in root.iter() if isinstance(e.tag, str) and e.tag not in implied]
+        for index, names in expected.valueless:
+            for name in names:
+                visible[index].set(name, '')
+    return document
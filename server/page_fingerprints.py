@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Page Fingerprints
+
+Per-URL record of the last processed version of a page (content fingerprint,
+sitemap lastmod and the extracted result) for incremental re-crawls. A page
+whose lastmod or fingerprint is unchanged is served from its record instead of
+being parsed and scored again, so a daily run only pays for what changed.
+
+Pages that are stored in ``scraped_items`` are only fingerprinted once their row
+has been written (``stage`` then ``commit``): a crash in between leaves the page
+unfingerprinted, so the next run processes and stores it again instead of
+skipping it as unchanged.
+"""
+
+import re
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS page_fingerprints (
+    company TEXT NOT NULL,
+    category TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    lastmod TEXT,
+    page TEXT,
+    links TEXT,
+    checked_at TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    PRIMARY KEY (company, category, url)
+);
+"""
+
+# Scripts, styles and comments carry nonces and build ids that change on every
+# request without the page content changing
+VOLATILE_MARKUP = re.compile(r'<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->', re.I | re.S)
+WHITESPACE = re.compile(r'\s+')
+
+
+def content_fingerprint(html: str) -> str:
+    """SHA-256 of a page with volatile markup and whitespace normalised away"""
+    stable = WHITESPACE.sub(' ', VOLATILE_MARKUP.sub('', html or '')).strip()
+    return hashlib.sha256(stable.encode('utf-8', errors='replace')).hexdigest()
+
+
+class PageFingerprints:
+    """Fingerprint store kept next to ``scraped_items`` in the scrape database"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.commit()
+        self.stats = {'unchanged': 0, 'changed': 0, 'new': 0}
+        self._pending: Dict[Tuple[str, str, str], Tuple[Any, ...]] = {}
+
+    def lookup(self, company: str, category: str, url: str) -> Optional[Dict[str, Any]]:
+        """Last recorded version of a page, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, lastmod, page, links FROM page_fingerprints WHERE company = ? AND category = ? AND url = ?",
+                (company, category, url),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'fingerprint': row[0],
+            'lastmod': row[1],
+            'page': json.loads(row[2]) if row[2] else None,
+            'links': json.loads(row[3]) if row[3] else None,
+        }
+
+    def touch(self, company: str, category: str, url: str, lastmod: Optional[str] = None):
+        """Record that a page was seen unchanged"""
+        self.stats['unchanged'] += 1
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE page_fingerprints SET checked_at = ?, lastmod = COALESCE(?, lastmod)
+                WHERE company = ? AND category = ? AND url = ?
+                """,
+                (datetime.now().isoformat(), lastmod, company, category, url),
+            )
+            self._conn.commit()
+
+    def record(self, company: str, category: str, url: str, fingerprint: str,
+               page: Optional[Dict[str, Any]], links: List[Dict[str, Any]],
+               lastmod: Optional[str] = None, is_new: bool = False):
+        """Store the processed result of a new or changed page"""
+        self.stats['new' if is_new else 'changed'] += 1
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO page_fingerprints
+                    (company, category, url, fingerprint, lastmod, page, links, checked_at, changed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    company, category, url, fingerprint, lastmod,
+                    json.dumps(page) if page is not None else None,
+                    json.dumps(links),
+                    now, now,
+                ),
+            )
+            self._conn.commit()
+
+    def stage(self, company: str, category: str, url: str, fingerprint: str,
+              page: Optional[Dict[str, Any]], links: List[Dict[str, Any]],
+              lastmod: Optional[str] = None, is_new: bool = False):
+        """Hold a page's record until its database row is written (see ``commit``)"""
+        with self._lock:
+            self._pending[(company, category, url)] = (fingerprint, page, links, lastmod, is_new)
+
+    def commit(self, company: str, category: str, url: str):
+        """Record a staged page now that its database row is stored"""
+        with self._lock:
+            pending = self._pending.pop((company, category, url), None)
+        if pending is not None:
+            self.record(company, category, url, *pending)
+
+    def discard(self, company: str, category: str):
+        """Forget staged pages that were never stored (dropped by the cap or a fallback crawl)"""
+        with self._lock:
+            for key in [k for k in self._pending if k[:2] == (company, category)]:
+                del self._pending[key]
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Parsed Document
+
+One parse of a fetched page, shared by every extractor and scorer that looks
+at it. The HTML is parsed once; the plain text, its lowercased form and the
+link, code-block, table and script lists are derived from that tree on first
+use and then reused, instead of each step re-parsing the HTML or
+re-lowercasing the same text.
+
+Documents can also wrap plain text (``ParsedDocument.from_text``) so scorers
+accept either form.
+
+``HTML_PARSER_BACKEND`` picks the parser: ``html.parser`` (default) or ``lxml``,
+which parses with libxml2 and serves the same tree API through ``lxml_soup``.
+Pages the two parsers could read differently are still parsed with
+``html.parser``, so extraction results do not depend on the setting;
+``ParsedDocument.backend`` tells which parser built a document and
+``BACKEND_STATS`` counts, per process, how many lxml-backend pages were built
+by lxml and how many fell back.
+"""
+
+import os
+import logging
+from functools import cached_property
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+import lxml_soup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HTML_PARSER_BACKENDS = ('html.parser', 'lxml')
+HTML_PARSER_BACKEND = os.getenv('HTML_PARSER_BACKEND', 'html.parser')
+
+if HTML_PARSER_BACKEND not in HTML_PARSER_BACKENDS:
+    logger.warning(f"Unknown HTML_PARSER_BACKEND {HTML_PARSER_BACKEND!r}, using html.parser")
+elif HTML_PARSER_BACKEND == 'lxml' and not lxml_soup.LXML_AVAILABLE:
+    logger.warning("HTML_PARSER_BACKEND is lxml but lxml is not installed, using html.parser")
+
+# lxml-backend parses: pages built by lxml vs. pages that fell back to html.parser
+BACKEND_STATS = {'lxml': 0, 'fallback': 0}
+
+
+class ParsedDocument:
+    """Parse tree of a page plus the text views derived from it, each computed once"""
+
+    def __init__(self, html: str = '', url: str = '', text: Optional[str] = None, backend: Optional[str] = None):
+        self.html = html or ''
+        self.url = url
+        self.backend: Optional[str] = None
+        # Text-only documents have no tree
+        self.soup = self._parse(backend or HTML_PARSER_BACKEND) if text is None else None
+        if text is not None:
+            self.__dict__['text'] = text
+
+    def _parse(self, backend: str):
+        if backend == 'lxml':
+            tree = lxml_soup.parse(self.html)
+            if tree is not None:
+                BACKEND_STATS['lxml'] += 1
+                self.backend = 'lxml'
+                return tree
+            BACKEND_STATS['fallback'] += 1
+            logger.debug(f"lxml backend fell back to html.parser for {self.url or 'a page'}")
+        self.backend = 'html.parser'
+        return BeautifulSoup(self.html, 'html.parser')
+
+    @classmethod
+    def from_text(cls, text: str, url: str = '') -> 'ParsedDocument':
+        """Document over plain text (no HTML to parse)"""
+        return cls(url=url, text=text or '')
+
+    @cached_property
+    def text(self) -> str:
+        """All text, stripped and concatenated (as ``get_text(strip=True)``)"""
+        return self.soup.get_text(strip=True)
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def spaced_text(self) -> str:
+        """All text with whitespace between elements, for word-level views"""
+        if self.soup is None:
+            return self.text
+        return self.soup.get_text(' ', strip=True)
+
+    @cached_property
+    def main_text(self) -> str:
+        """Text of the main content area (``main``, ``article`` or ``body``), space separated"""
+        if self.soup is None:
+            return self.text
+        main = self.soup.find('main') or self.soup.find('article') or self.soup.find('body')
+        return main.get_text(' ', strip=True) if main else self.spaced_text
+
+    @cached_property
+    def title(self) -> Optional[str]:
+        title = self.soup.find('title') if self.soup is not None else None
+        return title.get_text() if title else None
+
+    @cached_property
+    def links(self) -> List:
+        """``<a>`` tags that have an ``href`` attribute"""
+        return self._find_all('a', href=True)
+
+    @cached_property
+    def code_blocks(self) -> List:
+        return self._find_all(['code', 'pre'])
+
+    @cached_property
+    def tables(self) -> List:
+        return self._find_all('table')
+
+    @cached_property
+    def images(self) -> List:
+        return self._find_all('img')
+
+    @cached_property
+    def scripts(self) -> List:
+        return self._find_all('script')
+
+    def _find_all(self, *args, **kwargs) -> List:
+        return self.soup.find_all(*args, **kwargs) if self.soup is not None else []
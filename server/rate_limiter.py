@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Per-Host Rate Limiter
+
+A token bucket per host, shared by every fetch path, so that a slow or strict
+host only throttles requests to itself. Buckets honour robots.txt
+``Crawl-delay`` (via the shared robots cache) and are safe to use from
+threads and from asyncio code.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from robots_cache import RobotsCache, get_robots_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = float(os.getenv('SCRAPE_HOST_RATE', '1.0'))      # requests per second per host
+DEFAULT_BURST = float(os.getenv('SCRAPE_HOST_BURST', '1'))      # bucket capacity
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket.
+
+    ``reserve()`` takes a token immediately (the balance may go negative) and returns
+    how long the caller must wait before using it. The lock is only held for the
+    bookkeeping, never while sleeping, so the same bucket serves threads and
+    coroutines alike.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the delay in seconds before it may be used"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1.0
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_rate(self, rate: float):
+        """Change the refill rate, keeping the current balance"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = max(rate, 1e-6)
+
+
+class HostRateLimiter:
+    """Registry of token buckets keyed by host"""
+
+    def __init__(self, default_rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST,
+                 respect_robots: bool = True, robots: Optional[RobotsCache] = None):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.robots = robots
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._caller_buckets: Dict[Tuple[str, float], TokenBucket] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Bucket key for a URL: scheme://host[:port]"""
+        try:
+            parsed = urlparse(url)
+            return f"{parsed.scheme or 'https'}://{(parsed.netloc or '').lower()}"
+        except Exception:
+            return ''
+
+    def acquire(self, url: str, rate: Optional[float] = None) -> float:
+        """
+        Block until a request to ``url``'s host is allowed; returns seconds waited.
+
+        ``rate`` is a stricter budget for this caller only: the call first waits on a
+        bucket shared by callers asking for the same host and rate, and only then takes
+        the host's token, so the host's rate holds for the moment the request goes out
+        and is left untouched for everyone else.
+        """
+        waited = 0.0
+        for bucket in self._in_order(self._buckets_for(url, rate)):
+            delay = bucket.reserve()
+            if delay > 0:
+                time.sleep(delay)
+                waited += delay
+        return waited
+
+    async def acquire_async(self, url: str, rate: Optional[float] = None) -> float:
+        """Asyncio counterpart of ``acquire``"""
+        buckets = self._buckets_for(url, rate, create=False)
+        if buckets is None:
+            # Creating a bucket may take a lock and fetch robots.txt: keep that off the loop
+            buckets = await asyncio.to_thread(self._buckets_for, url, rate)
+        waited = 0.0
+        for bucket in self._in_order(buckets):
+            delay = bucket.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                waited += delay
+        return waited
+
+    @staticmethod
+    def _in_order(buckets):
+        """Caller bucket before the host bucket"""
+        return reversed(buckets)
+
+    def set_rate(self, url: str, rate: float):
+        """Override the rate for the host of ``url``"""
+        self._bucket(url).set_rate(rate)
+
+    def rate_for(self, url: str) -> float:
+        """Current requests-per-second budget for the host of ``url``"""
+        return self._bucket(url).rate
+
+    def _buckets_for(self, url: str, rate: Optional[float] = None, create: bool = True):
+        """Host bucket plus, for a stricter caller rate, that caller's bucket (None if not created yet and ``create`` is False)"""
+        key = self.host_key(url)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if not create:
+                return None
+            bucket = self._bucket(url)
+        if rate is None or rate >= bucket.rate:
+            return (bucket,)
+        caller_key = (key, rate)
+        caller = self._caller_buckets.get(caller_key)
+        if caller is None:
+            if not create:
+                return None
+            with self._lock:
+                caller = self._caller_buckets.setdefault(caller_key, TokenBucket(rate, self.burst))
+        return bucket, caller
+
+    def _bucket(self, url: str) -> TokenBucket:
+        key = self.host_key(url)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                host_lock = self._host_locks.setdefault(key, threading.Lock())
+            # Only one caller per host resolves robots.txt and creates the bucket
+            with host_lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(self._initial_rate(key), self.burst)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def _initial_rate(self, key: str) -> float:
+        rate = self.default_rate
+        if self.respect_robots and key:
+            crawl_delay = self._robots_crawl_delay(key)
+            if crawl_delay:
+                rate = min(rate, 1.0 / crawl_delay)
+                logger.info(f"Honouring robots.txt crawl-delay of {crawl_delay}s for {key}")
+        return rate
+
+    def _robots_crawl_delay(self, key: str) -> Optional[float]:
+        try:
+            return (self.robots or get_robots_cache()).crawl_delay(key)
+        except Exception:
+            return None
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter shared by every scraper module"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_lock:
+            if _shared_limiter is None:
+                _shared_limiter = HostRateLimiter()
+    return _shared_limiter
+
+
+def acquire(url: str, rate: Optional[float] = None) -> float:
+    """Convenience wrapper around the shared limiter"""
+    return get_rate_limiter().acquire(url, rate)
+
+
+async def acquire_async(url: str, rate: Optional[float] = None) -> float:
+    """Convenience wrapper around the shared limiter for coroutines"""
+    return await get_rate_limiter().acquire_async(url, rate)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Raw HTML Archive
+
+Keeps every fetched body exactly once, keyed by its SHA-256 and compressed
+(zstd when the ``zstandard`` package is installed, gzip otherwise), plus a
+SQLite manifest of url -> hash -> fetch time. The replay mode re-runs
+extraction and scoring over the archive without touching the network, so a
+change to keyword scoring can be applied to months of crawls in minutes.
+
+Usage:
+    python raw_html_archive.py replay [--company NAME] [--since ISO_DATE] [--out results.json]
+"""
+
+import os
+import sys
+import gzip
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = Path(os.getenv('RAW_ARCHIVE_DIR', str(Path(__file__).parent / 'raw_html_archive')))
+ARCHIVE_ENABLED = os.getenv('RAW_ARCHIVE_ENABLED', '1') not in ('0', 'false', 'False')
+
+SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS archive_manifest (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    company TEXT,
+    category TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archive_manifest_url ON archive_manifest(url);
+CREATE INDEX IF NOT EXISTS idx_archive_manifest_fetched ON archive_manifest(fetched_at);
+"""
+
+
+class RawHTMLArchive:
+    """Content-addressed store of raw response bodies with a fetch manifest"""
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / 'manifest.db'), check_same_thread=False)
+        self._conn.executescript(SCHEMA_SQL)
+        self._conn.commit()
+
+    def put(self, url: str, body: Union[str, bytes], company: str = '', category: str = '',
+            fetched_at: Optional[str] = None) -> str:
+        """Archive a fetched body and record it in the manifest; returns its SHA-256"""
+        data = body.encode('utf-8') if isinstance(body, str) else bytes(body)
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self._object_path(digest) is None:
+            self._write_object(digest, data)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO archive_manifest (url, sha256, company, category, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, digest, company or '', category or '', fetched_at or datetime.now().isoformat()),
+            )
+            self._conn.commit()
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Return the raw bytes stored under ``digest``"""
+        path = self._object_path(digest)
+        if path is None:
+            raise KeyError(f"Archive object not found: {digest}")
+        raw = path.read_bytes()
+        if path.suffix == '.zst':
+            return zstandard.ZstdDecompressor().decompress(raw)
+        return gzip.decompress(raw)
+
+    def get_text(self, digest: str) -> str:
+        """Return the body under ``digest`` decoded as UTF-8"""
+        return self.get(digest).decode('utf-8', errors='replace')
+
+    def iter_manifest(self, company: Optional[str] = None, since: Optional[str] = None,
+                      latest_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield manifest rows oldest first, optionally filtered by company and fetch time"""
+        clauses, params = [], []
+        if company:
+            clauses.append("company = ?")
+            params.append(company)
+        if since:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        if latest_only:
+            query = f"""
+                SELECT url, sha256, company, category, MAX(fetched_at) FROM archive_manifest
+                {where} GROUP BY url, company, category ORDER BY MAX(fetched_at)
+            """
+        else:
+            query = f"SELECT url, sha256, company, category, fetched_at FROM archive_manifest {where} ORDER BY id"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for url, digest, comp, category, fetched_at in rows:
+            yield {'url': url, 'sha256': digest, 'company': comp, 'category': category, 'fetched_at': fetched_at}
+
+    def _object_path(self, digest: str) -> Optional[Path]:
+        base = self.objects_dir / digest[:2] / digest
+        for suffix in ('.zst', '.gz'):
+            path = base.with_suffix(suffix)
+            if path.exists():
+                return path
+        return None
+
+    def _write_object(self, digest: str, data: bytes):
+        directory = self.objects_dir / digest[:2]
+        directory.mkdir(parents=True, exist_ok=True)
+        if ZSTD_AVAILABLE:
+            path, payload = directory / f"{digest}.zst", zstandard.ZstdCompressor(level=10).compress(data)
+        else:
+            path, payload = directory / f"{digest}.gz", gzip.compress(data, compresslevel=6)
+        # Write then rename so readers never see a partial object
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+
+
+_shared_archive: Optional[RawHTMLArchive] = None
+_shared_lock = threading.Lock()
+
+
+def get_raw_archive() -> Optional[RawHTMLArchive]:
+    """Process-wide archive, or None when archiving is disabled or unavailable"""
+    global _shared_archive
+    if not ARCHIVE_ENABLED:
+        return None
+    if _shared_archive is None:
+        with _shared_lock:
+            if _shared_archive is None:
+                try:
+                    _shared_archive = RawHTMLArchive()
+                except OSError as e:
+                    logger.warning(f"Raw HTML archive unavailable: {e}")
+                    return None
+    return _shared_archive
+
+
+def archive_body(url: str, body: Union[str, bytes], company: str = '', category: str = '') -> Optional[str]:
+    """Best-effort archiving helper for fetch paths; never raises"""
+    archive = get_raw_archive()
+    if archive is None or not body:
+        return None
+    try:
+        return archive.put(url, body, company, category)
+    except Exception as e:
+        logger.warning(f"Could not archive {url}: {e}")
+        return None
+
+
+def replay_archive(archive: RawHTMLArchive, scraper: Any = None, company: Optional[str] = None,
+                   since: Optional[str] = None, latest_only: bool = True,
+                   extra_scorers: Optional[Dict[str, Callable[[str, Dict[str, Any]], Any]]] = None
+                   ) -> Iterator[Dict[str, Any]]:
+    """
+    Re-run extraction and scoring over archived bodies without the network.
+
+    For each manifest entry this calls ``_extract_technical_content``,
+    ``_calculate_content_quality`` and ``_assess_technical_relevance`` on a
+    ``CompetitiveIntelligenceScraper`` plus any ``extra_scorers``. Identical bodies
+    are only extracted once per (company, category).
+    """
+    if scraper is None:
+        from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
+        scraper = CompetitiveIntelligenceScraper()
+
+    memo: Dict[tuple, Dict[str, Any]] = {}
+    for entry in archive.iter_manifest(company=company, since=since, latest_only=latest_only):
+        key = (entry['sha256'], entry['company'], entry['category'])
+        if key not in memo:
+            html = archive.get_text(entry['sha256'])
+            structured = scraper._extract_technical_content(html, entry['company'])
+            scores = {
+                'quality_score': scraper._calculate_content_quality(structured),
+                'technical_relevance': scraper._assess_technical_relevance(entry['category'], html),
+            }
+            for name, scorer in (extra_scorers or {}).items():
+                scores[name] = scorer(html, entry)
+            memo[key] = {'content': structured, **scores}
+        yield {**entry, **memo[key], 'replayed_at': datetime.now().isoformat()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw HTML archive tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+    replay = sub.add_parser('replay', help='Re-extract and re-score archived pages offline')
+    replay.add_argument('--company', help='Only replay pages for this company')
+    replay.add_argument('--since', help='Only replay fetches at or after this ISO timestamp')
+    replay.add_argument('--all-fetches', action='store_true', help='Replay every fetch, not just the latest per URL')
+    replay.add_argument('--out', help='Write results as JSON to this path')
+    args = parser.parse_args()
+
+    archive = RawHTMLArchive()
+    results = []
+    for result in replay_archive(archive, company=args.company, since=args.since, latest_only=not args.all_fetches):
+        results.append(result)
+        print(f"{result['company'] or '-'} | {result['category'] or '-'} | "
+              f"quality={result['quality_score']} relevance={result['technical_relevance']} | {result['url']}")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Replay results written to {args.out}")
+    print(f"✅ Replayed {len(results)} archived pages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,27 @@
 # real_data_scraper.py
+import os
 import json
-import requests
+import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 from competitor_targeting import COMPETITORS
+from http_cache import get_http_cache
+from http_client import create_session
+from robots_cache import ensure_allowed as ensure_robots_allowed
+from resilience import resilient_get
+from raw_html_archive import archive_body
+from refreshing_cache import RefreshingCache, CacheEntry
+
+# Served from a cache so API reads never wait for a live scrape of every competitor
+REAL_DATA_CACHE_TTL = float(os.getenv('REAL_DATA_CACHE_TTL', '3600'))
+# How long past the TTL a stale result may still be served while it is refreshed
+REAL_DATA_CACHE_MAX_STALE = float(os.getenv('REAL_DATA_CACHE_MAX_STALE', '86400'))
+# Fraction of the TTL after which the background refresher reloads an entry
+REAL_DATA_REFRESH_AHEAD = float(os.getenv('REAL_DATA_REFRESH_AHEAD', '0.8'))
+# Load the all-competitors result in the background as soon as the cache is created
+REAL_DATA_CACHE_WARM = os.getenv('REAL_DATA_CACHE_WARM', '1') == '1'
+
+ALL_COMPETITORS = '*'
 
 class RealDataCompetitiveScraper:
     """
@@ -12,10 +30,10 @@ class RealDataCompetitiveScraper:
     
     def __init__(self):
         self.competitors = COMPETITORS
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.http_cache = get_http_cache()
     
     def scrape_all_competitors(self) -> Dict[str, Any]:
         """Scrape real data from all competitors in competitor_targeting.py"""
@@ -77,8 +95,11 @@ class RealDataCompetitiveScraper:
     def _scrape_url(self, url: str) -> str:
         """Scrape content from a URL"""
         try:
-            response = self.session.get(url, timeout=30)
+            ensure_robots_allowed(url)
+            response = self.http_cache.get(self.session, url, category='docs', timeout=30, send=resilient_get)
             response.raise_for_status()
+            if not response.from_cache:
+                archive_body(url, response.text, category='docs')
             
             # Basic content extraction (can be enhanced with BeautifulSoup)
             content = response.text
@@ -145,6 +166,48 @@ class RealDataCompetitiveScraper:
         
         return analysis
 
+_real_data_cache: RefreshingCache = None
+_real_data_cache_lock = threading.Lock()
+
+
+def _load_real_data(key: str) -> Dict[str, Any]:
+    scraper = RealDataCompetitiveScraper()
+    if key == ALL_COMPETITORS:
+        return scraper.scrape_all_competitors()
+    return scraper.scrape_competitor(key)
+
+
+def get_real_data_cache() -> RefreshingCache:
+    """Shared cache of real competitor data, keyed by company name or ``ALL_COMPETITORS``"""
+    global _real_data_cache
+    if _real_data_cache is None:
+        with _real_data_cache_lock:
+            if _real_data_cache is None:
+                cache = RefreshingCache(_load_real_data, REAL_DATA_CACHE_TTL, REAL_DATA_CACHE_MAX_STALE,
+                                        REAL_DATA_REFRESH_AHEAD, name='real-data')
+                _real_data_cache = cache
+                cache.start()
+                if REAL_DATA_CACHE_WARM:
+                    cache.refresh(ALL_COMPETITORS)
+    return _real_data_cache
+
+
+def get_cached_competitor(company_name: str) -> Tuple[Dict[str, Any], CacheEntry]:
+    """Cached data for one competitor, taken from the all-competitors entry when it has it
+
+    Raises ValueError for names outside ``COMPETITORS``, which never get a cache entry
+    (the refresher would otherwise keep re-scraping whatever names callers send).
+    """
+    if not any(c['name'] == company_name for c in COMPETITORS):
+        raise ValueError(f"Competitor {company_name} not found")
+    cache = get_real_data_cache()
+    entry = cache.get(ALL_COMPETITORS, load=False)
+    if entry is not None and entry.value.get(company_name, {}).get('status') == 'success':
+        return entry.value[company_name], entry
+    entry = cache.get(company_name)
+    return entry.value, entry
+
+
 # Test the scraper
 if __name__ == "__main__":
     scraper = RealDataCompetitiveScraper()
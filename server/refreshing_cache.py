@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Refreshing Result Cache
+
+An in-process cache for expensive results (such as a live scrape of every
+competitor) with stale-while-revalidate semantics:
+
+- a fresh entry (younger than ``ttl``) is returned as is;
+- a stale entry (older than ``ttl`` but younger than ``ttl + max_stale``) is
+  still returned immediately while a background reload is started;
+- a missing or expired entry is loaded synchronously.
+
+Concurrent loads of one key are collapsed into a single call of the loader,
+and an optional refresher thread reloads entries before they expire so that
+reads normally never wait for the loader.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ('value', 'loaded_at', 'cached_at', 'read_at')
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.loaded_at = self.read_at = time.monotonic()
+        self.cached_at = datetime.now().isoformat()
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
+
+
+class RefreshingCache:
+    """TTL cache with stale-while-revalidate reads and background refresh-ahead"""
+
+    def __init__(self, loader: Callable[[Hashable], Any], ttl: float, max_stale: float = 0.0,
+                 refresh_ahead: float = 0.8, refresh_interval: Optional[float] = None,
+                 workers: int = 2, name: str = 'cache'):
+        self.loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        # Entries older than this fraction of the TTL are reloaded by the refresher
+        self.refresh_ahead = refresh_ahead
+        self.refresh_interval = refresh_interval or max(1.0, ttl * (1 - refresh_ahead) / 2)
+        self.name = name
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{name}-refresh')
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'loads': 0, 'errors': 0}
+
+    def get(self, key: Hashable, timeout: Optional[float] = None, load: bool = True) -> Optional[CacheEntry]:
+        """Cached entry for ``key``, loading it first only when there is nothing usable
+        (or returning ``None`` then, without ``load``)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.read_at = time.monotonic()
+                age = entry.age()
+                if age < self.ttl:
+                    self.stats['hits'] += 1
+                    return entry
+                if age < self.ttl + self.max_stale:
+                    self.stats['stale_hits'] += 1
+                    self._reload_locked(key)
+                    return entry
+            if not load:
+                return None
+            self.stats['misses'] += 1
+            future = self._reload_locked(key)
+        return future.result(timeout)
+
+    def refresh(self, key: Hashable) -> Future:
+        """Reload ``key`` in the background (joining a reload already running)"""
+        with self._lock:
+            return self._reload_locked(key)
+
+    def is_stale(self, entry: CacheEntry) -> bool:
+        return entry.age() >= self.ttl
+
+    def start(self):
+        """Start the background refresher thread (idempotent)"""
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name=f'{self.name}-refresher', daemon=True)
+            self._refresher.start()
+
+    def close(self):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    def _reload_locked(self, key: Hashable) -> Future:
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._executor.submit(self._load, key)
+            self._inflight[key] = future
+        return future
+
+    def _load(self, key: Hashable) -> CacheEntry:
+        started = time.monotonic()
+        try:
+            entry = CacheEntry(self.loader(key))
+        except Exception as e:
+            # Keep serving the previous entry; the next stale read or refresh tries again
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.stats['errors'] += 1
+            logger.warning(f"[{self.name}] reload of {key!r} failed: {e}")
+            raise
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                entry.read_at = previous.read_at
+            self._entries[key] = entry
+            self._inflight.pop(key, None)
+            self.stats['loads'] += 1
+        logger.info(f"[{self.name}] reloaded {key!r} in {time.monotonic() - started:.1f}s")
+        return entry
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            now = time.monotonic()
+            with self._lock:
+                for key, entry in list(self._entries.items()):
+                    if now - entry.read_at >= self.ttl + self.max_stale:
+                        # Nobody has asked for it in a while; stop keeping it warm
+                        del self._entries[key]
+                    elif entry.age() >= self.ttl * self.refresh_ahead:
+                        self._reload_locked(key)
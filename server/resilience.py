@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Per-Host Resilience
+
+One failure policy for every fetch path, tracked per host (the same
+scheme://host keys as the rate limiter):
+
+- transient failures (connection errors, timeouts, 429 and 5xx responses) are
+  retried with exponential backoff and full jitter;
+- ``Retry-After`` on 429/503 is honoured for the whole host, not just the
+  request that received it;
+- timeouts adapt to the host's observed latency (a high percentile of recent
+  successful requests, times a safety factor, never above the caller's budget);
+  a retry after a timeout gets the full budget again;
+- after repeated failures a circuit breaker opens and requests to the host fail
+  fast with ``CircuitOpen`` for a cool-down period, after which a single trial
+  request decides whether it closes again.
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Deque, Dict, Optional
+
+import requests
+
+from rate_limiter import HostRateLimiter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRY_ATTEMPTS = int(os.getenv('FETCH_RETRY_ATTEMPTS', '3'))            # total tries per request
+RETRY_BASE_DELAY = float(os.getenv('FETCH_RETRY_BASE_DELAY', '0.5'))     # seconds; doubles per retry
+RETRY_MAX_DELAY = float(os.getenv('FETCH_RETRY_MAX_DELAY', '30'))
+RETRY_AFTER_MAX = float(os.getenv('FETCH_RETRY_AFTER_MAX', '120'))       # longer Retry-After: give up instead
+
+TIMEOUT_MIN = float(os.getenv('FETCH_TIMEOUT_MIN', '3'))
+TIMEOUT_PERCENTILE = float(os.getenv('FETCH_TIMEOUT_PERCENTILE', '0.95'))
+TIMEOUT_FACTOR = float(os.getenv('FETCH_TIMEOUT_FACTOR', '3'))
+LATENCY_WINDOW = int(os.getenv('FETCH_LATENCY_WINDOW', '50'))            # recent samples kept per host
+LATENCY_MIN_SAMPLES = 5
+
+BREAKER_FAILURES = int(os.getenv('FETCH_BREAKER_FAILURES', '5'))         # consecutive failures to open
+BREAKER_COOLDOWN = float(os.getenv('FETCH_BREAKER_COOLDOWN', '60'))      # seconds a host is skipped
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpen(Exception):
+    """Host skipped because its circuit breaker is open"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a ``Retry-After`` header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt`` (1-based)"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class HostHealth:
+    """Latency samples and breaker state of one host"""
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.not_before = 0.0        # from Retry-After
+        self.trial_running = False
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        if len(self.latencies) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Resilience:
+    """Registry of per-host health shared by every fetch path"""
+
+    def __init__(self, attempts: int = RETRY_ATTEMPTS, breaker_failures: int = BREAKER_FAILURES,
+                 breaker_cooldown: float = BREAKER_COOLDOWN, timeout_min: float = TIMEOUT_MIN,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.attempts = max(1, attempts)
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.timeout_min = timeout_min
+        self._sleep = sleep
+        self._hosts: Dict[str, HostHealth] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'retries': 0, 'short_circuited': 0, 'breaker_opened': 0}
+
+    def call(self, url: str, send: Callable[..., requests.Response], timeout: float = 30,
+             before_attempt: Optional[Callable[[], Any]] = None, attempts: Optional[int] = None) -> requests.Response:
+        """
+        Run ``send(timeout=...)`` for ``url`` under the host's retry, timeout and
+        breaker policy. Returns the last response (which may still be a 429/5xx
+        once the attempts are used up); raises ``CircuitOpen`` or the last
+        transient error. Other exceptions are passed through untouched.
+        """
+        key = HostRateLimiter.host_key(url)
+        attempts = attempts or self.attempts
+        full_timeout = False
+        for attempt in range(1, attempts + 1):
+            self._admit(key, url)
+            self._wait_retry_after(key)
+            if before_attempt is not None:
+                before_attempt()
+
+            request_timeout = timeout if full_timeout else self.timeout_for(url, timeout)
+            started = time.monotonic()
+            with self._lock:
+                self.stats['requests'] += 1
+            try:
+                response = send(timeout=request_timeout)
+            except TRANSIENT_ERRORS as e:
+                self._record_failure(key)
+                # A timeout under an adapted budget may just be a slow response; retry with the full one
+                full_timeout = isinstance(e, requests.Timeout)
+                if attempt == attempts:
+                    logger.info(f"Giving up on {url} after {attempts} attempts: {type(e).__name__}: {e}")
+                    raise
+                delay = backoff_delay(attempt)
+                logger.debug(f"{type(e).__name__} for {url}; retry {attempt}/{attempts - 1} in {delay:.1f}s")
+            except Exception:
+                self._release_trial(key)
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self._record_success(key, time.monotonic() - started)
+                    return response
+
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status_code == 429:
+                    # Throttled, not down: slow the host without counting towards the breaker
+                    self._release_trial(key)
+                else:
+                    self._record_failure(key)
+                if retry_after is not None:
+                    self._set_retry_after(key, retry_after)
+                if attempt == attempts or (retry_after or 0) > RETRY_AFTER_MAX:
+                    logger.info(f"Giving up on {url} after {attempt} attempts: HTTP {response.status_code}")
+                    return response
+                response.close()
+                delay = 0.0 if retry_after is not None else backoff_delay(attempt)
+                logger.debug(f"HTTP {response.status_code} for {url}; retry {attempt}/{attempts - 1}")
+
+            with self._lock:
+                self.stats['retries'] += 1
+            if delay > 0:
+                self._sleep(delay)
+
+    def timeout_for(self, url: str, default: float) -> float:
+        """Timeout for the next request to ``url``'s host, adapted to its recent latency"""
+        health = self._hosts.get(HostRateLimiter.host_key(url))
+        if health is None:
+            return default
+        with self._lock:
+            percentile = health.latency_percentile(TIMEOUT_PERCENTILE)
+        if percentile is None:
+            return default
+        return min(default, max(self.timeout_min, percentile * TIMEOUT_FACTOR))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host state for status endpoints and logs"""
+        with self._lock:
+            return {
+                key: {
+                    'state': health.state,
+                    'consecutive_failures': health.failures,
+                    'samples': len(health.latencies),
+                    'p95_latency': health.latency_percentile(0.95),
+                }
+                for key, health in self._hosts.items()
+            }
+
+    def _health(self, key: str) -> HostHealth:
+        health = self._hosts.get(key)
+        if health is None:
+            with self._lock:
+                health = self._hosts.setdefault(key, HostHealth())
+        return health
+
+    def _admit(self, key: str, url: str):
+        health = self._health(key)
+        with self._lock:
+            if health.state == CLOSED:
+                return
+            if health.state == OPEN and time.monotonic() - health.opened_at >= self.breaker_cooldown:
+                health.state = HALF_OPEN
+            if health.state == HALF_OPEN and not health.trial_running:
+                # One trial request decides whether the breaker closes
+                health.trial_running = True
+                return
+            self.stats['short_circuited'] += 1
+        raise CircuitOpen(f"Circuit open for {key}; skipping {url}")
+
+    def _wait_retry_after(self, key: str):
+        wait = self._health(key).not_before - time.monotonic()
+        if wait > 0:
+            self._sleep(wait)
+
+    def _set_retry_after(self, key: str, seconds: float):
+        health = self._health(key)
+        with self._lock:
+            health.not_before = max(health.not_before, time.monotonic() + min(seconds, RETRY_AFTER_MAX))
+
+    def _record_success(self, key: str, latency: float):
+        health = self._health(key)
+        with self._lock:
+            health.latencies.append(latency)
+            health.failures = 0
+            if health.state != CLOSED:
+                logger.info(f"Circuit closed for {key}")
+            health.state = CLOSED
+            health.trial_running = False
+
+    def _record_failure(self, key: str):
+        health = self._health(key)
+        with self._lock:
+            health.failures += 1
+            health.trial_running = False
+            if health.state == HALF_OPEN or (health.state == CLOSED and health.failures >= self.breaker_failures):
+                health.state = OPEN
+                health.opened_at = time.monotonic()
+                self.stats['breaker_opened'] += 1
+                logger.warning(f"Circuit opened for {key} after {health.failures} failures; "
+                               f"skipping it for {self.breaker_cooldown:.0f}s")
+
+    def _release_trial(self, key: str):
+        health = self._health(key)
+        with self._lock:
+            health.trial_running = False
+
+
+_shared_resilience: Optional[Resilience] = None
+_shared_lock = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """Process-wide resilience registry shared by every scraper module"""
+    global _shared_resilience
+    if _shared_resilience is None:
+        with _shared_lock:
+            if _shared_resilience is None:
+                _shared_resilience = Resilience()
+    return _shared_resilience
+
+
+def resilient_get(session: Any, url: str, timeout: float = 30,
+                  before_attempt: Optional[Callable[[], Any]] = None,
+                  send: Optional[Callable[..., requests.Response]] = None, **kwargs) -> requests.Response:
+    """``send(session, url, timeout=..., **kwargs)`` (``session.get`` by default) under the shared policy"""
+    send = send or (lambda s, u, **kw: s.get(u, **kw))
+    return get_resilience().call(
+        url, lambda timeout: send(session, url, timeout=timeout, **kwargs),
+        timeout=timeout, before_attempt=before_attempt,
+    )
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Shared robots.txt Cache
+
+Fetches robots.txt once per host (persisted through the HTTP cache and kept
+in memory with a TTL) and answers ``can_fetch`` by walking a character trie
+of the Allow/Disallow rules, so a check costs O(path length) however many
+rules a site publishes. Matching follows RFC 9309: the longest matching rule
+wins and Allow wins ties; ``*`` and ``$`` patterns are supported. Also exposes
+``Crawl-delay`` and ``Sitemap:`` directives for the rate limiter and the
+sitemap reader.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from http_cache import get_http_cache
+from http_client import get_session
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ROBOTS_USER_AGENT = os.getenv('SCRAPE_ROBOTS_USER_AGENT', '*')
+ROBOTS_TTL = int(os.getenv('ROBOTS_TTL', str(24 * 3600)))
+ROBOTS_ERROR_TTL = int(os.getenv('ROBOTS_ERROR_TTL', '600'))
+ROBOTS_ENFORCE = os.getenv('ROBOTS_ENFORCE', '1') not in ('0', 'false', 'False')
+ROBOTS_TIMEOUT = 5
+HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"}
+
+
+class RobotsDisallowed(Exception):
+    """Raised by ``ensure_allowed`` for URLs robots.txt does not let us fetch"""
+
+
+def origin_of(url: str) -> str:
+    """scheme://host[:port] of a URL"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme or 'https'}://{(parsed.netloc or '').lower()}"
+
+
+class _TrieNode:
+    __slots__ = ('children', 'prefix_rule', 'end_rule')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.prefix_rule: Optional[bool] = None   # allow flag for a rule ending here
+        self.end_rule: Optional[bool] = None      # same, for rules anchored with '$'
+
+
+class RobotsRules:
+    """Parsed robots.txt rules for one user agent"""
+
+    def __init__(self, text: str = '', user_agent: str = ROBOTS_USER_AGENT, status: int = 200,
+                 disallow_all: bool = False):
+        self.text = text
+        self.status = status
+        self.disallow_all = disallow_all
+        self.crawl_delay: Optional[float] = None
+        self.sitemaps: List[str] = []
+        self.rule_count = 0
+        self._root = _TrieNode()
+        self._wildcards: List[Tuple[re.Pattern, int, bool]] = []
+        self._parse(text, user_agent)
+
+    def can_fetch(self, url: str) -> bool:
+        """Whether ``url`` (or a bare path) may be fetched"""
+        if self.disallow_all:
+            return False
+        parsed = urlparse(url)
+        path = (parsed.path or '/') + (f'?{parsed.query}' if parsed.query else '')
+        if path == '/robots.txt':
+            return True
+
+        best_len, allowed = -1, True
+        node = self._root
+        if node.prefix_rule is not None:
+            # A bare '*' rule matches every path
+            best_len, allowed = 0, node.prefix_rule
+        for depth, ch in enumerate(path):
+            node = node.children.get(ch)
+            if node is None:
+                break
+            if node.prefix_rule is not None:
+                best_len, allowed = self._better(best_len, allowed, depth + 1, node.prefix_rule)
+        else:
+            if node.end_rule is not None:
+                best_len, allowed = self._better(best_len, allowed, len(path), node.end_rule)
+
+        for pattern, length, allow in self._wildcards:
+            if length >= best_len and pattern.match(path):
+                best_len, allowed = self._better(best_len, allowed, length, allow)
+        return allowed
+
+    @staticmethod
+    def _better(best_len: int, allowed: bool, length: int, allow: bool) -> Tuple[int, bool]:
+        if length > best_len:
+            return length, allow
+        return best_len, allowed or allow
+
+    def _parse(self, text: str, user_agent: str):
+        token = user_agent.split('/')[0].strip().lower()
+        groups: List[Dict] = []
+        current = None
+        last_was_agent = False
+
+        for raw in text.splitlines():
+            line = raw.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            key, value = (part.strip() for part in line.split(':', 1))
+            key = key.lower()
+            if key == 'user-agent':
+                if current is None or not last_was_agent:
+                    current = {'agents': [], 'rules': [], 'delay': None}
+                    groups.append(current)
+                current['agents'].append(value.lower())
+                last_was_agent = True
+                continue
+            last_was_agent = False
+            if key == 'sitemap':
+                if value:
+                    self.sitemaps.append(value)
+            elif current is None:
+                continue
+            elif key in ('allow', 'disallow'):
+                if value:
+                    current['rules'].append((value, key == 'allow'))
+            elif key == 'crawl-delay':
+                try:
+                    current['delay'] = float(value)
+                except ValueError:
+                    pass
+
+        # The most specific matching agent group wins; '*' groups are the fallback
+        def specificity(group: Dict) -> int:
+            names = [a for a in group['agents'] if a != '*' and a in token]
+            return max(map(len, names)) if names and token != '*' else 0
+
+        best = max((specificity(g) for g in groups), default=0)
+        if best:
+            selected = [g for g in groups if specificity(g) == best]
+        else:
+            selected = [g for g in groups if '*' in g['agents']]
+
+        for group in selected:
+            for pattern, allow in group['rules']:
+                self._add_rule(pattern, allow)
+            if group['delay'] is not None:
+                self.crawl_delay = group['delay']
+
+    def _add_rule(self, pattern: str, allow: bool):
+        self.rule_count += 1
+        anchored = pattern.endswith('$')
+        body = pattern[:-1] if anchored else pattern
+        body = body.rstrip('*') if not anchored else body
+        if '*' in body:
+            regex = '.*'.join(re.escape(part) for part in body.split('*')) + ('$' if anchored else '')
+            self._wildcards.append((re.compile(regex), len(pattern), allow))
+            return
+        node = self._root
+        for ch in body:
+            node = node.children.setdefault(ch, _TrieNode())
+        attr = 'end_rule' if anchored else 'prefix_rule'
+        # Allow wins when the same pattern is both allowed and disallowed
+        setattr(node, attr, bool(getattr(node, attr)) or allow)
+
+
+class RobotsCache:
+    """Per-host robots.txt rules with a TTL, shared by every fetcher"""
+
+    def __init__(self, ttl: int = ROBOTS_TTL, user_agent: str = ROBOTS_USER_AGENT,
+                 fetcher: Optional[Callable[[str], Tuple[int, str]]] = None):
+        self.ttl = ttl
+        self.user_agent = user_agent
+        self._fetcher = fetcher or self._fetch
+        self._entries: Dict[str, Tuple[float, RobotsRules]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def rules_for(self, url: str) -> RobotsRules:
+        """Rules for the host of ``url``, fetching robots.txt at most once per TTL"""
+        origin = origin_of(url)
+        entry = self._entries.get(origin)
+        if entry and entry[0] > time.time():
+            return entry[1]
+        with self._lock:
+            host_lock = self._host_locks.setdefault(origin, threading.Lock())
+        # Only one caller per host fetches robots.txt
+        with host_lock:
+            entry = self._entries.get(origin)
+            if entry and entry[0] > time.time():
+                return entry[1]
+            rules, ttl = self._load(origin)
+            self._entries[origin] = (time.time() + ttl, rules)
+            return rules
+
+    def can_fetch(self, url: str) -> bool:
+        return self.rules_for(url).can_fetch(url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        return self.rules_for(url).crawl_delay
+
+    def sitemaps(self, url: str) -> List[str]:
+        return list(self.rules_for(url).sitemaps)
+
+    def _load(self, origin: str) -> Tuple[RobotsRules, int]:
+        try:
+            status, text = self._fetcher(f"{origin}/robots.txt")
+        except Exception as e:
+            # Unreachable host: page fetches will fail on their own, so don't block them here
+            logger.debug(f"robots.txt unavailable for {origin}: {e}")
+            return RobotsRules(user_agent=self.user_agent, status=0), ROBOTS_ERROR_TTL
+        if status >= 500:
+            # RFC 9309: a server error means assume complete disallow, but retry soon
+            logger.warning(f"robots.txt for {origin} returned {status}; treating host as disallowed for now")
+            return RobotsRules(user_agent=self.user_agent, status=status, disallow_all=True), ROBOTS_ERROR_TTL
+        if status >= 400:
+            return RobotsRules(user_agent=self.user_agent, status=status), self.ttl
+        return RobotsRules(text, self.user_agent, status), self.ttl
+
+    @staticmethod
+    def _fetch(robots_url: str) -> Tuple[int, str]:
+        response = get_http_cache().get(get_session(), robots_url, category='robots', headers=HEADERS,
+                                        timeout=ROBOTS_TIMEOUT)
+        return response.status_code, response.text
+
+
+_shared_cache: Optional[RobotsCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_robots_cache() -> RobotsCache:
+    """Process-wide robots cache shared by every scraper module"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = RobotsCache()
+    return _shared_cache
+
+
+def allowed(url: str) -> bool:
+    """robots.txt check used by fetchers; always True when ROBOTS_ENFORCE is off"""
+    if not ROBOTS_ENFORCE:
+        return True
+    try:
+        return get_robots_cache().can_fetch(url)
+    except Exception:
+        return True
+
+
+def ensure_allowed(url: str):
+    """Raise ``RobotsDisallowed`` if robots.txt forbids fetching ``url``"""
+    if not allowed(url):
+        raise RobotsDisallowed(f"robots.txt disallows {url}")
@@ -16,10 +16,19 @@ from datetime import datetime
 from collections import Counter
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 
 from bs4 import BeautifulSoup
 
+from rate_limiter import acquire as acquire_rate_limit
+from resilience import resilient_get
+from robots_cache import ensure_allowed as ensure_robots_allowed
+from http_client import get_session
+from stream_fetch import stream_get
+from feed_probe_cache import get_feed_probe_cache, FEED, MISSING
+
 from store_scrape_to_sqlite import (
     BASE_URL,
     OUTPUT_DIR,
@@ -94,11 +103,15 @@ COMMON_FEED_PATHS = [
     "blog/feed", "blog/feed.xml", "blog/rss", "blog/rss.xml",
     "news/feed", "news/rss", "posts/feed"
 ]
+RSS_PROBE_WORKERS = int(os.getenv("RSS_PROBE_WORKERS", "6"))
+RSS_FEED_TARGET = int(os.getenv("RSS_FEED_TARGET", "1"))  # stop probing a base once this many feeds are known
 
 
 def fetch_html(url: str) -> str:
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=15)
+        ensure_robots_allowed(url)
+        resp = resilient_get(get_session(), url, timeout=15, before_attempt=lambda: acquire_rate_limit(url),
+                             send=stream_get, headers=HEADERS)
         if resp.status_code == 200:
             return resp.text
     except Exception:
@@ -111,11 +124,67 @@ def is_feed_href(href: str) -> bool:
     return h.endswith(".xml") or "rss" in h or "atom" in h or "/feed" in h
 
 
+def probe_feed_path(url: str, stop: Optional[threading.Event] = None) -> Optional[bool]:
+    """HEAD a candidate feed path: True if it serves a feed, False if it is missing, None if unknown"""
+    try:
+        ensure_robots_allowed(url)
+        acquire_rate_limit(url)
+        if stop is not None and stop.is_set():
+            return None
+        r = get_session().head(url, headers=HEADERS, timeout=8, allow_redirects=True)
+    except Exception:
+        return None
+    if r.status_code == 200:
+        return "text/html" not in r.headers.get("Content-Type", "")
+    if r.status_code in (404, 410):
+        return False
+    return None
+
+
+def probe_feed_paths(candidates: List[str], target: int) -> List[str]:
+    """
+    Probe candidate feed URLs concurrently and return the feeds, in candidate order.
+
+    Known feeds and known-missing paths come from the feed probe cache; probing
+    stops as soon as ``target`` feeds are known.
+    """
+    cache = get_feed_probe_cache()
+    found: Set[str] = set()
+    pending: List[str] = []
+    for cand in candidates:
+        status = cache.lookup(cand) if cache else None
+        if status == FEED:
+            found.add(cand)
+        elif status is None:
+            pending.append(cand)
+
+    if pending and len(found) < target:
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(RSS_PROBE_WORKERS, len(pending)))
+        try:
+            futures = {executor.submit(probe_feed_path, cand, stop): cand for cand in pending}
+            for future in as_completed(futures):
+                cand, result = futures[future], future.result()
+                if result is not None and cache:
+                    cache.record(cand, FEED if result else MISSING)
+                if result:
+                    found.add(cand)
+                    if len(found) >= target:
+                        break
+        finally:
+            # Probes still waiting on the rate limiter give up instead of hitting the host
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return [cand for cand in candidates if cand in found]
+
+
 def discover_rss_feeds(base_urls: List[str]) -> List[str]:
     discovered: List[str] = []
     seen: Set[str] = set()
 
     for base in base_urls:
+        html_found = 0
         # Try HTML discovery
         html = fetch_html(base)
         if html:
@@ -131,6 +200,7 @@ def discover_rss_feeds(base_urls: List[str]) -> List[str]:
                         if abs_url not in seen:
                             discovered.append(abs_url)
                             seen.add(abs_url)
+                            html_found += 1
                 # Any <a> that looks like a feed
                 for a in soup.find_all("a"):
                     href = a.get("href") or ""
@@ -142,18 +212,13 @@ def discover_rss_feeds(base_urls: List[str]) -> List[str]:
             except Exception:
                 pass
 
-        # Try common feed paths
+        # Try common feed paths, unless the page already advertised enough feeds
+        if html_found >= RSS_FEED_TARGET:
+            continue
         try_paths = [urljoin(base if base.endswith("/") else base + "/", p) for p in COMMON_FEED_PATHS]
-        for cand in try_paths:
-            if cand in seen:
-                continue
-            try:
-                r = requests.head(cand, headers=HEADERS, timeout=8, allow_redirects=True)
-                if r.status_code == 200 and "text/html" not in r.headers.get("Content-Type", ""):
-                    discovered.append(cand)
-                    seen.add(cand)
-            except Exception:
-                continue
+        for cand in probe_feed_paths([c for c in try_paths if c not in seen], RSS_FEED_TARGET - html_found):
+            discovered.append(cand)
+            seen.add(cand)
 
     # Deduplicate while preserving order
     deduped = []
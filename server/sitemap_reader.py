@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Streaming Sitemap Reader
+
+Reads sitemaps with ``xml.etree.ElementTree.iterparse`` straight off the
+response stream, so multi-megabyte sitemaps never sit fully in memory.
+Handles gzipped sitemaps (``.xml.gz`` or gzip magic bytes), follows
+``<sitemapindex>`` children, picks up ``Sitemap:`` lines from robots.txt and
+can skip entries whose ``<lastmod>`` predates a given time. Everything is
+yielded lazily so callers can feed a bounded heap or the crawl frontier.
+"""
+
+import os
+import io
+import gzip
+import logging
+from datetime import datetime, timezone
+from typing import IO, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urljoin
+from xml.etree.ElementTree import iterparse, ParseError
+
+from rate_limiter import acquire as acquire_rate_limit
+from robots_cache import RobotsCache, get_robots_cache
+from http_client import get_session
+from stream_fetch import CappedReader, FetchRejected, max_bytes_for
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SITEMAP_TIMEOUT = 15
+SITEMAP_MAX_DEPTH = int(os.getenv('SITEMAP_MAX_DEPTH', '3'))         # sitemap-index nesting
+SITEMAP_MAX_FILES = int(os.getenv('SITEMAP_MAX_FILES', '50'))        # sitemap files per domain
+SITEMAP_MAX_URLS = int(os.getenv('SITEMAP_MAX_URLS', '200000'))      # <url> entries per domain
+DEFAULT_SITEMAP_PATHS = ('sitemap.xml', 'sitemap_index.xml')
+HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"}
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime (``2024-05-01`` or ``2024-05-01T10:00:00Z``) as aware UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def open_stream(url: str) -> Optional[IO[bytes]]:
+    """Open ``url`` as a rate-limited byte stream, or None if it is not available"""
+    try:
+        acquire_rate_limit(url)
+        response = get_session().get(url, headers=HEADERS, timeout=SITEMAP_TIMEOUT, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return None
+        # Undo transport compression; gzipped sitemap files are handled by the reader
+        response.raw.decode_content = True
+        # Let BufferedReader see EOF instead of a closed file
+        response.raw.auto_close = False
+        return io.BufferedReader(CappedReader(response.raw, max_bytes_for('sitemap'), url))
+    except Exception as e:
+        logger.debug(f"Could not open sitemap {url}: {e}")
+        return None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _decompressed(stream: IO[bytes], url: str) -> IO[bytes]:
+    head = stream.peek(2)[:2] if hasattr(stream, 'peek') else b''
+    if head == GZIP_MAGIC or (not head and url.endswith('.gz')):
+        # Cap the inflated size too, so a gzip bomb stops at the same limit
+        return CappedReader(gzip.GzipFile(fileobj=stream), max_bytes_for('sitemap'), url)
+    return stream
+
+
+def iter_sitemap_file(stream: IO[bytes], url: str = '') -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Stream ``{'kind', 'loc', 'lastmod'}`` records from one sitemap document.
+
+    ``kind`` is ``'url'`` for page entries and ``'sitemap'`` for children of a
+    sitemap index. Parsed elements are cleared as we go to keep memory flat.
+    """
+    root = None
+    try:
+        for event, elem in iterparse(_decompressed(stream, url), events=('start', 'end')):
+            if root is None:
+                root = elem
+                continue
+            if event != 'end':
+                continue
+            kind = _local_name(elem.tag)
+            if kind not in ('url', 'sitemap'):
+                continue
+            fields = {_local_name(child.tag): (child.text or '').strip() for child in elem}
+            if fields.get('loc'):
+                yield {'kind': kind, 'loc': fields['loc'], 'lastmod': fields.get('lastmod') or None}
+            root.clear()
+    except (ParseError, OSError, EOFError, FetchRejected) as e:
+        logger.warning(f"Stopped reading sitemap {url or '<stream>'}: {e}")
+
+
+def iter_sitemap_urls(domain: str, since: Optional[datetime] = None,
+                      extra_sitemaps: Optional[List[str]] = None,
+                      opener: Callable[[str], Optional[IO[bytes]]] = open_stream,
+                      robots: Optional[RobotsCache] = None,
+                      max_depth: int = SITEMAP_MAX_DEPTH, max_files: int = SITEMAP_MAX_FILES,
+                      max_urls: int = SITEMAP_MAX_URLS) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Lazily yield ``{'loc', 'lastmod'}`` page entries for a domain.
+
+    Sitemaps come from robots.txt (via the shared robots cache),
+    ``extra_sitemaps`` and the conventional ``/sitemap.xml`` locations. With ``since``, pages and whole child sitemaps
+    whose ``lastmod`` is older are skipped; entries without a lastmod are kept.
+    """
+    if since is not None:
+        # Naive datetimes are taken as local time
+        since = since.astimezone(timezone.utc)
+
+    try:
+        declared = (robots or get_robots_cache()).sitemaps(domain)
+    except Exception:
+        declared = []
+    queue = [(u, 0) for u in declared]
+    queue += [(u, 0) for u in (extra_sitemaps or [])]
+    queue += [(urljoin(domain, p), 0) for p in DEFAULT_SITEMAP_PATHS]
+    visited = set()
+    files = urls = 0
+
+    while queue and files < max_files and urls < max_urls:
+        sitemap_url, depth = queue.pop(0)
+        if sitemap_url in visited:
+            continue
+        visited.add(sitemap_url)
+        stream = opener(sitemap_url)
+        if stream is None:
+            continue
+        files += 1
+
+        with stream:
+            for record in iter_sitemap_file(stream, sitemap_url):
+                modified = parse_lastmod(record['lastmod'])
+                if since and modified and modified < since:
+                    continue
+                if record['kind'] == 'sitemap':
+                    if depth < max_depth:
+                        queue.append((record['loc'], depth + 1))
+                    continue
+                urls += 1
+                yield {'loc': record['loc'], 'lastmod': record['lastmod']}
+                if urls >= max_urls:
+                    break
@@ -105,7 +105,35 @@ def insert_item(conn, company: str, category: str, url: str, content: dict, qual
         ),
     )
     item_id = cur.lastrowid
+    _insert_item_children(cur, item_id, content)
+    conn.commit()
+    return item_id
+
 
+def update_item(conn, item_id: int, content: dict, quality: float, relevance: float, scraped_at: str) -> int:
+    """Replace the content of an existing item (and its links, code blocks and tables)"""
+    cur = conn.cursor()
+    cur.execute(
+        """
+        UPDATE scraped_items SET text_content = ?, quality_score = ?, technical_relevance = ?, scraped_at = ?
+        WHERE id = ?
+        """,
+        (
+            (content or {}).get("text_content", ""),
+            quality or 0.0,
+            relevance or 0.0,
+            scraped_at,
+            item_id,
+        ),
+    )
+    for table in ("item_links", "item_code_blocks", "item_tables"):
+        cur.execute(f"DELETE FROM {table} WHERE item_id = ?", (item_id,))
+    _insert_item_children(cur, item_id, content)
+    conn.commit()
+    return item_id
+
+
+def _insert_item_children(cur, item_id: int, content: dict):
     # Links
     for link in (content or {}).get("links", [])[:200]:
         cur.execute(
@@ -153,9 +181,6 @@ def insert_item(conn, company: str, category: str, url: str, content: dict, qual
             ),
         )
 
-    conn.commit()
-    return item_id
-
 
 def safe_filename(name: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_-]", "_", name)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Strategic Comparison Batch Scorer
+
+Scores every company in ``scraped_items`` on the five strategic dimensions
+with matrix operations instead of per-company Python loops:
+
+- a sparse item x term matrix records which indicator terms occur in each
+  item (``CountVectorizer`` over the fixed indicator vocabulary, with the same
+  substring matching as ``extract_strategic_comparison_data``);
+- multiplying it by a term x indicator matrix tells which indicators each item
+  shows, a company x item matrix sums those per company, and an indicator x
+  dimension weight matrix turns the counts into the five dimension scores.
+
+The item x term rows are kept between calls, keyed by item id and
+``scraped_at``, so a request only vectorizes items that are new or were
+re-scraped; the rest is a few sparse products over the whole corpus.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from competitive_intelligence_scraper import STRATEGIC_INDICATORS, STRATEGIC_TAXONOMY, determine_positioning
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FETCH_CHUNK = 500  # item ids per text query (below SQLite's bound-parameter limit)
+
+
+class StrategicBatchScorer:
+    """Incrementally maintained item x term matrix plus the strategic scoring products"""
+
+    def __init__(self):
+        self.terms = STRATEGIC_TAXONOMY.keywords
+        self.vectorizer = CountVectorizer(
+            analyzer=lambda text: STRATEGIC_TAXONOMY.scan(text).found(),
+            vocabulary=self.terms, binary=True, dtype=np.int32,
+        )
+        self.dimensions = list(STRATEGIC_INDICATORS)
+
+        indicators = [(dimension, indicator, terms, weight)
+                      for dimension, by_indicator in STRATEGIC_INDICATORS.items()
+                      for indicator, (terms, weight) in by_indicator.items()]
+        term_index = {term: i for i, term in enumerate(self.terms)}
+        # term x indicator: 1 when the term is one of the indicator's terms
+        rows, cols = zip(*[(term_index[STRATEGIC_TAXONOMY.normalize(term)], col)
+                           for col, (_, _, terms, _) in enumerate(indicators) for term in terms])
+        self.term_indicators = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(len(self.terms), len(indicators))
+        )
+        # indicator x dimension: the indicator's weight in its dimension
+        self.indicator_weights = np.zeros((len(indicators), len(self.dimensions)), dtype=np.int64)
+        for row, (dimension, _, _, weight) in enumerate(indicators):
+            self.indicator_weights[row, self.dimensions.index(dimension)] = weight
+
+        # Rows of the matrix follow ``_snapshot``: (id, company, scraped_at) of every item, by id
+        self._snapshot: List[tuple] = []
+        self._matrix = sparse.csr_matrix((0, len(self.terms)), dtype=np.int32)
+        self._companies: List[str] = []
+        self._company_codes = np.zeros(0, dtype=np.int64)
+        self._lock = threading.Lock()
+        self.stats = {'refreshes': 0, 'vectorized': 0}
+
+    def score(self, conn) -> Dict[str, Dict[str, Any]]:
+        """Strategic comparison for every company in ``scraped_items`` (as ``extract_strategic_comparison_data``)"""
+        with self._lock:
+            self._refresh(conn)
+            matrix, companies, codes = self._matrix, self._companies, self._company_codes
+
+        if not len(codes):
+            return {}
+        # company x item: sums item rows per company
+        grouping = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int64), (codes, np.arange(len(codes)))), shape=(len(companies), len(codes))
+        )
+        shows_indicator = (matrix @ self.term_indicators) > 0                      # item x indicator
+        indicator_counts = grouping @ shows_indicator.astype(np.int64)             # company x indicator
+        weighted = np.asarray(indicator_counts @ self.indicator_weights)           # company x dimension
+        item_counts = np.bincount(codes, minlength=len(companies))
+
+        results = {}
+        for row, company in enumerate(companies):
+            comparison_data = {
+                dimension: min(100, int(weighted[row, col]) / int(item_counts[row]))
+                for col, dimension in enumerate(self.dimensions)
+            }
+            overall_score = sum(comparison_data.values()) / len(comparison_data)
+            comparison_data['overall_score'] = overall_score
+            comparison_data['positioning'] = determine_positioning(overall_score)
+            results[company] = comparison_data
+        return results
+
+    def _refresh(self, conn):
+        """Bring the cached rows in line with the table, vectorizing only new or re-scraped items"""
+        current = conn.execute("SELECT id, company, scraped_at FROM scraped_items ORDER BY id").fetchall()
+        if current == self._snapshot:
+            return
+
+        cached = {item[0]: (row, item) for row, item in enumerate(self._snapshot)}
+        keep_rows, fresh_rows, fresh_ids = [], [], []
+        for position, item in enumerate(current):
+            hit = cached.get(item[0])
+            if hit is not None and hit[1] == item:
+                keep_rows.append(hit[0])
+            else:
+                keep_rows.append(-1)
+                fresh_rows.append(position)
+                fresh_ids.append(item[0])
+
+        texts = self._fetch_texts(conn, fresh_ids)
+        new_matrix = self.vectorizer.transform([texts.get(item_id) or '' for item_id in fresh_ids])
+
+        # Kept rows first, then the new ones, then put back into id order
+        keep_rows = np.array(keep_rows, dtype=np.int64)
+        kept_positions = np.flatnonzero(keep_rows >= 0)
+        stacked = sparse.vstack([self._matrix[keep_rows[kept_positions]], new_matrix], format='csr')
+        order = np.empty(len(current), dtype=np.int64)
+        order[np.concatenate([kept_positions, np.array(fresh_rows, dtype=np.int64)])] = np.arange(len(current))
+        self._matrix = stacked[order]
+
+        self._snapshot = current
+        self._companies = sorted({company for _, company, _ in current})
+        index = {company: code for code, company in enumerate(self._companies)}
+        self._company_codes = np.fromiter((index[company] for _, company, _ in current), dtype=np.int64, count=len(current))
+        self.stats['refreshes'] += 1
+        self.stats['vectorized'] += len(fresh_ids)
+        logger.info(f"Strategic matrix: {len(fresh_ids)} items vectorized, {len(kept_positions)} reused")
+
+    @staticmethod
+    def _fetch_texts(conn, item_ids: List[int]) -> Dict[int, Optional[str]]:
+        texts = {}
+        for start in range(0, len(item_ids), FETCH_CHUNK):
+            chunk = item_ids[start:start + FETCH_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            texts.update(conn.execute(
+                f"SELECT id, text_content FROM scraped_items WHERE id IN ({placeholders})", chunk
+            ).fetchall())
+        return texts
+
+
+_shared_scorer: Optional[StrategicBatchScorer] = None
+_shared_lock = threading.Lock()
+
+
+def get_strategic_batch_scorer() -> StrategicBatchScorer:
+    """Process-wide scorer, so the item matrix survives between requests"""
+    global _shared_scorer
+    if _shared_scorer is None:
+        with _shared_lock:
+            if _shared_scorer is None:
+                _shared_scorer = StrategicBatchScorer()
+    return _shared_scorer
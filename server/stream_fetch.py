@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Streaming Fetch
+
+Capped GET primitive for the scrapers. The response is requested with
+``stream=True`` so status and headers can be inspected before any body is
+read: responses whose Content-Type is not one the caller accepts (a mislinked
+PDF, video or JS bundle) are closed without downloading, and bodies are read
+chunk by chunk (decompressed incrementally by urllib3) and aborted as soon as
+they exceed the category's byte limit.
+"""
+
+import os
+import io
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import requests
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Max decoded body bytes per content category; matched like the HTTP cache TTL
+# policy (exact, then substring). Override with FETCH_MAX_BYTES_<CATEGORY>.
+DEFAULT_MAX_BYTES = {
+    'docs': 5 * MB,
+    'blog': 5 * MB,
+    'rss': 10 * MB,
+    'sitemap': 50 * MB,
+    'default': 5 * MB,
+}
+
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+FEED_TYPES = ('xml', 'rss', 'atom', 'rdf', 'text/plain', 'json')
+
+
+class FetchRejected(Exception):
+    """Response skipped because of its Content-Type or size"""
+
+
+def max_bytes_for(category: str) -> int:
+    """Byte limit for a content category"""
+    category = (category or 'default').lower()
+    key = category if category in DEFAULT_MAX_BYTES else next(
+        (k for k in DEFAULT_MAX_BYTES if k != 'default' and k in category), 'default')
+    return int(os.getenv(f'FETCH_MAX_BYTES_{key.upper()}', str(DEFAULT_MAX_BYTES[key])))
+
+
+class CappedReader(io.RawIOBase):
+    """Byte stream over ``stream`` that raises ``FetchRejected`` once more than ``limit`` bytes were read"""
+
+    def __init__(self, stream: Any, limit: int, url: str = ''):
+        self.stream = stream
+        self.limit = limit
+        self.url = url
+        self.size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(min(len(buffer), self.limit - self.size + 1))
+        self.size += len(data)
+        if self.size > self.limit:
+            raise FetchRejected(f"{self.url or '<stream>'}: body exceeds the {self.limit} byte limit")
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            super().close()
+
+
+def content_type_allowed(content_type: str, accept: Optional[Iterable[str]]) -> bool:
+    """Whether a Content-Type matches one of ``accept`` (missing types are given the benefit of the doubt)"""
+    if accept is None or not content_type:
+        return True
+    content_type = content_type.lower()
+    return any(a in content_type for a in accept)
+
+
+def stream_get(session: Any, url: str, category: str = 'default',
+               accept: Optional[Iterable[str]] = HTML_TYPES,
+               max_bytes: Optional[int] = None, truncate: bool = False,
+               headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+    """
+    GET ``url`` through ``session`` reading at most ``max_bytes`` of body.
+
+    Raises ``FetchRejected`` for successful responses of an unaccepted
+    Content-Type or whose body exceeds the limit; with ``truncate`` an
+    oversized body is cut at the limit instead. Returns a normal
+    ``requests.Response`` with its content already loaded, so it can be
+    stored by the HTTP cache (pass ``send=`` to ``HTTPCache.get``).
+    """
+    limit = max_bytes if max_bytes is not None else max_bytes_for(category)
+    response = session.get(url, headers=headers, stream=True, **kwargs)
+    try:
+        content_type = response.headers.get('Content-Type', '')
+        if response.ok and not content_type_allowed(content_type, accept):
+            raise FetchRejected(f"{url}: content type {content_type!r} not accepted")
+
+        declared = response.headers.get('Content-Length', '')
+        if not truncate and declared.isdigit() and int(declared) > limit:
+            raise FetchRejected(f"{url}: {declared} bytes exceeds the {limit} byte limit")
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                if not truncate:
+                    raise FetchRejected(f"{url}: body exceeds the {limit} byte limit")
+                chunks.append(chunk[:len(chunk) - (size - limit)])
+                break
+            chunks.append(chunk)
+        response._content = b''.join(chunks)
+        return response
+    except FetchRejected as e:
+        logger.debug(str(e))
+        raise
+    finally:
+        # Drops the socket of an unfinished read, releases a finished one to the pool
+        response.close()
@@ -6,18 +6,21 @@ Targeted BI Competitive Monitor
 - Stores to SQLite and generates AI reports + consolidated matrix
 """
 
+import os
 import re
 import json
+import heapq
 import time
 import hashlib
-import requests
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 from bs4 import BeautifulSoup
 import feedparser
 import shutil
+import sqlite3
+import argparse
 import sys
 
 from store_scrape_to_sqlite import (
@@ -26,6 +29,7 @@ from store_scrape_to_sqlite import (
     ensure_dirs,
     init_db,
     insert_item,
+    update_item,
 )
 import rss_batch_scrape_and_insights as rssmod
 from rss_batch_scrape_and_insights import (
@@ -40,6 +44,20 @@ from rss_batch_scrape_and_insights import (
 import unified_competitive_monitor as umod
 from unified_competitive_monitor import write_docs_ai_md, ai_analyze_docs
 from competitor_targeting import COMPETITORS
+from rate_limiter import acquire as acquire_rate_limit
+from resilience import resilient_get
+from robots_cache import allowed as robots_allowed, ensure_allowed as ensure_robots_allowed
+from http_cache import get_http_cache
+from http_client import get_session
+from stream_fetch import stream_get, FEED_TYPES
+from raw_html_archive import archive_body
+from parsed_document import ParsedDocument
+from keyword_matcher import KeywordTaxonomy
+from extraction_patterns import API_VERSION_PATH_PATTERN, SPEC_URL_PATTERNS, VERSION_PATH_PATTERN
+from crawl_frontier import CrawlFrontier
+from sitemap_reader import iter_sitemap_urls
+from crawl_checkpoint import CrawlCheckpoint, CHECKPOINT_EVERY
+from page_fingerprints import PageFingerprints, content_fingerprint
 from coverage_gap_resolver import CoverageGapResolver
 
 # Determine disk health and set dry-run if low space
@@ -62,9 +80,31 @@ except OSError:
 HEADERS = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"}
 
 KEYWORD_ALLOW = re.compile(r"\b(api|endpoint|authentication|oauth|token|webhook|sdk|client|reference|limit|quota|pricing|rate|integration|connector|etl|warehouse)\b", re.I)
-MAX_DOC_PAGES_PER_COMPANY = 60
-MAX_DEPTH = 2
-SITEMAP_LIMIT = 150
+MAX_DOC_PAGES_PER_COMPANY = int(os.getenv('MAX_DOC_PAGES_PER_COMPANY', '60'))
+MAX_DEPTH = int(os.getenv('MAX_DOC_DEPTH', '2'))
+SITEMAP_LIMIT = int(os.getenv('SITEMAP_LIMIT', '150'))
+
+# Keyword sets for relevance scoring, each compiled into a single matcher
+TECHNICAL_TERMS = [
+    'api', 'endpoint', 'authentication', 'sdk', 'deployment', 'configuration',
+    'integration', 'webhook', 'rate limit', 'quota', 'oauth', 'token',
+    'swagger', 'openapi', 'rest', 'graphql', 'http', 'request', 'response'
+]
+COMPANY_TECHNICAL_KEYWORDS = {
+    'snowflake': ['snowpark', 'cortex', 'warehouse', 'data cloud', 'sql'],
+    'databricks': ['notebook', 'workspace', 'unity catalog', 'delta lake', 'mlflow'],
+    'powerbi': ['power query', 'dax', 'm language', 'gateway', 'workspace'],
+    'tableau': ['tableau prep', 'tableau server', 'tableau online', 'vizql', 'hyper'],
+    'looker': ['lookml', 'explore', 'dashboard', 'block', 'bigquery'],
+    'qlik': ['qlikview', 'qliksense', 'script', 'load script', 'qlik engine']
+}
+RELEVANCE_TAXONOMY = KeywordTaxonomy({'technical_terms': TECHNICAL_TERMS, **COMPANY_TECHNICAL_KEYWORDS})
+URL_PATTERN_TAXONOMY = KeywordTaxonomy({
+    'high_value': ['/api/', '/docs/', '/developers/', '/reference/', '/sdk/',
+                   '/integration/', '/webhook/', '/authentication/', '/rate-limit/'],
+    'extensions': ['.json', '.yaml', '.yml', '.md', '.pdf'],
+    'docs': ['/guide/', '/tutorial/', '/example/', '/sample/'],
+})
 
 
 def same_site(base: str, url: str) -> bool:
@@ -76,19 +116,29 @@ def same_site(base: str, url: str) -> bool:
         return False
 
 
-def fetch(url: str, timeout: int = 12) -> str:
+def fetch(url: str, timeout: int = 12, category: str = 'docs', company: Optional[str] = None) -> str:
+    """HTML body of ``url`` ('' on failure); network bodies are archived when ``company`` is given"""
     try:
-        r = requests.get(url, headers=HEADERS, timeout=timeout)
+        ensure_robots_allowed(url)
+        r = get_http_cache().get(
+            get_session(), url, category=category, headers=HEADERS, timeout=timeout,
+            send=lambda session, u, **kw: resilient_get(
+                session, u, before_attempt=lambda: acquire_rate_limit(u), send=stream_get, category=category, **kw)
+        )
         if r.status_code == 200 and 'text/html' in r.headers.get('Content-Type',''):
+            if company is not None and not r.from_cache and not DRY_RUN:
+                archive_body(url, r.text, company, category)
             return r.text
     except Exception:
         pass
     return ""
 
 
-def fetch_bytes(url: str, timeout: int = 10) -> bytes:
+def fetch_bytes(url: str, timeout: int = 10, category: str = 'rss') -> bytes:
     try:
-        r = requests.get(url, headers=HEADERS, timeout=timeout)
+        ensure_robots_allowed(url)
+        r = resilient_get(get_session(), url, timeout=timeout, before_attempt=lambda: acquire_rate_limit(url),
+                          send=stream_get, category=category, accept=FEED_TYPES, headers=HEADERS)
         if r.status_code == 200:
             return r.content
     except Exception:
@@ -96,10 +146,10 @@ def fetch_bytes(url: str, timeout: int = 10) -> bytes:
     return b""
 
 
-def extract_links(base: str, html: str) -> List[str]:
-    soup = BeautifulSoup(html, 'html.parser')
+def extract_links(base: str, html) -> List[str]:
+    doc = html if isinstance(html, ParsedDocument) else ParsedDocument(html, base)
     links: List[str] = []
-    for a in soup.find_all('a', href=True):
+    for a in doc.links:
         u = urljoin(base, a['href'])
         if same_site(base, u):
             links.append(u)
@@ -110,102 +160,85 @@ def score_page_text(text: str) -> int:
     return len(KEYWORD_ALLOW.findall(text))
 
 
-def discover_from_sitemap(domain: str, roots: List[Dict]) -> List[Dict]:
-    """Enhanced sitemap discovery with technical content prioritization - Phase 2.1 implementation"""
-    candidates = [urljoin(domain, 'sitemap.xml'), urljoin(domain, 'sitemap_index.xml')]
-    urls: List[Dict] = []
+def discover_from_sitemap(domain: str, roots: List[Dict], since: Optional[datetime] = None) -> List[Dict]:
+    """Enhanced sitemap discovery with technical content prioritization - Phase 2.1 implementation
+
+    Sitemaps (robots.txt declarations, indexes and gzipped files included) are
+    streamed and scored lazily; with ``since`` only pages whose lastmod is newer
+    are considered.
+    """
+    doc_markers = ('doc', 'help', 'developer', 'developers', 'reference', 'api', 'learn')
     
-    for sm in candidates:
-        xml = fetch_bytes(sm, timeout=8)
-        if not xml:
-            continue
-        try:
-            soup = BeautifulSoup(xml, 'xml')
-            for loc in soup.find_all('loc'):
-                u = loc.get_text(strip=True)
-                if u and same_site(domain, u):
-                    # Score URL for technical relevance
-                    technical_score = score_url_technical_relevance(u)
-                    urls.append({
-                        'url': u,
-                        'technical_score': technical_score,
-                        'source': 'sitemap'
-                    })
-        except Exception:
-            continue
+    def candidates():
+        # Filter to doc-like URLs on the company's site
+        for entry in iter_sitemap_urls(domain, since=since):
+            u = entry['loc']
+            if same_site(domain, u) and any(k in u.lower() for k in doc_markers) and robots_allowed(u):
+                yield {
+                    'url': u,
+                    'technical_score': score_url_technical_relevance(u),
+                    'source': 'sitemap',
+                    'lastmod': entry['lastmod'],
+                }
     
-    # Filter to doc-like URLs and roots domain
-    filtered = []
-    for url_info in urls:
-        u = url_info['url']
-        if any(k in u.lower() for k in ['doc', 'help', 'developer', 'developers', 'reference', 'api', 'learn']):
-            filtered.append(url_info)
+    # Bounded heap keeps memory at SITEMAP_LIMIT entries however large the sitemaps are
+    filtered = heapq.nlargest(SITEMAP_LIMIT, candidates(), key=lambda x: x['technical_score'])
     
     # Ensure we include roots as seeds with high priority
+    filtered_urls = {url_info['url'] for url_info in filtered}
     for r in roots:
         if isinstance(r, dict) and 'url' in r:
             root_url = r['url']
-            if root_url not in [url_info['url'] for url_info in filtered]:
+            if root_url not in filtered_urls:
+                filtered_urls.add(root_url)
                 filtered.append({
                     'url': root_url,
                     'technical_score': r.get('technical_score', 1.0),  # High priority for seed roots
                     'source': r.get('source', 'seed_root')
                 })
     
-    # Sort by technical relevance score
-    filtered.sort(key=lambda x: x['technical_score'], reverse=True)
-    
-    return filtered[:SITEMAP_LIMIT]
+    # Keep the most technically relevant candidates
+    return heapq.nlargest(SITEMAP_LIMIT, filtered, key=lambda x: x['technical_score'])
 
 def score_url_technical_relevance(url: str) -> float:
     """Score URL for technical relevance - Phase 2.3 implementation"""
     try:
         score = 0.0
+        url_lower = url.lower()
+        hits = URL_PATTERN_TAXONOMY.scan(url_lower, lowered=True)
         
         # High-value technical paths
-        high_value_patterns = [
-            '/api/', '/docs/', '/developers/', '/reference/', '/sdk/',
-            '/integration/', '/webhook/', '/authentication/', '/rate-limit/'
-        ]
-        
-        for pattern in high_value_patterns:
-            if pattern in url.lower():
-                score += 0.3
-                break
+        if hits.any('high_value'):
+            score += 0.3
         
         # Technical file extensions
-        tech_extensions = ['.json', '.yaml', '.yml', '.md', '.pdf']
-        for ext in tech_extensions:
-            if ext in url.lower():
-                score += 0.2
-                break
+        if hits.any('extensions'):
+            score += 0.2
         
         # Version patterns (v1, v2, etc.)
-        if re.search(r'/v\d+/', url.lower()):
+        if VERSION_PATH_PATTERN.search(url_lower):
             score += 0.15
         
         # API version patterns
-        if re.search(r'/api/v\d+/', url.lower()):
+        if API_VERSION_PATH_PATTERN.search(url_lower):
             score += 0.25
         
         # Documentation patterns
-        doc_patterns = ['/guide/', '/tutorial/', '/example/', '/sample/']
-        for pattern in doc_patterns:
-            if pattern in url.lower():
-                score += 0.1
+        for _ in hits.present('docs'):
+            score += 0.1
         
         return min(1.0, score)
         
     except Exception:
         return 0.0
 
-def extract_technical_links(base_url: str, html_content: str) -> List[Dict]:
+def extract_technical_links(base_url: str, html_content) -> List[Dict]:
     """Extract and score links for technical relevance - Phase 2.2 implementation"""
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        doc = html_content if isinstance(html_content, ParsedDocument) else ParsedDocument(html_content, base_url)
         links: List[Dict] = []
         
-        for a in soup.find_all('a', href=True):
+        for a in doc.links:
             u = urljoin(base_url, a['href'])
             if same_site(base_url, u):
                 # Score link for technical relevance
@@ -261,11 +294,11 @@ def score_link_technical_relevance(link_element, url: str) -> float:
             score += 0.2
         
         # Version patterns
-        if re.search(r'/v\d+/', url_lower):
+        if VERSION_PATH_PATTERN.search(url_lower):
             score += 0.15
         
         # API endpoints
-        if re.search(r'/api/v\d+/', url_lower):
+        if API_VERSION_PATH_PATTERN.search(url_lower):
             score += 0.25
         
         return min(1.0, score)
@@ -306,80 +339,137 @@ def extract_link_technical_indicators(link_element, url: str) -> List[str]:
     
     return indicators
 
-def crawl_docs_enhanced(company: str, roots: List[Dict], cap: int = MAX_DOC_PAGES_PER_COMPANY, max_depth: int = MAX_DEPTH) -> List[Dict]:
-    """Enhanced document crawling with technical relevance prioritization - Phase 2 implementation"""
-    seen: set = set()
+def analyze_doc_page(url: str, html, company: str) -> Dict:
+    """Extract title and main text from a docs page (raw HTML or a ParsedDocument) and score it"""
+    doc = html if isinstance(html, ParsedDocument) else ParsedDocument(html, url)
+    title = doc.title if doc.title is not None else url
+    text = doc.main_text
+    
+    # Enhanced content scoring
+    return {
+        'title': title,
+        'content': text,
+        'score': score_page_text(text),
+        'technical_relevance': calculate_technical_relevance(text, company),
+    }
+
+def crawl_docs_enhanced(company: str, roots: List[Dict], cap: int = MAX_DOC_PAGES_PER_COMPANY, max_depth: int = MAX_DEPTH,
+                        checkpoint: Optional[CrawlCheckpoint] = None, stage: str = 'docs',
+                        fingerprints: Optional[PageFingerprints] = None,
+                        claim: Optional[Callable[[str], bool]] = None) -> List[Dict]:
+    """Enhanced document crawling with technical relevance prioritization - Phase 2 implementation
+
+    With a ``checkpoint`` the frontier, seen-set and partial results are saved every
+    CHECKPOINT_EVERY pages under ``stage`` and picked up again on resume.
+
+    With ``fingerprints`` (incremental mode) pages whose sitemap lastmod or content
+    fingerprint is unchanged reuse their stored analysis and links, and each result
+    carries ``change`` = 'new' | 'updated' | 'unchanged'.
+
+    ``claim(url)`` is asked before each page is fetched; pages it refuses (already
+    taken by another crawl worker) are skipped.
+    """
     results: List[Dict] = []
-    queue: List[Tuple[Dict, int]] = []
+    frontier = CrawlFrontier(url_filter=robots_allowed)
+    root_prefixes = tuple(r['url'] for r in roots)
     
-    # Initialize queue with seed roots
-    for root_info in roots:
-        queue.append((root_info, 0))
-        seen.add(root_info['url'])
+    saved = checkpoint.load_stage(company, stage) if checkpoint else None
+    if saved and saved['complete']:
+        return saved['results'] or []
+    if saved and saved['frontier']:
+        print(f"   ↩️ Resuming {stage} crawl for {company} ({len(saved['results'] or [])} pages kept)")
+        results = saved['results'] or []
+        frontier = CrawlFrontier.restore(saved['frontier'], url_filter=robots_allowed)
+    else:
+        # Initialize frontier with seed roots
+        frontier.extend(roots, depth=0)
     
-    while queue and len(results) < cap:
-        # Sort queue by technical relevance score for intelligent crawling
-        queue.sort(key=lambda x: x[0]['technical_score'], reverse=True)
-        url_info, depth = queue.pop(0)
+    pages_since_save = 0
+    while frontier and len(results) < cap:
+        if checkpoint and pages_since_save >= CHECKPOINT_EVERY:
+            checkpoint.save_stage(company, stage, results, frontier.snapshot())
+            pages_since_save = 0
+        pages_since_save += 1
+        
+        # Highest technical relevance first, shallower pages breaking ties
+        url_info, depth = frontier.pop()
         url = url_info['url']
-        
-        html = fetch(url)
-        if not html:
+        lastmod = url_info.get('lastmod')
+        need_links = depth < max_depth
+        if claim is not None and not claim(url):
             continue
         
-        soup = BeautifulSoup(html, 'html.parser')
-        title = soup.find('title').get_text() if soup.find('title') else url
-        main = soup.find('main') or soup.find('article') or soup.find('body')
-        text = main.get_text(' ', strip=True) if main else soup.get_text(' ', strip=True)
-        
-        # Enhanced content scoring
-        score = score_page_text(text)
-        technical_relevance = calculate_technical_relevance(text, company)
-        
-        if score > 0 or technical_relevance > 0.3:
-            results.append({
+        prior = fingerprints.lookup(company, 'docs', url) if fingerprints else None
+        reusable = bool(prior and prior['page'] is not None and (prior['links'] is not None or not need_links))
+        if reusable and lastmod and prior['lastmod'] == lastmod:
+            # Sitemap says the page has not changed since it was last processed
+            page, links, change = prior['page'], prior['links'], 'unchanged'
+            fingerprints.touch(company, 'docs', url)
+        else:
+            html = fetch(url, company=company)
+            if not html:
+                continue
+            
+            fingerprint = content_fingerprint(html) if fingerprints else None
+            if reusable and prior['fingerprint'] == fingerprint:
+                page, links, change = prior['page'], prior['links'], 'unchanged'
+                fingerprints.touch(company, 'docs', url, lastmod)
+            else:
+                # One parse serves the page analysis and the link discovery
+                doc = ParsedDocument(html, url)
+                page = analyze_doc_page(url, doc, company)
+                # Intelligent link discovery for next level: only technically relevant links are followed
+                links = [l for l in extract_technical_links(url, doc) if l['technical_score'] > 0.3] if need_links else None
+                change = 'new' if prior is None else 'updated'
+                if fingerprints:
+                    # Pages that will be stored are fingerprinted by store_doc_pages once their row is written
+                    keep = fingerprints.stage if is_doc_result(page) else fingerprints.record
+                    keep(company, 'docs', url, fingerprint, page, links, lastmod, is_new=prior is None)
+        
+        if is_doc_result(page):
+            result = {
                 'company': company,
-                'title': title,
-                'content': text,
+                'title': page['title'],
+                'content': page['content'],
                 'url': url,
-                'score': score,
-                'technical_relevance': technical_relevance,
+                'score': page['score'],
+                'technical_relevance': page['technical_relevance'],
                 'technical_score': url_info.get('technical_score', 0.0),
                 'source': url_info.get('source', 'unknown'),
                 'depth': depth
-            })
-        
-        # Intelligent link discovery for next level
-        if depth < max_depth:
-            technical_links = extract_technical_links(url, html)
-            
-            # Add high-scoring technical links to queue
-            for link_info in technical_links:
-                if (link_info['url'] not in seen and 
-                    link_info['technical_score'] > 0.3 and  # Only follow technically relevant links
-                    any(link_info['url'].startswith(r['url']) for r in roots)):
-                    
-                    seen.add(link_info['url'])
-                    queue.append((link_info, depth + 1))
+            }
+            if fingerprints:
+                result['change'] = change
+            results.append(result)
+        
+        # Add high-scoring technical links to the frontier
+        if need_links:
+            for link_info in links:
+                if link_info['url'] not in frontier and link_info['url'].startswith(root_prefixes):
+                    frontier.add(link_info, depth + 1)
     
     # Sort results by combined score (content score + technical relevance)
     results.sort(key=lambda x: (x['score'] + x['technical_relevance'] * 2), reverse=True)
-    return results[:cap]
+    results = results[:cap]
+    if frontier.pruned:
+        print(f"   🤖 Skipped {frontier.pruned} URLs disallowed by robots.txt")
+    if checkpoint:
+        checkpoint.save_stage(company, stage, results, complete=True)
+    return results
+
+def is_doc_result(page: Dict) -> bool:
+    """Whether an analyzed docs page is kept in the crawl results"""
+    return page['score'] > 0 or page['technical_relevance'] > 0.3
+
 
 def calculate_technical_relevance(text: str, company: str) -> float:
     """Calculate technical relevance score for content - Phase 2.3 implementation"""
     try:
-        text_lower = text.lower()
+        hits = RELEVANCE_TAXONOMY.scan(text)
         score = 0.0
         
         # Technical terminology density
-        technical_terms = [
-            'api', 'endpoint', 'authentication', 'sdk', 'deployment', 'configuration',
-            'integration', 'webhook', 'rate limit', 'quota', 'oauth', 'token',
-            'swagger', 'openapi', 'rest', 'graphql', 'http', 'request', 'response'
-        ]
-        
-        term_count = sum(1 for term in technical_terms if term in text_lower)
+        term_count = hits.count('technical_terms')
         score += min(0.4, term_count * 0.05)
         
         # Code block presence
@@ -387,32 +477,21 @@ def calculate_technical_relevance(text: str, company: str) -> float:
             score += 0.2
         
         # URL patterns (API endpoints, documentation links)
-        url_patterns = [r'https?://[^\s]+\.json', r'https?://[^\s]+\.yaml', r'https?://[^\s]+\.yml']
-        for pattern in url_patterns:
-            if re.search(pattern, text):
+        for pattern in SPEC_URL_PATTERNS:
+            if pattern.search(text):
                 score += 0.15
         
-        # HTTP methods
+        # HTTP methods (case-sensitive, so not part of the lowercased scan)
         http_methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']
         method_count = sum(1 for method in http_methods if method in text)
         score += min(0.15, method_count * 0.03)
         
         # Company-specific technical keywords
-        company_keywords = {
-            'snowflake': ['snowpark', 'cortex', 'warehouse', 'data cloud', 'sql'],
-            'databricks': ['notebook', 'workspace', 'unity catalog', 'delta lake', 'mlflow'],
-            'powerbi': ['power query', 'dax', 'm language', 'gateway', 'workspace'],
-            'tableau': ['tableau prep', 'tableau server', 'tableau online', 'vizql', 'hyper'],
-            'looker': ['lookml', 'explore', 'dashboard', 'block', 'bigquery'],
-            'qlik': ['qlikview', 'qliksense', 'script', 'load script', 'qlik engine']
-        }
-        
         company_lower = company.lower()
-        for comp, keywords in company_keywords.items():
+        for comp in COMPANY_TECHNICAL_KEYWORDS:
             if comp in company_lower:
-                for keyword in keywords:
-                    if keyword.lower() in text_lower:
-                        score += 0.1
+                for _ in hits.present(comp):
+                    score += 0.1
         
         return min(1.0, score)
         
@@ -426,7 +505,7 @@ def discover_rss_feeds_enhanced(domain: str) -> List[Dict]:
     
     # Parse HTML for rel=alternate
     for s in seeds[:2]:
-        html = fetch(s, timeout=6)
+        html = fetch(s, timeout=6, category='blog')
         if not html:
             continue
         soup = BeautifulSoup(html, 'html.parser')
@@ -504,7 +583,32 @@ def fallback_scrape_company_rss(company: str, feed_url: str) -> Dict:
     }
 
 
-def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) -> Dict:
+def store_doc_pages(conn, company: str, doc_pages: List[Dict], fingerprints: Optional[PageFingerprints] = None):
+    """Insert new docs pages and refresh updated ones in the scrape database
+
+    Staged fingerprints are committed only for pages whose row was written.
+    """
+    for p in doc_pages:
+        if p.get('change') == 'unchanged':
+            continue
+        try:
+            existing_id = find_existing_item(conn, company, 'docs', p['url'])
+            if not existing_id:
+                insert_item(conn, company, 'docs', p['url'], {'text_content': p.get('content','')}, 0.0, 1.0, datetime.now().isoformat())
+            elif p.get('change') == 'updated':
+                update_item(conn, existing_id, {'text_content': p.get('content','')}, 0.0, 1.0, datetime.now().isoformat())
+        except (OSError, sqlite3.Error):
+            continue
+        if fingerprints:
+            fingerprints.commit(company, 'docs', p['url'])
+    if fingerprints:
+        fingerprints.discard(company, 'docs')
+
+
+def run_company_with_fallback(name: str, domain: str, roots: List[str], conn,
+                              checkpoint: Optional[CrawlCheckpoint] = None,
+                              sitemap_since: Optional[datetime] = None,
+                              fingerprints: Optional[PageFingerprints] = None) -> Dict:
     """Run company monitoring with automatic fallback for coverage gaps"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
@@ -518,11 +622,17 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
         })
     
     # RSS (enhanced discovery + feedparser)
-    feeds = discover_rss_feeds_enhanced(domain)
-    rss_items: List[Dict] = []
+    saved_rss = checkpoint.load_stage(name, 'rss') if checkpoint else None
+    rss_resumed = bool(saved_rss and saved_rss['complete'])
+    if rss_resumed:
+        # Items were already stored on the interrupted run
+        feeds, rss_items = saved_rss['results']['feeds'], saved_rss['results']['items']
+    else:
+        feeds = discover_rss_feeds_enhanced(domain)
+        rss_items = []
     seen = set()
     
-    for f in feeds:
+    for f in ([] if rss_resumed else feeds):
         r = fallback_scrape_company_rss(name, f['url'])
         rss = (r.get('categories', {}) or {}).get('rss', {})
         items = rss.get('items', []) or []
@@ -546,6 +656,9 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
             
             rss_items.append(item)
     
+    if checkpoint and not rss_resumed:
+        checkpoint.save_stage(name, 'rss', {'feeds': feeds, 'items': rss_items}, complete=True)
+    
     rss_summary = summarize_rss_items(rss_items)
     if not DRY_RUN:
         try:
@@ -556,7 +669,7 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
             pass
 
     # DOCS (enhanced crawling with technical relevance prioritization)
-    sitemap_urls = discover_from_sitemap(domain, enhanced_roots)
+    sitemap_urls = discover_from_sitemap(domain, enhanced_roots, since=sitemap_since)
     
     # Ensure sitemap_urls is a list of dictionaries
     if not isinstance(sitemap_urls, list):
@@ -586,10 +699,12 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
             doc_seed_roots_formatted.append({
                 'url': root_info['url'],
                 'technical_score': root_info.get('technical_score', 0.0),
-                'source': root_info.get('source', 'unknown')
+                'source': root_info.get('source', 'unknown'),
+                'lastmod': root_info.get('lastmod')
             })
     
-    doc_pages = crawl_docs_enhanced(name, doc_seed_roots_formatted, MAX_DOC_PAGES_PER_COMPANY, MAX_DEPTH)
+    doc_pages = crawl_docs_enhanced(name, doc_seed_roots_formatted, MAX_DOC_PAGES_PER_COMPANY, MAX_DEPTH,
+                                    checkpoint=checkpoint, stage='docs', fingerprints=fingerprints)
     
     # Check if we need fallback discovery due to low coverage
     if len(doc_pages) < 5:  # Threshold for considering coverage insufficient
@@ -624,7 +739,9 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
             # Try crawling with fallback roots
             if fallback_roots:
                 print(f"   🚀 Attempting fallback crawling with {len(fallback_roots)} URLs...")
-                fallback_pages = crawl_docs_enhanced(name, fallback_roots, MAX_DOC_PAGES_PER_COMPANY, MAX_DEPTH)
+                fallback_pages = crawl_docs_enhanced(name, fallback_roots, MAX_DOC_PAGES_PER_COMPANY, MAX_DEPTH,
+                                                     checkpoint=checkpoint, stage='docs_fallback',
+                                                     fingerprints=fingerprints)
                 
                 if len(fallback_pages) > len(doc_pages):
                     print(f"   ✅ Fallback successful: {len(fallback_pages)} pages vs {len(doc_pages)} original")
@@ -647,19 +764,17 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
                 print(f"   ⚠️ Could not save coverage investigation: {e}")
     
     if not DRY_RUN and conn is not None:
-        for p in doc_pages:
+        store_doc_pages(conn, name, doc_pages, fingerprints)
+        
+        # In incremental mode the docs analysis is only redone when something changed
+        if fingerprints is None or any(p.get('change') != 'unchanged' for p in doc_pages):
             try:
-                existing_id = find_existing_item(conn, name, 'docs', p['url'])
-                if not existing_id:
-                    insert_item(conn, name, 'docs', p['url'], {'text_content': p.get('content','')}, 0.0, 1.0, datetime.now().isoformat())
+                docs_ai = ai_analyze_docs(name, doc_pages)
+                write_docs_ai_md(name, docs_ai, timestamp)
             except OSError:
                 pass
-        
-        try:
-            docs_ai = ai_analyze_docs(name, doc_pages)
-            write_docs_ai_md(name, docs_ai, timestamp)
-        except OSError:
-            pass
+        else:
+            print("   ♻️ Docs unchanged since last run — skipping docs analysis")
 
     if DRY_RUN:
         print(f"   RSS items: {len(rss_items)} | Top titles: " + "; ".join([i.get('title','')[:60] for i in rss_items[:5]]))
@@ -675,6 +790,7 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
     return {
         'rss_count': len(rss_items),
         'docs_count': len(doc_pages),
+        'docs_changed': len([p for p in doc_pages if p.get('change', 'new') != 'unchanged']),
         'enhanced_crawling': True,
         'fallback_discovery_used': len(doc_pages) > 0 and any(p.get('source') == 'fallback_discovery' for p in doc_pages),
         'technical_relevance_stats': {
@@ -686,6 +802,15 @@ def run_company_with_fallback(name: str, domain: str, roots: List[str], conn) ->
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Targeted BI competitive monitor")
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the last unfinished run from its checkpoint instead of starting over')
+    parser.add_argument('--changed-since-last-run', action='store_true',
+                        help='Only take sitemap pages whose lastmod is newer than the last completed run')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Skip parsing and scoring of docs pages whose lastmod or content fingerprint is unchanged')
+    args = parser.parse_args()
+
     try:
         ensure_dirs()
         conn = init_db()
@@ -693,13 +818,46 @@ def main():
     except OSError:
         conn = None
 
-    consolidated: Dict[str, Dict] = {}
+    checkpoint = None
+    if DRY_RUN:
+        if args.resume:
+            print("⚠️ Checkpoints are disabled in DRY RUN mode; starting from scratch.", file=sys.stderr)
+    else:
+        try:
+            checkpoint = CrawlCheckpoint.open('targeted_bi_monitor', resume=args.resume)
+        except sqlite3.Error as e:
+            print(f"⚠️ Checkpoint unavailable ({e}); run will not be resumable.", file=sys.stderr)
+
+    sitemap_since = None
+    if args.changed_since_last_run:
+        sitemap_since = checkpoint.last_completed_start() if checkpoint else None
+        print(f"🗺️ Sitemap lastmod filter: {sitemap_since.isoformat() if sitemap_since else 'none (no completed run)'}")
+
+    fingerprints = None
+    if args.incremental:
+        if DRY_RUN or conn is None:
+            print("⚠️ Incremental mode needs the scrape database; running a full crawl.", file=sys.stderr)
+        else:
+            fingerprints = PageFingerprints(conn)
+
+    consolidated: Dict[str, Dict] = checkpoint.completed_companies() if checkpoint else {}
+    if consolidated:
+        print(f"↩️ Resuming run: {len(consolidated)} companies already done ({', '.join(consolidated)})")
     for comp in COMPETITORS:
         name = comp['name']
         domain = comp['domain']
         docs_roots = comp.get('docs', [])
+        if name in consolidated:
+            continue
         print(f"\n▶️ Running targeted monitoring for {name}")
-        consolidated[name] = run_company_with_fallback(name, domain, docs_roots, conn)
+        if checkpoint:
+            checkpoint.mark_company_started(name)
+        consolidated[name] = run_company_with_fallback(name, domain, docs_roots, conn, checkpoint, sitemap_since,
+                                                       fingerprints)
+        if checkpoint:
+            checkpoint.mark_company_done(name, consolidated[name])
+    # Keep the matrix in COMPETITORS order regardless of which companies were resumed
+    consolidated = {c['name']: consolidated[c['name']] for c in COMPETITORS if c['name'] in consolidated}
 
     ts = datetime.now().strftime('%Y%m%d_%H%M%S')
     if not DRY_RUN:
@@ -718,6 +876,13 @@ def main():
         for name, stats in consolidated.items():
             print(f"- {name}: docs={stats.get('docs_count',0)}, rss={stats.get('rss_count',0)}")
 
+    if fingerprints:
+        stats = fingerprints.stats
+        print(f"\n♻️ Incremental crawl: {stats['new']} new, {stats['changed']} changed, {stats['unchanged']} unchanged pages")
+    if checkpoint:
+        checkpoint.finish()
+        checkpoint.close()
+
 
 if __name__ == '__main__':
     main()
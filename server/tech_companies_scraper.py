@@ -4,37 +4,38 @@ import json
 import random
 import pandas as pd
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 import time
 import logging
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import hashlib
+from http_client import create_session
+from stream_fetch import stream_get
+from rate_limiter import acquire as acquire_rate_limit
+from robots_cache import ensure_allowed as ensure_robots_allowed
+from webdriver_pool import WebDriverPool, looks_js_shelled
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Companies scraped in parallel by batch_scrape_companies
+BATCH_WORKERS = int(os.getenv('TECH_SCRAPER_WORKERS', '4'))
+# 'auto': plain HTTP first, headless rendering only for JS-shelled pages; 'always' / 'never' force one or the other
+RENDER_MODE = os.getenv('TECH_SCRAPER_RENDER_MODE', 'auto')
+
 class TechCompaniesScraper:
-    def __init__(self):
-        # Set up Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument('--start-maximized')
-        chrome_options.add_argument('--disable-notifications')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        # chrome_options.add_argument('--headless')  # Uncomment for headless mode
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, render_mode: str = RENDER_MODE):
+        self.render_mode = render_mode
+        # Headless drivers are started on first render and reused across pages
+        self.driver_pool = WebDriverPool()
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        self.render_stats = {'static': 0, 'rendered': 0}
+        self._stats_lock = threading.Lock()
 
     def load_tech_companies(self, json_path='tech_companies.json'):
         """
@@ -108,6 +109,41 @@ class TechCompaniesScraper:
                 return url
         return ""
 
+    def fetch_static(self, url: str) -> str:
+        """
+        Fetch a page over plain HTTP (robots.txt, per-host rate limit and byte cap applied)
+        """
+        ensure_robots_allowed(url)
+        acquire_rate_limit(url)
+        response = stream_get(self.session, url, timeout=15)
+        response.raise_for_status()
+        return response.text
+
+    def load_page(self, url: str) -> tuple:
+        """
+        Return (html, title, rendered): static HTML unless it looks JS-shelled, else the rendered DOM
+        """
+        if self.render_mode != 'always':
+            try:
+                html = self.fetch_static(url)
+            except requests.RequestException:
+                # Some sites refuse plain HTTP clients but serve a browser
+                if self.render_mode == 'never':
+                    raise
+                html = ''
+            if self.render_mode == 'never' or (html and not looks_js_shelled(html)):
+                with self._stats_lock:
+                    self.render_stats['static'] += 1
+                soup_title = BeautifulSoup(html, 'html.parser').title
+                return html, soup_title.get_text(strip=True) if soup_title else '', False
+        
+        ensure_robots_allowed(url)
+        acquire_rate_limit(url)
+        rendered_html, title = self.driver_pool.render(url)
+        with self._stats_lock:
+            self.render_stats['rendered'] += 1
+        return rendered_html, title, True
+
     def scrape_company_website(self, company_name: str, category: str, url: str) -> dict:
         """
         Scrape a specific company website category
@@ -115,65 +151,53 @@ class TechCompaniesScraper:
         try:
             logger.info(f"Scraping {category} for {company_name} at {url}")
             
-            # Use Selenium for dynamic content
-            self.driver.get(url)
-            time.sleep(3)  # Allow page to load
+            html, title, rendered = self.load_page(url)
+            soup = BeautifulSoup(html, 'html.parser')
             
             # Extract page information
             page_data = {
                 'company': company_name,
                 'category': category,
                 'url': url,
-                'title': self.driver.title,
+                'title': title,
                 'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'rendered': rendered,
                 'content': {},
                 'metadata': {}
             }
             
             # Extract main content
-            try:
-                # Look for main content areas
-                main_content = self.driver.find_element(By.TAG_NAME, 'body').text
-                page_data['content']['main_text'] = main_content[:5000]  # Limit content
-            except:
-                page_data['content']['main_text'] = "Content extraction failed"
+            links = soup.find_all('a')
+            images = soup.find_all('img')
+            for tag in soup(['script', 'style', 'noscript', 'template']):
+                tag.decompose()
+            body = soup.body or soup
+            page_data['content']['main_text'] = body.get_text('\n', strip=True)[:5000]  # Limit content
             
             # Extract links
-            try:
-                links = self.driver.find_elements(By.TAG_NAME, 'a')
-                page_data['content']['link_count'] = len(links)
-                page_data['content']['links'] = [link.get_attribute('href') for link in links[:20]]  # Limit links
-            except:
-                page_data['content']['link_count'] = 0
-                page_data['content']['links'] = []
+            page_data['content']['link_count'] = len(links)
+            page_data['content']['links'] = [urljoin(url, link['href']) for link in links if link.get('href')][:20]  # Limit links
             
             # Extract images
-            try:
-                images = self.driver.find_elements(By.TAG_NAME, 'img')
-                page_data['content']['image_count'] = len(images)
-            except:
-                page_data['content']['image_count'] = 0
+            page_data['content']['image_count'] = len(images)
             
             # Extract meta information
-            try:
-                meta_tags = self.driver.find_elements(By.TAG_NAME, 'meta')
-                for meta in meta_tags:
-                    name = meta.get_attribute('name') or meta.get_attribute('property')
-                    content = meta.get_attribute('content')
-                    if name and content:
-                        page_data['metadata'][name] = content
-            except:
-                pass
+            for meta in soup.find_all('meta'):
+                name = meta.get('name') or meta.get('property')
+                content = meta.get('content')
+                if name and content:
+                    page_data['metadata'][name] = content
             
             # Calculate content metrics
             text_content = page_data['content'].get('main_text', '')
+            page_source = html.lower()
             page_data['metrics'] = {
                 'word_count': len(text_content.split()),
                 'character_count': len(text_content),
                 'link_density': page_data['content']['link_count'] / max(len(text_content.split()), 1),
-                'has_forms': 'form' in self.driver.page_source.lower(),
-                'has_search': 'search' in self.driver.page_source.lower(),
-                'has_navigation': 'nav' in self.driver.page_source.lower()
+                'has_forms': 'form' in page_source,
+                'has_search': 'search' in page_source,
+                'has_navigation': 'nav' in page_source
             }
             
             return page_data
@@ -228,9 +252,6 @@ class TechCompaniesScraper:
                         company_data['summary']['total_words'] += category_data.get('metrics', {}).get('word_count', 0)
                         company_data['summary']['total_links'] += category_data.get('content', {}).get('link_count', 0)
                         company_data['summary']['total_images'] += category_data.get('content', {}).get('image_count', 0)
-                    
-                    # Add delay to avoid overwhelming servers
-                    time.sleep(2)
                 else:
                     company_data['categories'][category] = {
                         'company': company_name,
@@ -258,10 +279,16 @@ class TechCompaniesScraper:
             }
         }
         
+        # Companies run in parallel; politeness is per host (rate limiter), not a fixed sleep
+        with ThreadPoolExecutor(max_workers=max(1, min(BATCH_WORKERS, len(companies)))) as executor:
+            futures = {
+                company: executor.submit(self._scrape_company_logged, company, categories, max_pages)
+                for company in companies
+            }
+        
         for company in companies:
             try:
-                logger.info(f"Processing company: {company}")
-                company_data = self.scrape_company_data(company, categories, max_pages)
+                company_data = futures[company].result()
                 batch_results['companies'][company] = company_data
                 
                 # Update batch summary
@@ -273,9 +300,6 @@ class TechCompaniesScraper:
                 batch_results['summary']['total_links'] += company_data['summary']['total_links']
                 batch_results['summary']['total_images'] += company_data['summary']['total_images']
                 
-                # Add delay between companies
-                time.sleep(3)
-                
             except Exception as e:
                 logger.error(f"Error processing company {company}: {str(e)}")
                 batch_results['companies'][company] = {
@@ -286,6 +310,10 @@ class TechCompaniesScraper:
         
         return batch_results
 
+    def _scrape_company_logged(self, company: str, categories: list, max_pages: int) -> dict:
+        logger.info(f"Processing company: {company}")
+        return self.scrape_company_data(company, categories, max_pages)
+
     def scrape_by_category(self, category: str, company_limit: int = 10) -> dict:
         """
         Scrape companies from a specific category
@@ -378,8 +406,8 @@ class TechCompaniesScraper:
         """
         Clean up resources
         """
-        if self.driver:
-            self.driver.quit()
+        self.driver_pool.close()
+        logger.info(f"Pages served statically: {self.render_stats['static']}, rendered: {self.render_stats['rendered']}")
 
 def main():
     # Load environment variables
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test the concurrent scrape engine and the group/mass scrape wiring (offline)"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from concurrent_scrape_engine import ConcurrentScrapeEngine, ScrapeJob
+from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
+
+
+def test_hosts_run_in_parallel():
+    """Different hosts should overlap; wall time tracks the slowest host"""
+    print("🧪 Testing parallel hosts...")
+    engine = ConcurrentScrapeEngine(max_workers=4, per_host_delay=0.0)
+    jobs = [ScrapeJob(i, f"https://host{i}.example.com/", time.sleep, 0.2) for i in range(4)]
+
+    start = time.monotonic()
+    results = engine.run(jobs)
+    elapsed = time.monotonic() - start
+
+    assert all(ok for ok, _ in results.values())
+    assert elapsed < 0.6, f"expected parallel execution, took {elapsed:.2f}s"
+    print(f"  ✅ 4 hosts in {elapsed:.2f}s")
+
+
+def test_same_host_is_serial_and_spaced():
+    """Jobs for one host never overlap and honour the per-host delay"""
+    print("🧪 Testing per-host politeness...")
+    engine = ConcurrentScrapeEngine(max_workers=4, per_host_delay=0.1)
+    active = []
+    lock = threading.Lock()
+    starts = []
+
+    def job():
+        with lock:
+            active.append(1)
+            assert len(active) == 1, "same-host jobs overlapped"
+            starts.append(time.monotonic())
+        time.sleep(0.01)
+        with lock:
+            active.pop()
+
+    results = engine.run([ScrapeJob(i, "https://docs.example.com/p", job) for i in range(3)])
+
+    assert len(results) == 3
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(g >= 0.1 for g in gaps), gaps
+    print("  ✅ same-host jobs serialized")
+
+
+def test_failures_are_captured():
+    """A raising job is reported without aborting the batch"""
+    engine = ConcurrentScrapeEngine(max_workers=2, per_host_delay=0.0)
+
+    def boom():
+        raise ValueError("boom")
+
+    results = engine.run([ScrapeJob('bad', 'https://a.example.com', boom),
+                          ScrapeJob('good', 'https://b.example.com', lambda: 42)])
+    assert results['good'] == (True, 42)
+    assert results['bad'][0] is False and isinstance(results['bad'][1], ValueError)
+
+
+def test_batch_scrape_group_structure():
+    """Group scrape keeps the original result structure and category order"""
+    print("🧪 Testing batch_scrape_group structure...")
+    scraper = CompetitiveIntelligenceScraper()
+    scraper.scrape_engine.per_host_delay = 0.0
+
+    def fake_category(company, category, url, page_limit):
+        if category == 'rss':
+            raise RuntimeError('feed down')
+        return {'category': category, 'url': url, 'items': [{}], 'total_words': 10,
+                'total_links': 1, 'total_images': 0, 'rich_content_count': 0}
+
+    scraper._scrape_category = fake_category
+    group = scraper.create_custom_group('Test', ['Acme', 'Globex'], ['marketing', 'docs', 'rss'])
+    results = scraper.batch_scrape_group(group, page_limit=1)
+
+    assert list(results['companies']) == ['Acme', 'Globex']
+    acme = results['companies']['Acme']
+    assert list(acme['categories']) == ['marketing', 'docs', 'rss']
+    assert acme['categories']['rss'] == {'error': 'feed down', 'status': 'failed'}
+    assert acme['summary']['total_items'] == 2
+    assert results['summary']['total_words'] == 40
+    print("  ✅ structure preserved")
+
+
+def main():
+    test_hosts_run_in_parallel()
+    test_same_host_is_serial_and_spaced()
+    test_failures_are_captured()
+    test_batch_scrape_group_structure()
+    print("\n🎉 Concurrent scrape engine tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Test single-pass probing and investigation caching in CoverageGapResolver (offline)"""
+
+import sys
+import os
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+_tmp = tempfile.mkdtemp()
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(_tmp, 'http_cache.db'))
+os.environ.setdefault('COVERAGE_CACHE_PATH', os.path.join(_tmp, 'coverage.db'))
+os.environ.setdefault('SCRAPE_HOST_RATE', '1000')
+os.environ.setdefault('SCRAPE_HOST_BURST', '1000')
+os.environ.setdefault('ROBOTS_ENFORCE', '0')
+
+from coverage_gap_resolver import CoverageGapResolver, InvestigationCache
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    hits = Counter()
+
+    def do_GET(self):
+        SiteHandler.hits[self.path] += 1
+        if self.path == '/old-docs':
+            self.send_response(301)
+            self.send_header('Location', '/new-docs')
+            self.end_headers()
+            return
+        if self.path in ('/', '/docs', '/new-docs', '/robots.txt'):
+            body = b'User-agent: *\nDisallow: /private\n' if self.path == '/robots.txt' else (
+                b'<html><body>API documentation guide ' + b'x' * 200 + b'</body></html>')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_each_url_fetched_once():
+    print("🧪 Testing single-pass probing...")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    roots = [f'{base}/old-docs']
+    try:
+        resolver = CoverageGapResolver(cache=InvestigationCache(ttl=3600))
+        investigation = resolver.investigate_coverage_gaps('Acme', base, roots)
+        tested = resolver.test_fallback_urls(investigation['fallback_urls'])
+        report = resolver.generate_coverage_report('Acme', investigation)
+        first_pass = Counter(SiteHandler.hits)
+
+        # A second resolver (a later run) reuses the cached investigation without probing
+        again = CoverageGapResolver(cache=InvestigationCache(ttl=3600))
+        cached = again.investigate_coverage_gaps('Acme', base, roots)
+        again.test_fallback_urls(cached['fallback_urls'])
+    finally:
+        server.shutdown()
+
+    pages = {path: n for path, n in first_pass.items() if path != '/robots.txt'}
+    assert pages and all(n == 1 for n in pages.values()), pages
+    assert SiteHandler.hits == first_pass, SiteHandler.hits
+
+    assert investigation['url_accessibility'][roots[0]]['status_code'] == 301
+    assert investigation['url_accessibility'][roots[0]]['redirects_to'] == '/new-docs'
+    chain = investigation['redirect_chains'][roots[0]]
+    assert chain['redirect_count'] == 1 and chain['final_url'] == f'{base}/new-docs'
+    docs = next(u for u in tested if u['url'] == f'{base}/docs')
+    assert docs['accessible'] and docs['has_content'] and docs['technical_relevance'] >= 3
+    assert any(not u['accessible'] for u in tested)
+    assert 'Fallback URLs' in report
+    assert cached['url_accessibility'] == investigation['url_accessibility']
+    print(f"  ✅ {len(pages)} URLs fetched once each; cached investigation reused")
+
+
+def main():
+    test_each_url_fetched_once()
+    print("\n🎉 Coverage gap resolver tests passed!")
+
+
+if __name__ == "__main__":
+    main()
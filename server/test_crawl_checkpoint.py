@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test resumable crawl checkpoints for targeted_bi_monitor (offline)"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+os.environ.setdefault('RAW_ARCHIVE_ENABLED', '0')
+os.environ.setdefault('ROBOTS_ENFORCE', '0')
+
+from crawl_checkpoint import CrawlCheckpoint
+import targeted_bi_monitor as tbm
+
+ROOT = 'https://docs.example.com/api/'
+
+
+def fake_site(pages=12):
+    """API docs where every page links to the next one"""
+    def fetch(url, timeout=12, category='docs'):
+        n = int(url.rstrip('/').rsplit('/', 1)[1]) if url != ROOT else 0
+        link = f'<a href="{ROOT}reference/{n + 1}">api reference endpoint</a>' if n + 1 < pages else ''
+        return f"<html><title>Page {n}</title><main>api endpoint authentication sdk {link}</main></html>"
+    return fetch
+
+
+def test_company_progress_resume():
+    print("🧪 Testing run/company checkpoint resume...")
+    db = os.path.join(tempfile.mkdtemp(), 'checkpoint.db')
+    run = CrawlCheckpoint.open('nightly', db_path=db)
+    run.mark_company_started('Acme')
+    run.mark_company_done('Acme', {'docs_count': 3})
+    run.mark_company_started('Globex')
+    run.close()
+
+    resumed = CrawlCheckpoint.open('nightly', resume=True, db_path=db)
+    assert resumed.run_id == run.run_id
+    assert resumed.completed_companies() == {'Acme': {'docs_count': 3}}
+    resumed.finish()
+
+    fresh = CrawlCheckpoint.open('nightly', resume=True, db_path=db)
+    assert fresh.run_id != run.run_id and fresh.completed_companies() == {}
+    print("  ✅ finished companies are skipped on resume")
+
+
+def test_interrupted_crawl_resumes_from_frontier():
+    print("🧪 Testing interrupted docs crawl resume...")
+    db = os.path.join(tempfile.mkdtemp(), 'checkpoint.db')
+    site = fake_site()
+    fetched = []
+    original_fetch, original_dry_run = tbm.fetch, tbm.DRY_RUN
+    tbm.DRY_RUN = True
+
+    def crashing_fetch(url, **kwargs):
+        if len(fetched) == 8:
+            raise KeyboardInterrupt
+        fetched.append(url)
+        return site(url)
+
+    try:
+        run = CrawlCheckpoint.open('crawl', db_path=db)
+        tbm.fetch = crashing_fetch
+        try:
+            tbm.crawl_docs_enhanced('Acme', [{'url': ROOT, 'technical_score': 1.0}], cap=20, max_depth=20,
+                                    checkpoint=run)
+            assert False, "crawl should have been interrupted"
+        except KeyboardInterrupt:
+            pass
+
+        first_run = list(fetched)
+        fetched.clear()
+        tbm.fetch = lambda url, **kwargs: (fetched.append(url), site(url))[1]
+        resumed = CrawlCheckpoint.open('crawl', resume=True, db_path=db)
+        pages = tbm.crawl_docs_enhanced('Acme', [{'url': ROOT, 'technical_score': 1.0}], cap=20, max_depth=20,
+                                        checkpoint=resumed)
+    finally:
+        tbm.fetch, tbm.DRY_RUN = original_fetch, original_dry_run
+
+    assert len(pages) == 12
+    assert len({p['url'] for p in pages}) == 12
+    assert ROOT not in fetched, "seed page was re-fetched"
+    assert len(fetched) < 12 and len(first_run) + len(fetched) <= 12 + tbm.CHECKPOINT_EVERY
+    print(f"  ✅ resumed after {len(first_run)} pages, fetched {len(fetched)} more")
+
+    # A completed stage is served from the checkpoint without fetching
+    assert len(tbm.crawl_docs_enhanced('Acme', [], checkpoint=resumed)) == 12
+
+
+def main():
+    test_company_progress_resume()
+    test_interrupted_crawl_resumes_from_frontier()
+    print("\n🎉 Crawl checkpoint tests passed!")
+
+
+if __name__ == "__main__":
+    main()
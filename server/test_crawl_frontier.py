@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Test the heap-based crawl frontier (offline)"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_frontier import CrawlFrontier
+
+
+def info(url, score):
+    return {'url': url, 'technical_score': score, 'source': 'test'}
+
+
+def test_priority_order():
+    print("🧪 Testing frontier priority order...")
+    frontier = CrawlFrontier()
+    frontier.add(info('https://d.example.com/low', 0.1), 0)
+    frontier.add(info('https://d.example.com/deep', 0.9), 2)
+    frontier.add(info('https://d.example.com/high', 0.9), 1)
+    frontier.add(info('https://d.example.com/high', 1.0), 0)  # already seen
+
+    order = [frontier.pop()[0]['url'].rsplit('/', 1)[1] for _ in range(len(frontier))]
+    assert order == ['high', 'deep', 'low']
+    assert 'https://d.example.com/high' in frontier
+    print("  ✅ score desc, depth asc")
+
+
+def test_per_host_queues():
+    print("🧪 Testing per-host sub-queues...")
+    frontier = CrawlFrontier(per_host=True)
+    frontier.add(info('https://a.example.com/1', 0.5))
+    frontier.add(info('https://a.example.com/2', 0.8))
+    frontier.add(info('https://b.example.com/1', 0.9))
+
+    assert frontier.pop_host('a.example.com')[0]['url'].endswith('/2')
+    assert frontier.pop()[0]['url'] == 'https://b.example.com/1'
+    assert frontier.hosts() == ['a.example.com']
+    assert frontier.pop()[0]['url'] == 'https://a.example.com/1'
+    assert not frontier
+    print("  ✅ host and global pops stay consistent")
+
+
+def test_snapshot_roundtrip():
+    frontier = CrawlFrontier()
+    frontier.extend([info(f'https://d.example.com/{i}', i / 10) for i in range(5)])
+    frontier.pop()
+    restored = CrawlFrontier.restore(frontier.snapshot())
+    assert len(restored) == 4
+    assert 'https://d.example.com/4' in restored
+    assert restored.pop()[0]['url'] == 'https://d.example.com/3'
+
+
+def test_scales_to_thousands():
+    """Scheduling 20k candidates should be far below a second"""
+    frontier = CrawlFrontier()
+    start = time.monotonic()
+    frontier.extend(info(f'https://d.example.com/p{i}', (i * 7919 % 1000) / 1000) for i in range(20000))
+    while frontier:
+        frontier.pop()
+    assert time.monotonic() - start < 1.0
+
+
+def main():
+    test_priority_order()
+    test_per_host_queues()
+    test_snapshot_roundtrip()
+    test_scales_to_thousands()
+    print("\n🎉 Crawl frontier tests passed!")
+
+
+if __name__ == "__main__":
+    main()
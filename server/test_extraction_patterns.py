@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Test the precompiled extraction pattern registry (offline)"""
+
+import sys
+import os
+import re
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from extraction_patterns import (
+    AUTH_PATTERNS, CODE_STRUCTURE_PATTERN, CONTENT_TYPE_PATTERNS, ENDPOINT_URL_PATTERN, HTTP_METHOD_PATH_PATTERN,
+    RATE_LIMIT_PATTERNS, FoldedPattern, FoldedText
+)
+
+FRAGMENTS = [
+    'OAuth 2.0', 'Client_ID = abc-1', 'ACCESS_TOKEN', 'X-API-Key', 'Authorization: Bearer', 'PASSWORD=pw',
+    'Rate Limit: 100 Requests per Minute', '5000 calls per Day', 'GET /api/v1/users', 'post /V2/items',
+    'https://Api.Example.com/API/v1/Users', '$99', '10 per month', 'Getting Started', 'Docker', 'def', 'Import',
+    'naïve', '→', 'ſ', 'ı', 'İ', '\u212a', 'K', '\n', 'api', 'REST',
+]
+
+
+def all_patterns():
+    patterns = [ENDPOINT_URL_PATTERN, HTTP_METHOD_PATH_PATTERN, CODE_STRUCTURE_PATTERN] + RATE_LIMIT_PATTERNS
+    for group in list(CONTENT_TYPE_PATTERNS.values()) + list(AUTH_PATTERNS.values()):
+        patterns.extend(group)
+    return patterns
+
+
+def test_folded_matches_ignorecase():
+    print("🧪 Testing folded matching against re.IGNORECASE...")
+    rnd = random.Random(5)
+    texts = [' '.join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, 40))) for _ in range(300)]
+    for text in texts:
+        folded = FoldedText(text)
+        lowered = FoldedText(text.lower(), text.lower())
+        for pattern in all_patterns():
+            assert pattern.findall(folded) == re.findall(pattern.pattern, text, re.IGNORECASE), (pattern.pattern, text)
+            assert pattern.findall(lowered) == re.findall(pattern.pattern, text.lower(), re.IGNORECASE)
+            assert pattern.search(folded) == bool(re.search(pattern.pattern, text, re.IGNORECASE))
+    print(f"  ✅ {len(all_patterns())} patterns agree on {len(texts)} texts")
+
+
+def test_results_keep_original_case():
+    print("🧪 Testing match case and exactness fallback...")
+    text = FoldedText("Call GET /API/v1/Items with Client_ID = Abc-9")
+    assert text.exact
+    assert HTTP_METHOD_PATH_PATTERN.findall(text) == [('GET', '/API/v1/Items')]
+    assert AUTH_PATTERNS['oauth2'][1].findall(text) == ['Client_ID = Abc-9']
+    # The long s folds onto 's' case-insensitively but not when lowercased
+    assert not FoldedText("baſic authentication").exact
+    assert AUTH_PATTERNS['basic_auth'][0].findall("baſic authentication") == ['baſic authentication']
+    assert FoldedPattern(r'\S+(?P<name>ID)').lowered.pattern == r'\S+(?P<name>id)'
+    print("  ✅ original case preserved, special folds handled")
+
+
+def test_code_structure_single_scan():
+    print("🧪 Testing combined code structure scan...")
+    code = "import os\nfrom x import y\nclass A:\n    def f(self): require('z')\n# redefine classes"
+    groups = [m.lastgroup for m in CODE_STRUCTURE_PATTERN.finditer(code)]
+    assert groups.count('definitions') == len(re.findall(r'\b(def|function|class)\b', code, re.I)) == 2
+    assert groups.count('imports') == len(re.findall(r'\b(import|from|require|include)\b', code, re.I)) == 4
+    print("  ✅ one scan counts both keyword groups")
+
+
+def main():
+    test_folded_matches_ignorecase()
+    test_results_keep_original_case()
+    test_code_structure_single_scan()
+    print("\n🎉 Extraction pattern tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Test the extraction process pool (offline)"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+os.environ.setdefault('RAW_ARCHIVE_ENABLED', '0')
+os.environ.setdefault('EXTRACTION_WORKERS', '2')
+
+from multiprocessing.shared_memory import SharedMemory
+
+import competitive_intelligence_scraper as cis
+from extraction_pool import ExtractionPool, get_extraction_pool, read_body
+
+PAGE = """<html><head><title>API Reference</title></head><body><main><h1>REST API</h1>
+<p>Authenticate with OAuth 2.0 and an access_token. Limit: 100 requests per minute. Café ✓</p>
+<a href="/docs/api/v1/users">Users API</a> <a href="https://cdn.test/openapi.json">Spec</a>
+<pre class="language-python">import requests
+def list_users(): pass</pre><table><tr><th>Field</th></tr></table></main></body></html>"""
+BIG_PAGE = PAGE.replace('</main>', '<p>GET /api/v2/items</p>' * 5000 + '</main>')
+
+
+def without_timestamps(value):
+    """Extraction output minus the per-run timestamps"""
+    if isinstance(value, dict):
+        return {k: without_timestamps(v) for k, v in value.items() if not k.endswith(('_at', 'timestamp'))}
+    if isinstance(value, list):
+        return [without_timestamps(v) for v in value]
+    return value
+
+
+def test_workers_match_inline_extraction():
+    print("🧪 Testing worker extraction against inline extraction...")
+    scraper = cis.CompetitiveIntelligenceScraper()
+    pool = ExtractionPool(max_workers=2, shared_memory_threshold=64 * 1024)
+    try:
+        futures = [pool.submit(html, 'https://docs.acme.test/api', 'Acme', 'docs') for html in (PAGE, BIG_PAGE)]
+        for html, future in zip((PAGE, BIG_PAGE), futures):
+            expected = scraper._extract_page(html, 'https://docs.acme.test/api', 'Acme', 'docs')
+            assert without_timestamps(future.result()) == without_timestamps(expected)
+        assert pool.stats['submitted'] == 2 and pool.stats['shared_memory'] == 1
+    finally:
+        pool.shutdown()
+    print("  ✅ small body pickled, large body via shared memory, same results")
+
+
+def test_hand_over_and_release():
+    print("🧪 Testing body hand-over...")
+    pool = ExtractionPool(max_workers=0, shared_memory_threshold=10)
+    assert pool._hand_over('short')[0] == ('inline', 'short', 0)
+    ref, release = pool._hand_over(BIG_PAGE)
+    assert ref[0] == 'shm' and read_body(ref) == BIG_PAGE
+    release()
+    try:
+        SharedMemory(name=ref[1])
+        assert False, "shared memory block should be unlinked"
+    except FileNotFoundError:
+        pass
+    print("  ✅ shared memory read back exactly and freed")
+
+
+def test_backpressure():
+    print("🧪 Testing backpressure...")
+    pool = ExtractionPool(max_workers=1, max_pending=1)
+    try:
+        futures = [pool.submit(BIG_PAGE, 'https://docs.acme.test/api', 'Acme', 'docs') for _ in range(3)]
+        assert pool.stats['waited'] >= 1, pool.stats
+        # With one slot, each submit waited for the previous body to finish
+        assert all(f.done() for f in futures[:2])
+        assert all('content' in f.result() for f in futures)
+    finally:
+        pool.shutdown()
+    print("  ✅ submit blocks while the pool is full")
+
+
+def test_pool_recovers_from_dead_worker():
+    print("🧪 Testing recovery from a dead worker...")
+    pool = ExtractionPool(max_workers=1)
+    try:
+        assert pool.extract(PAGE, 'https://docs.acme.test/api', 'Acme', 'docs')['content']
+        futures = [pool.submit(BIG_PAGE, 'https://docs.acme.test/big', 'Acme', 'docs') for _ in range(2)]
+        # Simulate an OOM kill of the worker while bodies are in flight
+        for process in list(pool._executor._processes.values()):
+            process.kill()
+        assert all('content' in f.result(timeout=120) for f in futures)
+        assert pool.stats['rebuilt'] == 1 and pool.stats['retried'] >= 1, pool.stats
+        # Later submissions use the new pool
+        assert pool.extract(PAGE, 'https://docs.acme.test/api', 'Acme', 'docs')['content']
+    finally:
+        pool.shutdown()
+    print(f"  ✅ pool rebuilt once, {pool.stats['retried']} in-flight tasks retried")
+
+
+def test_enhanced_scraping_uses_pool():
+    print("🧪 Testing enhanced_technical_scraping through the shared pool...")
+    scraper = cis.CompetitiveIntelligenceScraper()
+    pages = {'https://docs.acme.test/api': PAGE, 'https://docs.acme.test/big': BIG_PAGE}
+
+    def fake_scrape(url, category='default', company=''):
+        if url not in pages:
+            raise ValueError(f"no page at {url}")
+        return pages[url]
+
+    scraper._scrape_url = fake_scrape
+    before = get_extraction_pool().stats['submitted']
+    results = scraper.enhanced_technical_scraping('Acme', {
+        'api_docs': 'https://docs.acme.test/api', 'missing': 'https://docs.acme.test/none',
+        'docs': 'https://docs.acme.test/big'
+    })
+    assert list(results) == ['api_docs', 'missing', 'docs']
+    assert get_extraction_pool().stats['submitted'] - before == 2
+    assert 'error' in results['missing'] and results['docs']['url'] == 'https://docs.acme.test/big'
+    assert results['api_docs']['content']['authentication_patterns']
+    assert set(results['api_docs']) == {'content', 'quality_score', 'technical_relevance', 'scraped_at', 'url'}
+    print("  ✅ results keep category order, fetch errors reported per category")
+
+
+def main():
+    test_workers_match_inline_extraction()
+    test_hand_over_and_release()
+    test_backpressure()
+    test_pool_recovers_from_dead_worker()
+    test_enhanced_scraping_uses_pool()
+    print("\n🎉 Extraction pool tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test concurrent RSS feed probing and the feed probe cache (offline)"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+os.environ.setdefault('FEED_PROBE_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'feed_probe_cache.db'))
+
+import feed_probe_cache
+import rss_batch_scrape_and_insights as rss
+
+BASE = 'https://acme.example.com/'
+FEEDS = {BASE + 'rss.xml', BASE + 'blog/feed'}
+
+
+class FakeProber:
+    """Slow HEAD probes: FEEDS are feeds, everything else 404s"""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url, stop=None):
+        with self.lock:
+            self.calls.append(url)
+        time.sleep(self.delay)
+        return url in FEEDS
+
+
+def with_fakes(prober, html=''):
+    original = rss.probe_feed_path, rss.fetch_html, feed_probe_cache._shared_cache
+    rss.probe_feed_path, rss.fetch_html = prober, (lambda url: html)
+    feed_probe_cache._shared_cache = feed_probe_cache.FeedProbeCache(
+        os.path.join(tempfile.mkdtemp(), 'probes.db'))
+    return original
+
+
+def restore(original):
+    rss.probe_feed_path, rss.fetch_html, feed_probe_cache._shared_cache = original
+
+
+def test_probes_run_concurrently_and_short_circuit():
+    print("🧪 Testing concurrent probes...")
+    prober = FakeProber()
+    original = with_fakes(prober)
+    try:
+        start = time.monotonic()
+        paths = [BASE + p for p in rss.COMMON_FEED_PATHS]
+        feeds = rss.probe_feed_paths(paths, target=len(paths))
+        elapsed = time.monotonic() - start
+        assert feeds == [BASE + 'rss.xml', BASE + 'blog/feed']
+        assert elapsed < 0.2 * len(paths) / 2, f"probes look sequential ({elapsed:.2f}s)"
+
+        # Second run: every path is known, nothing is probed
+        prober.calls.clear()
+        assert rss.probe_feed_paths(paths, target=len(paths)) == feeds
+        assert prober.calls == []
+    finally:
+        restore(original)
+    print(f"  ✅ {len(paths)} probes in {elapsed:.2f}s, cached afterwards")
+
+
+def test_stops_once_target_reached():
+    prober = FakeProber(delay=0.05)
+    original = with_fakes(prober)
+    rss.RSS_PROBE_WORKERS, workers = 1, rss.RSS_PROBE_WORKERS
+    try:
+        feeds = rss.probe_feed_paths([BASE + p for p in rss.COMMON_FEED_PATHS], target=1)
+    finally:
+        rss.RSS_PROBE_WORKERS = workers
+        restore(original)
+    assert feeds == [BASE + 'rss.xml']
+    assert len(prober.calls) <= 5, prober.calls
+
+
+def test_advertised_feed_skips_path_probes():
+    print("🧪 Testing <link rel=alternate> short-circuit...")
+    prober = FakeProber()
+    html = '<html><head><link rel="alternate" type="application/rss+xml" href="/updates.xml"></head></html>'
+    original = with_fakes(prober, html)
+    try:
+        feeds = rss.discover_rss_feeds([BASE])
+    finally:
+        restore(original)
+    assert feeds == [BASE + 'updates.xml']
+    assert prober.calls == []
+    print("  ✅ no path probes when the page advertises a feed")
+
+
+def main():
+    test_probes_run_concurrently_and_short_circuit()
+    test_stops_once_target_reached()
+    test_advertised_feed_skips_path_probes()
+    print("\n🎉 Feed discovery tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""Test that the lxml parser backend extracts exactly what html.parser does (offline)"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from bs4 import BeautifulSoup
+
+import lxml_soup
+import parsed_document
+import competitive_intelligence_scraper as cis
+import hardcoded_competitor_scraper as hcs
+import targeted_bi_monitor as tbm
+import unified_competitive_monitor as ucm
+from parsed_document import ParsedDocument
+
+SECTION = """<section class="doc" id="s{i}"><h2>Authentication {i}</h2>
+<p>Use the <a href="/docs/api/v1/auth#{i}" title="Auth">OAuth 2.0 flow</a> to get an <code>access_token</code>.
+Requests are limited to 100 requests per minute&nbsp;&mdash; see <a href="https://status.acme.test/?a=1&amp;b={i}">status</a>.</p>
+<div class="highlight"><pre class="language-python"><code><span class="k">import</span> requests
+<span class="k">def</span> <span class="nf">get_token</span>(client_id):
+    <span class="k">return</span> requests.post(&quot;https://api.acme.test/oauth/token&quot;, data={{&#39;id&#39;: client_id}})
+</code></pre></div>
+<table class="params"><thead><tr><th>Name</th><th>Type</th></tr></thead>
+<tbody><tr><td><code>client_id</code></td><td>string &amp; id</td></tr><tr><td>scope</td><td>   </td></tr></tbody></table>
+<!-- endpoint {i} -->
+<ul><li><a href="/docs/sdk/python" rel="nofollow noopener">Python SDK</a></li><li><a href="https://github.com/acme/sdk">GitHub</a></li></ul>
+</section>
+"""
+
+DOCS_PAGE = ("""<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Acme API Reference</title>
+<meta name="description" content="Acme REST API"><meta property="og:title" content="Acme API">
+<meta name="twitter:card" content="summary"><meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">
+<link rel="stylesheet" href="/s.css"><script defer src="/app.js"></script>
+<script type="application/ld+json">{"@type": "WebPage", "name": "Acme"}</script>
+<style>pre > code { color: #333 }</style></head>
+<body><nav><a href="/">Home</a> <svg viewBox="0 0 8 8"><path d="M0 0h8"/></svg></nav><main>"""
+             + ''.join(SECTION.format(i=i) for i in range(30))
+             + """<form action="/search"><input type="checkbox" checked name="q"><button disabled>Go</button></form>
+<iframe src="https://video.acme.test/embed" allowfullscreen></iframe>
+<textarea>
+ keep  this</textarea></main><footer>&copy; 2024 Acme</footer>
+<script>window.ready = 1 < 2 && true;</script></body></html>
+""")
+
+FRAGMENT = """<div class="card"><h3>Webhooks</h3><p>POST /v2/hooks with an <b>API key</b>.</p>
+<pre><code class="language-bash">curl -H "X-API-Key: $KEY" https://api.acme.test/v2/hooks</code></pre><img src="hook.png" alt=""></div>
+"""
+
+# Pages libxml2 builds differently from html.parser: they must fall back and still match
+DIVERGENT = [
+    '<p>open paragraph<div>block</div></p>',
+    '<a href="/1">one<a href="/2">two</a></a>',
+    '<ul><li>one<li>two</ul>',
+    '<table><tr><td>1<td>2</table>',
+    '<p>legacy &copy 2024 and &notit;</p>',
+    '<a href="/x?a=1&region=eu">region</a>',
+    '<div a="1" a="2">duplicate</div>',
+    '<form><form>nested</form></form>',
+    'text before <html><body>body</body></html> after',
+    '<p>\r\nwindows</p>',
+    '<dl><dt>term<dd>definition</dl>',
+    '<title><b>bold</b></title>',
+    '<p>split</li>text</p>',
+    '<![CDATA[x]]><p>y</p>',
+    '<p>a&b',
+    '<p>x &copy',
+    '<p>x</p><!DOCTYPE html>',
+]
+
+# Pages both parsers agree on once lxml_soup restores what libxml2 drops
+PARITY = [
+    ' <br><p>hi</p>',
+    '\n<p>a&b</p>\n',
+    '<!DOCTYPE html>\n<html><body><p>R&amp;D &#169; 2024</p></body></html>\n',
+    '<!-- build 7 --><!doctype html><html><body>x</body></html>\n<!-- end -->',
+]
+
+
+def page_corpus():
+    pages = [DOCS_PAGE, FRAGMENT, DOCS_PAGE.replace('\n', '\r\n')]
+    sample = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reddit_sample.html')
+    if os.path.exists(sample):
+        with open(sample, encoding='utf-8', errors='replace') as f:
+            pages.append(f.read())
+    return pages + PARITY + DIVERGENT
+
+
+def tree_views(root):
+    """Everything the extractors read from a tree"""
+    views = [str(root), root.get_text(), root.get_text(' ', strip=True), root.string]
+    for tag in root.find_all():
+        views.append((tag.name, str(tag), tag.attrs, tag.get_text(), tag.get_text('|', strip=True), tag.string,
+                      tag.get('class', []), [child.name for child in tag.find_all(recursive=False)]))
+    views.append([str(meta) for meta in root.find_all('meta', attrs={'property': lambda x: x and x.startswith('og:')})])
+    views.append([script.string for script in root.find_all('script', type='application/ld+json')])
+    views.append([str(cell) for table in root.find_all('table') for cell in table.find_all('td', limit=1)])
+    return views
+
+
+def document_views(doc):
+    return [doc.text, doc.spaced_text, doc.main_text, doc.title] + [
+        [str(tag) for tag in tags] for tags in (doc.links, doc.code_blocks, doc.tables, doc.images, doc.scripts)
+    ]
+
+
+def without_timestamps(value):
+    if isinstance(value, dict):
+        return {k: without_timestamps(v) for k, v in value.items() if not k.endswith('_at') and k != 'extraction_timestamp'}
+    if isinstance(value, list):
+        return [without_timestamps(v) for v in value]
+    return value
+
+
+def test_documents_identical():
+    print("🧪 Testing document views on both backends...")
+    used = []
+    for html in page_corpus():
+        fast = ParsedDocument(html, 'https://docs.acme.test/api', backend='lxml')
+        reference = ParsedDocument(html, 'https://docs.acme.test/api', backend='html.parser')
+        assert reference.backend == 'html.parser'
+        assert document_views(fast) == document_views(reference), html[:80]
+        assert tree_views(fast.soup) == tree_views(reference.soup), html[:80]
+        used.append(fast.backend)
+    assert used[:2] == ['lxml', 'lxml'] and used[2] == 'html.parser'
+    print(f"  ✅ {len(used)} pages identical ({used.count('lxml')} parsed by lxml)")
+
+
+def test_divergent_pages_fall_back():
+    print("🧪 Testing fallback on markup the parsers repair differently...")
+    for html in DIVERGENT:
+        assert lxml_soup.parse(html) is None, html
+    assert lxml_soup.parse(FRAGMENT) is not None
+    for html in PARITY:
+        assert lxml_soup.parse(html) is not None, html
+    # Common repairs are caught by the source scan, before libxml2 parses the page
+    for html in (DOCS_PAGE.replace('</li>', '', 1), DOCS_PAGE.replace('</body>', '&nbsp x</body>'),
+                 DOCS_PAGE.replace('\n', '\r\n')):
+        assert lxml_soup.html_parser_shape(html) is None
+
+    before = dict(parsed_document.BACKEND_STATS)
+    for html in [FRAGMENT] + DIVERGENT:
+        ParsedDocument(html, backend='lxml')
+    ParsedDocument(FRAGMENT, backend='html.parser')
+    assert parsed_document.BACKEND_STATS == {'lxml': before['lxml'] + 1,
+                                             'fallback': before['fallback'] + len(DIVERGENT)}
+    print(f"  ✅ {len(DIVERGENT)} divergent pages parsed with html.parser")
+
+
+def test_extractors_identical():
+    print("🧪 Testing extractors on both backends...")
+    scraper = cis.CompetitiveIntelligenceScraper()
+    hardcoded = hcs.HardcodedCompetitorScraper.__new__(hcs.HardcodedCompetitorScraper)
+    url = 'https://docs.acme.test/api'
+    original_backend, original_fetch = parsed_document.HTML_PARSER_BACKEND, ucm.fetch
+    ucm.fetch = lambda page_url, *args, **kwargs: current_page
+    try:
+        for current_page in page_corpus():
+            results = {}
+            for backend in parsed_document.HTML_PARSER_BACKENDS:
+                parsed_document.HTML_PARSER_BACKEND = backend
+                doc = ParsedDocument(current_page, url)
+                results[backend] = [
+                    without_timestamps(scraper._extract_technical_content(doc, 'Acme')),
+                    tbm.extract_links(url, doc),
+                    tbm.extract_technical_links(url, doc),
+                    tbm.analyze_doc_page(url, doc, 'Acme'),
+                    ucm.scrape_doc_page('Acme', url),
+                    hardcoded.extract_text_content(ParsedDocument(current_page, url).soup),
+                ]
+            assert results['lxml'] == results['html.parser'], current_page[:80]
+            # Same text as the previous decompose-then-get_text implementation
+            soup = BeautifulSoup(current_page, 'html.parser')
+            for tag in soup(['script', 'style']):
+                tag.decompose()
+            lines = (line.strip() for line in soup.get_text().splitlines())
+            expected = ' '.join(c for c in (p.strip() for line in lines for p in line.split('  ')) if c)
+            assert results['lxml'][-1] == expected
+    finally:
+        parsed_document.HTML_PARSER_BACKEND, ucm.fetch = original_backend, original_fetch
+    print("  ✅ technical content, links, doc pages and page text identical")
+
+
+TAGS = ['div', 'p', 'span', 'a', 'b', 'ul', 'li', 'table', 'tr', 'td', 'pre', 'code', 'script', 'style', 'br', 'img',
+        'h1', 'template', 'textarea', 'title', 'form', 'input', 'meta', 'select', 'option', 'noscript', 'svg', 'path',
+        'head', 'body', 'html', 'main', 'article', 'rt']
+ATTRS = ['class="a b"', 'class=""', 'href="/x?a=1&amp;b=2"', 'href=/y', 'title="t \'q\'"', "data-x='say \"hi\"'",
+         'type="application/ld+json"', 'property="og:title"', 'charset="latin1"', 'disabled', 'hidden', 'defer',
+         'rel="nofollow noopener"', 'xml:lang="en"', 'viewBox="0 0 1 1"']
+TEXTS = ['hello', '  ', '\n', ' x ', 'a &amp; b', '&lt;tag&gt;', '&copy;', '&nbsp;', '&#169;', '&notit;', '&foo',
+         'é', '<!-- c -->', '>', '\t', '<p/>', '<br></br>', '<a href=x/>', '<P>up</P>', '<p>a<p>b', '&#32;',
+         '<SCRIPT>if (a</b) x()</SCRIPT>', '<pre>\ncode</pre>', '<title>In &amp; body</title>']
+
+
+def random_markup(rnd, depth=0):
+    parts = []
+    for _ in range(rnd.randint(0, 5)):
+        roll = rnd.random()
+        if roll < 0.4 or depth > 4:
+            parts.append(rnd.choice(TEXTS))
+        elif roll < 0.5:
+            parts.append(f'</{rnd.choice(TAGS)}>')
+        else:
+            tag = rnd.choice(TAGS)
+            attrs = ''.join(' ' + rnd.choice(ATTRS) for _ in range(rnd.randint(0, 2)))
+            if tag in ('script', 'style'):
+                parts.append(f'<{tag}{attrs}>{rnd.choice(["var a = 1 < 2;", "{}", "  "])}</{tag}>')
+            elif tag in ('br', 'img', 'input', 'meta'):
+                parts.append(f'<{tag}{attrs}{rnd.choice(["", "/", " /"])}>')
+            else:
+                closing = f'</{tag}>' if rnd.random() < 0.85 else ''
+                parts.append(f'<{tag}{attrs}>{random_markup(rnd, depth + 1)}{closing}')
+    return ''.join(parts)
+
+
+def test_random_markup_parity():
+    print("🧪 Testing random markup on both backends...")
+    rnd = random.Random(25)
+    parsed = 0
+    for _ in range(1500):
+        html = random_markup(rnd)
+        if rnd.random() < 0.3:
+            html = f'<!DOCTYPE html>\n<html><head><title>T</title></head>\n<body>{html}</body></html>\n'
+        tree = lxml_soup.parse(html)
+        if tree is None:
+            continue
+        parsed += 1
+        assert tree_views(tree) == tree_views(BeautifulSoup(html, 'html.parser')), html
+    assert parsed > 300, parsed
+    print(f"  ✅ {parsed} random pages parsed by lxml with identical views")
+
+
+def test_parse_speed():
+    print("🧪 Timing both backends on the docs page...")
+
+    def best(backend):
+        times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            ParsedDocument(DOCS_PAGE, backend=backend)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    reference, fast = best('html.parser'), best('lxml')
+    assert fast < reference
+    print(f"  ✅ html.parser {reference * 1000:.1f} ms, lxml {fast * 1000:.1f} ms ({reference / fast:.1f}x)")
+
+
+def main():
+    test_documents_identical()
+    test_divergent_pages_fall_back()
+    test_extractors_identical()
+    test_random_markup_parity()
+    test_parse_speed()
+    print("\n🎉 HTML backend tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test the conditional-GET HTTP cache against a fake session (offline)"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from http_cache import HTTPCache
+
+
+class FakeSession:
+    """Serves one page with an ETag and answers 304 when it is presented"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append(dict(headers or {}))
+        response = requests.Response()
+        response.url = url
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            response.status_code = 304
+            response._content = b''
+            response.headers = CaseInsensitiveDict()
+        else:
+            response.status_code = 200
+            response._content = b'<html>docs</html>'
+            response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8', 'ETag': '"v1"'})
+        return response
+
+
+def make_cache(ttl_policy=None):
+    path = os.path.join(tempfile.mkdtemp(), 'cache.db')
+    return HTTPCache(path, ttl_policy=ttl_policy)
+
+
+def test_fresh_hit_skips_network():
+    print("🧪 Testing fresh cache hits...")
+    cache = make_cache()
+    session = FakeSession()
+    first = cache.get(session, 'https://docs.example.com/a', category='docs')
+    second = cache.get(session, 'https://docs.example.com/a', category='docs')
+    assert len(session.calls) == 1
+    assert second.from_cache and second.text == first.text == '<html>docs</html>'
+    assert 'text/html' in second.headers['content-type']
+    print("  ✅ fresh hit served from cache")
+
+
+def test_stale_entry_revalidates_with_304():
+    print("🧪 Testing conditional revalidation...")
+    cache = make_cache({'docs': 0})
+    session = FakeSession()
+    calls_before_request = []
+    cache.get(session, 'https://docs.example.com/a', category='docs')
+    response = cache.get(session, 'https://docs.example.com/a', category='docs',
+                         before_request=lambda: calls_before_request.append(1))
+    assert session.calls[1]['If-None-Match'] == '"v1"'
+    assert response.status_code == 200 and response.from_cache
+    assert response.content == b'<html>docs</html>'
+    assert calls_before_request == [1]
+    assert cache.stats['revalidated'] == 1
+    print("  ✅ 304 served from stored body")
+
+
+def test_ttl_policy_matching():
+    cache = make_cache()
+    assert cache.ttl_for('api_docs') == cache.ttl_policy['docs']
+    assert cache.ttl_for('pricing_pages') == cache.ttl_policy['pricing']
+    assert cache.ttl_for('something_else') == cache.ttl_policy['default']
+
+
+def test_scraper_takes_tokens_per_network_attempt():
+    print("🧪 Testing rate-limit tokens on cache hits...")
+    import competitive_intelligence_scraper as cis
+    scraper = cis.CompetitiveIntelligenceScraper()
+    scraper.http_cache, scraper.session = make_cache(), FakeSession()
+    tokens = []
+    original = cis.acquire_rate_limit, cis.ensure_robots_allowed
+    cis.acquire_rate_limit = lambda url, rate=None: tokens.append(url)
+    cis.ensure_robots_allowed = lambda url: None
+    try:
+        for _ in range(3):
+            assert scraper._scrape_url('https://docs.example.com/a', 'docs') == '<html>docs</html>'
+    finally:
+        cis.acquire_rate_limit, cis.ensure_robots_allowed = original
+    assert tokens == ['https://docs.example.com/a']
+    print("  ✅ fresh hits take no token")
+
+
+def main():
+    test_fresh_hit_skips_network()
+    test_stale_entry_revalidates_with_304()
+    test_ttl_policy_matching()
+    test_scraper_takes_tokens_per_network_attempt()
+    print("\n🎉 HTTP cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
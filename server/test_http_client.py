@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test the pooled HTTP client layer against a local server (offline)"""
+
+import sys
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import http_client
+from http_client import create_session, get_session
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):
+        KeepAliveHandler.connections.add(self.client_address)
+        body = self.headers.get('Accept-Encoding', '').encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_sessions_share_keepalive_pools():
+    print("🧪 Testing shared keep-alive pools...")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+    try:
+        first = create_session({'User-Agent': 'first'})
+        second = create_session({'User-Agent': 'second'})
+        bodies = [s.get(url, timeout=5).text for s in (first, second, get_session(), first)]
+    finally:
+        server.shutdown()
+
+    assert len(KeepAliveHandler.connections) == 1, KeepAliveHandler.connections
+    assert first.headers['User-Agent'] == 'first' and second.headers['User-Agent'] == 'second'
+    assert 'gzip' in bodies[0]
+    print(f"  ✅ 4 requests over {len(KeepAliveHandler.connections)} connection")
+
+
+def test_dns_cache_scoped_to_sessions():
+    print("🧪 Testing the session DNS cache...")
+    original = socket.getaddrinfo
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://localhost:{server.server_address[1]}/'
+    calls = []
+    http_client.dns_cache.clear()
+    socket.getaddrinfo = lambda *a, **kw: calls.append(a[0]) or original(*a, **kw)
+    try:
+        for _ in range(3):
+            # A fresh connection per request, so every request connects again
+            assert create_session({'Connection': 'close'}).get(url, timeout=5).status_code == 200
+    finally:
+        socket.getaddrinfo = original
+        server.shutdown()
+    assert calls.count('localhost') == 1, calls
+    print("  ✅ one lookup for three connections")
+
+
+def test_dns_cache_is_bounded():
+    cache = http_client.DNSCache(ttl=60, max_entries=2)
+    for port in (80, 81, 82):
+        cache.addresses('localhost', port)
+    assert len(cache) == 2
+
+
+def main():
+    test_sessions_share_keepalive_pools()
+    test_dns_cache_scoped_to_sessions()
+    test_dns_cache_is_bounded()
+    print("\n🎉 HTTP client tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test the keyword taxonomy matcher and the scorers built on it (offline)"""
+
+import sys
+import os
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from keyword_matcher import KeywordTaxonomy
+from dynamic_bulk_scraper import ContentAnalyzer
+from hardcoded_competitor_scraper import HardcodedCompetitorScraper
+
+CATEGORIES = {
+    'api': ['api', 'api version', 'endpoint', 'rest'],
+    'ai': ['ai', 'machine learning', 'ml'],
+    'shared': ['api', 'sdk', 'api'],
+}
+
+
+def brute_offsets(text, keyword):
+    return [i for i in range(len(text)) if text.startswith(keyword, i)]
+
+
+def test_matches_substring_semantics():
+    print("🧪 Testing substring semantics...")
+    taxonomy = KeywordTaxonomy(CATEGORIES)
+    text = "The REST API Version 2 (see the api versions page) said: ML-based SDK"
+    hits = taxonomy.scan(text)
+    lower = text.lower()
+
+    for category, keywords in CATEGORIES.items():
+        assert hits.count(category) == sum(1 for k in keywords if k in lower), category
+        assert hits.any(category) == any(k in lower for k in keywords)
+    # 'ai' inside 'said' counts, as with ``in``; repeated list entries count twice
+    assert 'ai' in hits and 'AI' in hits
+    assert hits.present('shared') == ['api', 'sdk', 'api']
+    assert 'endpoint' not in hits and hits.count('api') == 3
+    print("  ✅ counts and presence match `keyword in text`")
+
+
+def test_offsets_overlap_and_prefixes():
+    print("🧪 Testing occurrence offsets...")
+    taxonomy = KeywordTaxonomy({'x': ['aa', 'aaa', 'ab', 'b'], 'y': ['api', 'api version', 'pi']})
+    rnd = random.Random(3)
+    texts = ["aaaab api version api", "api versionapi"] + [
+        ''.join(rnd.choice('ab pi') for _ in range(200)) for _ in range(50)
+    ]
+    for text in texts:
+        hits = taxonomy.scan(text)
+        for keywords in taxonomy.categories.values():
+            for keyword in keywords:
+                assert hits.offsets.get(keyword, []) == brute_offsets(text, keyword), (text, keyword)
+    hits = taxonomy.scan("api version api")
+    assert hits.category_offsets('y') == [0, 0, 1, 12, 13]
+    assert hits.occurrences('y') == 5
+    print("  ✅ overlapping and prefix occurrences all located")
+
+
+def test_case_sensitive_taxonomy():
+    print("🧪 Testing case-sensitive taxonomies...")
+    methods = KeywordTaxonomy({'methods': ['GET', 'POST', 'PUT']}, case_sensitive=True)
+    hits = methods.scan("get /items then POST /items")
+    assert hits.present('methods') == ['POST'] and 'GET' not in hits
+    assert KeywordTaxonomy({}).scan("anything").counts() == {}
+    print("  ✅ case preserved when requested")
+
+
+def test_scorers_use_shared_taxonomies():
+    print("🧪 Testing scorers built on the matcher...")
+    review = "Column-level lineage and provenance tracking show the impact of every dependency change."
+    analyzer = ContentAnalyzer()
+    single = analyzer.analyze_content_relevance(review, 'lineage')
+    assert single == analyzer.analyze_all_dimensions(review)['lineage']
+    assert single['keyword_matches'] == 5 and single['total_keywords'] == 8
+    assert analyzer.analyze_content_relevance(review, 'unknown') == {'relevance_score': 0.0, 'confidence': 0.0}
+
+    scores = HardcodedCompetitorScraper().score_strategic_dimensions("Our REST API and SDK docs; Kubernetes scaling")
+    assert scores['api_first_architecture']['score'] == 30
+    assert scores['cloud_native_features']['score'] == 20
+    assert scores['developer_experience']['score'] == 10
+    print("  ✅ dimension scorers agree with the single-dimension path")
+
+
+def main():
+    test_matches_substring_semantics()
+    test_offsets_overlap_and_prefixes()
+    test_case_sensitive_taxonomy()
+    test_scorers_use_shared_taxonomies()
+    print("\n🎉 Keyword matcher tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Test incremental re-crawls with page fingerprints (offline)"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+os.environ.setdefault('RAW_ARCHIVE_ENABLED', '0')
+os.environ.setdefault('ROBOTS_ENFORCE', '0')
+
+from page_fingerprints import PageFingerprints, content_fingerprint
+import store_scrape_to_sqlite as store
+import targeted_bi_monitor as tbm
+
+ROOT = 'https://docs.example.com/api/'
+
+
+def test_fingerprint_ignores_volatile_markup():
+    a = '<html><script>nonce=1</script><main>api  endpoint</main><!-- build 1 --></html>'
+    b = '<html><script>nonce=2</script><main>api endpoint</main><!-- build 2 --></html>'
+    assert content_fingerprint(a) == content_fingerprint(b)
+    assert content_fingerprint(a) != content_fingerprint(a.replace('endpoint', 'webhook'))
+
+
+def test_incremental_crawl_skips_unchanged_pages():
+    print("🧪 Testing incremental docs crawl...")
+    pages = {
+        ROOT: f'<title>Root</title><main>api endpoint <a href="{ROOT}auth">api authentication</a></main>',
+        ROOT + 'auth': '<title>Auth</title><main>oauth token authentication api</main>',
+    }
+    fetched, analyzed = [], []
+    original = tbm.fetch, tbm.analyze_doc_page, tbm.DRY_RUN
+    tbm.fetch = lambda url, **kw: (fetched.append(url), pages.get(url, ''))[1]
+    tbm.analyze_doc_page = lambda url, html, company: (analyzed.append(url), original[1](url, html, company))[1]
+    tbm.DRY_RUN = True
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(store.SCHEMA_SQL)
+    fingerprints = PageFingerprints(conn)
+    roots = [{'url': ROOT, 'technical_score': 1.0, 'lastmod': '2024-06-01'}]
+
+    def crawl():
+        results = tbm.crawl_docs_enhanced('Acme', roots, fingerprints=fingerprints)
+        tbm.store_doc_pages(conn, 'Acme', results, fingerprints)
+        return results
+
+    try:
+        first = crawl()
+        assert {p['change'] for p in first} == {'new'} and len(analyzed) == 2
+
+        fetched.clear(), analyzed.clear()
+        second = crawl()
+        assert {p['change'] for p in second} == {'unchanged'}
+        assert analyzed == [] and fetched == [ROOT + 'auth'], "lastmod match should skip the fetch"
+
+        pages[ROOT + 'auth'] = pages[ROOT + 'auth'].replace('token', 'webhook')
+        analyzed.clear()
+        third = {p['url']: p for p in crawl()}
+        assert third[ROOT + 'auth']['change'] == 'updated' and analyzed == [ROOT + 'auth']
+        assert 'webhook' in third[ROOT + 'auth']['content']
+        stored = conn.execute("SELECT text_content FROM scraped_items WHERE url = ?", (ROOT + 'auth',)).fetchone()
+        assert 'webhook' in stored[0]
+    finally:
+        tbm.fetch, tbm.analyze_doc_page, tbm.DRY_RUN = original
+
+    assert fingerprints.stats == {'new': 2, 'changed': 1, 'unchanged': 3}
+    print("  ✅ only changed pages were parsed and scored")
+
+
+def test_unstored_pages_are_not_fingerprinted():
+    """A crash between the crawl and the database write must not leave pages marked unchanged"""
+    print("🧪 Testing crash before the page rows are stored...")
+    page = '<title>Root</title><main>api endpoint authentication</main>'
+    original = tbm.fetch, tbm.DRY_RUN
+    tbm.fetch = lambda url, **kw: page if url == ROOT else ''
+    tbm.DRY_RUN = True
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(store.SCHEMA_SQL)
+    roots = [{'url': ROOT, 'technical_score': 1.0}]
+    try:
+        # First run dies before store_doc_pages; the next process starts with a fresh store object
+        tbm.crawl_docs_enhanced('Acme', roots, fingerprints=PageFingerprints(conn))
+        fingerprints = PageFingerprints(conn)
+        rerun = tbm.crawl_docs_enhanced('Acme', roots, fingerprints=fingerprints)
+        assert [p['change'] for p in rerun] == ['new']
+        tbm.store_doc_pages(conn, 'Acme', rerun, fingerprints)
+        assert conn.execute("SELECT COUNT(*) FROM scraped_items").fetchone()[0] == 1
+        assert [p['change'] for p in tbm.crawl_docs_enhanced('Acme', roots, fingerprints=fingerprints)] == ['unchanged']
+    finally:
+        tbm.fetch, tbm.DRY_RUN = original
+    print("  ✅ unstored page processed again and stored")
+
+
+def test_update_item_replaces_content():
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(store.SCHEMA_SQL)
+    item_id = store.insert_item(conn, 'Acme', 'docs', ROOT, {'text_content': 'old', 'links': [{'url': 'a'}]},
+                                0.0, 1.0, '2024-01-01')
+    store.update_item(conn, item_id, {'text_content': 'new'}, 0.0, 1.0, '2024-02-01')
+    assert conn.execute("SELECT text_content, scraped_at FROM scraped_items").fetchall() == [('new', '2024-02-01')]
+    assert conn.execute("SELECT COUNT(*) FROM item_links").fetchone()[0] == 0
+
+
+def main():
+    test_fingerprint_ignores_volatile_markup()
+    test_incremental_crawl_skips_unchanged_pages()
+    test_unstored_pages_are_not_fingerprinted()
+    test_update_item_replaces_content()
+    print("\n🎉 Page fingerprint tests passed!")
+
+
+if __name__ == "__main__":
+    main()
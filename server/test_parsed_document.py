@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test the parse-once document model and its use by the extractors (offline)"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+import bs4
+import parsed_document
+import competitive_intelligence_scraper as cis
+import targeted_bi_monitor as tbm
+from parsed_document import ParsedDocument
+
+PAGE = """<html><head><title>API Reference</title>
+<script>window.spec = {"openapi": "3.0.0"}</script></head>
+<body><nav>Home</nav><main><h1>REST API</h1>
+<p>Authenticate with OAuth 2.0 and an access_token. Limit: 100 requests per minute.</p>
+<a href="/docs/api/v1/users">Users API</a> <a href="https://cdn.test/openapi.json">Spec</a> <a>no href</a>
+<pre class="language-python">import requests
+def list_users(): pass</pre><table><tr><th>Field</th></tr></table><img src="x.png"></main></body></html>"""
+
+
+class CountingSoup(bs4.BeautifulSoup):
+    parses = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSoup.parses += 1
+        super().__init__(*args, **kwargs)
+
+
+def test_document_views():
+    print("🧪 Testing document views...")
+    doc = ParsedDocument(PAGE, 'https://docs.acme.test/api')
+    assert doc.title == 'API Reference'
+    assert doc.main_text.startswith('REST API') and 'Home' not in doc.main_text
+    assert doc.text_lower == doc.text.lower() and 'oauth 2.0' in doc.text_lower
+    assert [a['href'] for a in doc.links] == ['/docs/api/v1/users', 'https://cdn.test/openapi.json']
+    assert len(doc.code_blocks) == 1 and len(doc.tables) == 1 and len(doc.images) == 1
+
+    text = ParsedDocument.from_text('GET /api/v1 with an SDK')
+    assert text.soup is None and text.text_lower == 'get /api/v1 with an sdk' and text.links == []
+    print("  ✅ text, links and blocks derived from one tree")
+
+
+def test_extractors_parse_once():
+    print("🧪 Testing that extraction parses each page once...")
+    original = parsed_document.BeautifulSoup, cis.BeautifulSoup, tbm.BeautifulSoup
+    parsed_document.BeautifulSoup = cis.BeautifulSoup = tbm.BeautifulSoup = CountingSoup
+    try:
+        scraper = cis.CompetitiveIntelligenceScraper()
+        CountingSoup.parses = 0
+        extracted = scraper._extract_technical_content(PAGE, 'Acme')
+        assert CountingSoup.parses == 1, CountingSoup.parses
+        assert extracted['openapi_specs'] and extracted['text_content'].startswith('API Reference')
+
+        CountingSoup.parses = 0
+        doc = ParsedDocument(PAGE, 'https://docs.acme.test/api')
+        page = tbm.analyze_doc_page(doc.url, doc, 'Acme')
+        links = tbm.extract_technical_links(doc.url, doc)
+        assert CountingSoup.parses == 1, CountingSoup.parses
+        assert page['title'] == 'API Reference' and links[0]['url'] == 'https://docs.acme.test/docs/api/v1/users'
+
+        CountingSoup.parses = 0
+        item = scraper._process_content_item({'content': 'x', 'content_html': PAGE}, 'Acme', 'docs')
+        assert CountingSoup.parses == 1 and item['link_count'] == 2 and item['image_count'] == 1
+    finally:
+        parsed_document.BeautifulSoup, cis.BeautifulSoup, tbm.BeautifulSoup = original
+    print("  ✅ one parse per page across extractors and scorers")
+
+
+def main():
+    test_document_views()
+    test_extractors_parse_once()
+    print("\n🎉 Parsed document tests passed!")
+
+
+if __name__ == "__main__":
+    main()
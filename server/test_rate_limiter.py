@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Test the shared per-host token-bucket rate limiter (offline)"""
+
+import sys
+import os
+import tempfile
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from rate_limiter import HostRateLimiter, TokenBucket
+
+
+def test_bucket_spacing():
+    """A 10 req/s bucket with no burst spaces calls 0.1s apart"""
+    print("🧪 Testing token bucket spacing...")
+    bucket = TokenBucket(rate=10.0, capacity=1)
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays[0] == 0.0
+    assert 0.09 <= delays[1] <= 0.11
+    assert 0.19 <= delays[2] <= 0.21
+    print("  ✅ reservations queue up correctly")
+
+
+def test_hosts_do_not_throttle_each_other():
+    """A slow host must not delay requests to a different host"""
+    print("🧪 Testing per-host isolation...")
+    limiter = HostRateLimiter(default_rate=1.0, respect_robots=False)
+    limiter.acquire("https://slow.example.com/a")
+    limiter.set_rate("https://slow.example.com/", 0.1)
+
+    start = time.monotonic()
+    limiter.acquire("https://fast.example.com/a")
+    assert time.monotonic() - start < 0.05
+    print("  ✅ hosts isolated")
+
+
+def test_thread_safety():
+    """Concurrent threads on one host still respect the rate"""
+    limiter = HostRateLimiter(default_rate=20.0, respect_robots=False)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        list(pool.map(lambda _: limiter.acquire("https://docs.example.com/x"), range(5)))
+    # first token is free, the other four need 4 * 0.05s
+    assert time.monotonic() - start >= 0.19
+
+
+def test_asyncio_and_crawl_delay():
+    """Async acquisition works and robots crawl-delay lowers the host rate"""
+    print("🧪 Testing asyncio + crawl-delay...")
+    limiter = HostRateLimiter(default_rate=5.0)
+    limiter._robots_crawl_delay = lambda key: 2.0
+
+    async def run():
+        await limiter.acquire_async("https://polite.example.com/")
+
+    asyncio.run(run())
+    assert limiter.rate_for("https://polite.example.com/") == 0.5
+    print("  ✅ crawl-delay honoured")
+
+
+def test_caller_rate_is_per_call():
+    """A stricter caller rate throttles that caller without lowering the host rate for others"""
+    print("🧪 Testing per-call rate...")
+    limiter = HostRateLimiter(default_rate=20.0, respect_robots=False)
+    limiter.acquire("https://docs.example.com/a", rate=2.0)
+    start = time.monotonic()
+    limiter.acquire("https://docs.example.com/b", rate=2.0)
+    assert time.monotonic() - start >= 0.4
+    assert limiter.rate_for("https://docs.example.com/") == 20.0
+    start = time.monotonic()
+    limiter.acquire("https://docs.example.com/c")
+    assert time.monotonic() - start < 0.1
+    print("  ✅ caller rate scoped to the call")
+
+
+def test_stricter_caller_keeps_host_spacing():
+    """A caller delayed by its own stricter rate must not fire in a slot another caller already took"""
+    print("🧪 Testing host spacing with a stricter caller...")
+    limiter = HostRateLimiter(default_rate=5.0, respect_robots=False)
+    url = "https://docs.example.com/x"
+    fired = []
+
+    def strict():
+        for _ in range(2):
+            limiter.acquire(url, rate=1.0)
+            fired.append(time.monotonic())
+
+    def regular():
+        time.sleep(0.05)
+        for _ in range(6):
+            limiter.acquire(url)
+            fired.append(time.monotonic())
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda run: run(), [strict, regular]))
+    fired.sort()
+    gaps = [b - a for a, b in zip(fired, fired[1:])]
+    assert min(gaps) >= 0.18, gaps
+    print("  ✅ host requests stay 0.2s apart")
+
+
+def test_async_bucket_creation_off_loop():
+    """Resolving a new host's bucket (robots.txt lookup) must not block the event loop"""
+    print("🧪 Testing async bucket creation...")
+    limiter = HostRateLimiter(default_rate=5.0)
+    limiter._robots_crawl_delay = lambda key: time.sleep(0.3)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.05)
+
+    async def run():
+        await asyncio.gather(limiter.acquire_async("https://slow-robots.example.com/"), ticker())
+
+    asyncio.run(run())
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.2
+    print("  ✅ event loop kept running")
+
+
+def main():
+    test_bucket_spacing()
+    test_hosts_do_not_throttle_each_other()
+    test_thread_safety()
+    test_asyncio_and_crawl_delay()
+    test_caller_rate_is_per_call()
+    test_stricter_caller_keeps_host_spacing()
+    test_async_bucket_creation_off_loop()
+    print("\n🎉 Rate limiter tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Test the content-addressed raw HTML archive and offline replay"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+os.environ.setdefault('RAW_ARCHIVE_DIR', os.path.join(tempfile.mkdtemp(), 'raw_html_archive'))
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from raw_html_archive import RawHTMLArchive, replay_archive
+from competitive_intelligence_scraper import CompetitiveIntelligenceScraper
+from http_cache import HTTPCache
+import competitive_intelligence_scraper as cis
+import raw_html_archive
+
+PAGE = """
+<html><head><title>API Reference</title><meta name="description" content="REST API"></head>
+<body><main><h1>Endpoints</h1><p>GET /api/v1/users with OAuth 2.0 access_token.</p>
+<pre><code class="language-python">import requests</code></pre>
+<table><tr><th>Limit</th></tr><tr><td>1000 requests per hour</td></tr></table></main></body></html>
+"""
+
+
+def test_bodies_are_stored_once():
+    print("🧪 Testing content-addressed storage...")
+    archive = RawHTMLArchive(tempfile.mkdtemp())
+    first = archive.put('https://docs.example.com/a', PAGE, 'Acme', 'api_docs', '2025-01-01T00:00:00')
+    second = archive.put('https://docs.example.com/a', PAGE, 'Acme', 'api_docs', '2025-02-01T00:00:00')
+    archive.put('https://docs.example.com/b', PAGE + '<!-- changed -->', 'Acme', 'api_docs')
+
+    assert first == second
+    objects = [p for p in archive.objects_dir.rglob('*') if p.is_file()]
+    assert len(objects) == 2
+    assert archive.get_text(first) == PAGE
+    assert len(list(archive.iter_manifest())) == 3
+    latest = list(archive.iter_manifest(latest_only=True))
+    assert len(latest) == 2
+    assert [e for e in latest if e['url'].endswith('/a')][0]['fetched_at'] == '2025-02-01T00:00:00'
+    print("  ✅ deduplicated with full manifest")
+
+
+def test_replay_matches_live_extraction():
+    print("🧪 Testing offline replay...")
+    archive = RawHTMLArchive(tempfile.mkdtemp())
+    archive.put('https://docs.example.com/a', PAGE, 'Acme', 'api_docs')
+    scraper = CompetitiveIntelligenceScraper()
+
+    results = list(replay_archive(archive, scraper, extra_scorers={'length': lambda html, entry: len(html)}))
+
+    assert len(results) == 1
+    live = scraper._extract_technical_content(PAGE, 'Acme')
+    assert results[0]['content']['text_content'] == live['text_content']
+    assert results[0]['quality_score'] == scraper._calculate_content_quality(live)
+    assert results[0]['length'] == len(PAGE)
+    print("  ✅ replay reproduces extraction")
+
+
+def test_cache_hits_are_not_archived():
+    print("🧪 Testing that cache hits are not archived again...")
+    scraper = CompetitiveIntelligenceScraper()
+    scraper.http_cache = HTTPCache(os.path.join(tempfile.mkdtemp(), 'cache.db'))
+
+    class Session:
+        def get(self, url, **kwargs):
+            response = requests.Response()
+            response.status_code, response.url, response._content = 200, url, PAGE.encode()
+            response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+            return response
+
+    scraper.session = Session()
+    archive = RawHTMLArchive(tempfile.mkdtemp())
+    original = raw_html_archive._shared_archive, cis.ensure_robots_allowed, cis.acquire_rate_limit
+    raw_html_archive._shared_archive = archive
+    cis.ensure_robots_allowed = cis.acquire_rate_limit = lambda *args, **kwargs: None
+    try:
+        for _ in range(3):
+            assert scraper._scrape_url('https://docs.example.com/a', 'api_docs', company='Acme') == PAGE
+    finally:
+        raw_html_archive._shared_archive, cis.ensure_robots_allowed, cis.acquire_rate_limit = original
+    entries = list(archive.iter_manifest())
+    assert len(entries) == 1 and entries[0]['company'] == 'Acme'
+    print("  ✅ one manifest row for one network fetch")
+
+
+def main():
+    test_bodies_are_stored_once()
+    test_replay_matches_live_extraction()
+    test_cache_hits_are_not_archived()
+    print("\n🎉 Raw HTML archive tests passed!")
+
+
+if __name__ == "__main__":
+    main()
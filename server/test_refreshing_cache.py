@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test the stale-while-revalidate result cache (offline)"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from refreshing_cache import RefreshingCache
+
+
+class SlowLoader:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def __call__(self, key):
+        with self._lock:
+            self.calls += 1
+            version = self.calls
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError('upstream down')
+        return f'{key}-v{version}'
+
+
+def test_single_flight_and_fresh_hits():
+    print("🧪 Testing single-flight loads and fresh hits...")
+    loader = SlowLoader(0.2)
+    cache = RefreshingCache(loader, ttl=60)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: cache.get('all').value, range(8)))
+    assert values == ['all-v1'] * 8 and loader.calls == 1
+
+    started = time.perf_counter()
+    assert cache.get('all').value == 'all-v1'
+    assert time.perf_counter() - started < 0.05
+    assert cache.get('missing', load=False) is None
+    cache.close()
+    print("  ✅ 8 concurrent cold reads, 1 load; warm reads are instant")
+
+
+def test_stale_while_revalidate():
+    print("🧪 Testing stale-while-revalidate...")
+    loader = SlowLoader(0.2)
+    cache = RefreshingCache(loader, ttl=0.1, max_stale=60)
+    assert cache.get('all').value == 'all-v1'
+    time.sleep(0.15)
+
+    started = time.perf_counter()
+    entry = cache.get('all')
+    assert entry.value == 'all-v1' and cache.is_stale(entry)
+    assert time.perf_counter() - started < 0.05  # served stale, reload in the background
+    time.sleep(0.3)
+    assert cache.get('all').value == 'all-v2'
+
+    # A failed reload keeps the previous value
+    loader.fail = True
+    time.sleep(0.15)
+    cache.get('all')
+    time.sleep(0.3)
+    assert cache.get('all').value == 'all-v2' and cache.stats['errors'] >= 1
+    cache.close()
+    print("  ✅ stale value served instantly, refreshed behind it, kept on failure")
+
+
+def test_background_refresh_ahead():
+    print("🧪 Testing the background refresher...")
+    loader = SlowLoader(0.01)
+    cache = RefreshingCache(loader, ttl=0.5, max_stale=60, refresh_ahead=0.5, refresh_interval=0.05)
+    cache.start()
+    cache.get('all')
+    time.sleep(0.7)
+    entry = cache.get('all')
+    # Reloaded before it expired, so the read is still fresh
+    assert loader.calls >= 2 and not cache.is_stale(entry), loader.calls
+    cache.close()
+    print(f"  ✅ refreshed ahead of expiry ({loader.calls} loads)")
+
+
+def test_unknown_competitors_get_no_entry():
+    print("🧪 Testing per-competitor entries...")
+    import tempfile
+    os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+    import real_data_scraper as rds
+    known = rds.COMPETITORS[0]['name']
+    cache = RefreshingCache(lambda key: {'status': 'success', 'key': key}, ttl=60)
+    original, rds._real_data_cache = rds._real_data_cache, cache
+    try:
+        try:
+            rds.get_cached_competitor('made-up-company')
+            assert False, "unknown competitor should be rejected"
+        except ValueError:
+            pass
+        data, _ = rds.get_cached_competitor(known)
+        assert data['key'] == known
+        assert list(cache._entries) == [known]
+    finally:
+        rds._real_data_cache = original
+        cache.close()
+    print("  ✅ only COMPETITORS names are cached")
+
+
+def main():
+    test_single_flight_and_fresh_hits()
+    test_stale_while_revalidate()
+    test_background_refresh_ahead()
+    test_unknown_competitors_get_no_entry()
+    print("\n🎉 Refreshing cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test per-host retries, Retry-After, adaptive timeouts and circuit breakers (offline)"""
+
+import sys
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+
+from resilience import Resilience, CircuitOpen, parse_retry_after, resilient_get, get_resilience
+
+
+def make_response(status: int, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b'ok'
+    response._content_consumed = True
+    return response
+
+
+class Script:
+    """Fake ``send`` replaying a list of statuses / exceptions and recording timeouts"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def __call__(self, timeout):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome if isinstance(outcome, requests.Response) else make_response(outcome)
+
+
+def test_retries_and_retry_after():
+    print("🧪 Testing retries with backoff and Retry-After...")
+    sleeps = []
+    resilience = Resilience(attempts=3, sleep=sleeps.append)
+
+    send = Script(503, requests.ConnectionError('reset'), 200)
+    assert resilience.call('https://flaky.test/a', send).status_code == 200
+    assert len(send.timeouts) == 3 and resilience.stats['retries'] == 2
+
+    # Retry-After applies to the whole host, including the next request
+    sleeps.clear()
+    send = Script(make_response(429, {'Retry-After': '2'}), 200)
+    assert resilience.call('https://busy.test/a', send).status_code == 200
+    assert sleeps and 1.5 < sleeps[0] <= 2.0, sleeps
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('garbage') is None
+
+    # Attempts used up: the last response is returned for the caller to judge
+    assert resilience.call('https://down.test/a', Script(502)).status_code == 502
+    print("  ✅ transient failures retried, Retry-After honoured per host")
+
+
+def test_adaptive_timeouts():
+    print("🧪 Testing adaptive per-host timeouts...")
+    resilience = Resilience(timeout_min=0.5, sleep=lambda s: None)
+    for _ in range(10):
+        resilience.call('https://fast.test/', Script(200), timeout=30)
+    assert resilience.timeout_for('https://fast.test/x', 30) == 0.5
+    assert resilience.timeout_for('https://unknown.test/x', 30) == 30
+
+    # A timeout under the adapted budget is retried with the caller's full budget
+    send = Script(requests.Timeout('slow'), 200)
+    resilience.call('https://fast.test/slow', send, timeout=30)
+    assert send.timeouts == [0.5, 30], send.timeouts
+    print("  ✅ fast host gets a tight timeout, retries get the full budget")
+
+
+def test_circuit_breaker():
+    print("🧪 Testing the circuit breaker...")
+    resilience = Resilience(attempts=1, breaker_failures=3, breaker_cooldown=0.2, sleep=lambda s: None)
+    dead = Script(requests.ConnectionError('refused'))
+    for _ in range(3):
+        try:
+            resilience.call('https://dead.test/a', dead)
+        except requests.ConnectionError:
+            pass
+
+    started = time.perf_counter()
+    for _ in range(5):
+        try:
+            resilience.call('https://dead.test/b', dead)
+            assert False, 'expected CircuitOpen'
+        except CircuitOpen:
+            pass
+    assert len(dead.timeouts) == 3 and time.perf_counter() - started < 0.05
+    assert resilience.snapshot()['https://dead.test']['state'] == 'open'
+    # Other hosts are unaffected
+    assert resilience.call('https://alive.test/', Script(200)).status_code == 200
+
+    time.sleep(0.25)
+    assert resilience.call('https://dead.test/c', Script(200)).status_code == 200
+    assert resilience.snapshot()['https://dead.test']['state'] == 'closed'
+    print("  ✅ failing host skipped during cool-down, closed again by a successful trial")
+
+
+class Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        Handler.hits += 1
+        status = 503 if Handler.hits < 3 else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_resilient_get_over_http():
+    print("🧪 Testing resilient_get against a local server...")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f'http://127.0.0.1:{server.server_address[1]}/page'
+        response = resilient_get(requests.Session(), url, timeout=5)
+    finally:
+        server.shutdown()
+    assert response.status_code == 200 and Handler.hits == 3
+    assert get_resilience().stats['retries'] >= 2
+    print("  ✅ two 503s retried into a 200")
+
+
+def main():
+    test_retries_and_retry_after()
+    test_adaptive_timeouts()
+    test_circuit_breaker()
+    test_resilient_get_over_http()
+    print("\n🎉 Resilience tests passed!")
+
+
+if __name__ == "__main__":
+    main()
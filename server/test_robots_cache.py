@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Test the shared robots.txt cache and matcher (offline)"""
+
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from robots_cache import RobotsCache, RobotsRules
+from crawl_frontier import CrawlFrontier
+from rate_limiter import HostRateLimiter
+
+ROBOTS = """
+# comment
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Disallow: /search?
+Allow: /docs$
+Disallow: /docs
+Crawl-delay: 2
+
+User-agent: examplebot
+User-agent: otherbot
+Disallow: /
+
+Sitemap: https://docs.example.com/sitemap_index.xml
+"""
+
+
+def test_matching_rules():
+    print("🧪 Testing robots.txt matching...")
+    rules = RobotsRules(ROBOTS)
+    checks = {
+        '/': True,
+        '/private': False,
+        '/private/x': False,
+        '/private/public/page': True,      # longer Allow wins
+        '/files/guide.pdf': False,         # wildcard + anchor
+        '/files/guide.pdf?v=1': True,
+        '/search?q=api': False,
+        '/docs': True,                     # anchored Allow
+        '/docs/api': False,
+        '/robots.txt': True,
+    }
+    for path, expected in checks.items():
+        assert rules.can_fetch('https://docs.example.com' + path) is expected, path
+    assert rules.crawl_delay == 2.0
+    assert rules.sitemaps == ['https://docs.example.com/sitemap_index.xml']
+    print(f"  ✅ {len(checks)} paths matched")
+
+
+def test_agent_groups_and_ties():
+    bot = RobotsRules(ROBOTS, user_agent='ExampleBot/1.0')
+    assert not bot.can_fetch('https://docs.example.com/anything') and bot.crawl_delay is None
+    tie = RobotsRules("User-agent: *\nDisallow: /page\nAllow: /page\n")
+    assert tie.can_fetch('/page')
+    assert RobotsRules("User-agent: *\nDisallow:\n").can_fetch('/x')
+
+
+def test_bare_wildcard_rules():
+    everything = RobotsRules("User-agent: *\nDisallow: *\n", user_agent='bot')
+    assert not everything.can_fetch('https://a.test/page') and not everything.can_fetch('/')
+    assert everything.can_fetch('/robots.txt')
+    docs_only = RobotsRules("User-agent: *\nDisallow: *\nAllow: /docs\n")
+    assert docs_only.can_fetch('/docs/api') and not docs_only.can_fetch('/blog')
+    assert RobotsRules("User-agent: *\nDisallow: /private\nAllow: *\n").can_fetch('/public')
+
+
+def test_cache_fetches_once_and_handles_errors():
+    print("🧪 Testing per-host caching and error handling...")
+    calls = []
+    responses = {
+        'https://docs.example.com/robots.txt': (200, ROBOTS),
+        'https://down.example.com/robots.txt': (503, ''),
+        'https://none.example.com/robots.txt': (404, ''),
+    }
+
+    def fetcher(url):
+        calls.append(url)
+        return responses[url]
+
+    cache = RobotsCache(fetcher=fetcher)
+    for _ in range(50):
+        assert not cache.can_fetch('https://docs.example.com/private/a')
+    assert calls == ['https://docs.example.com/robots.txt']
+    assert not cache.can_fetch('https://down.example.com/docs')   # 5xx: assume disallow
+    assert cache.can_fetch('https://none.example.com/docs')       # 4xx: allow all
+    assert cache.crawl_delay('https://docs.example.com/') == 2.0
+
+    expiring = RobotsCache(ttl=0, fetcher=fetcher)
+    expiring.can_fetch('https://none.example.com/a')
+    expiring.can_fetch('https://none.example.com/b')
+    assert calls.count('https://none.example.com/robots.txt') == 3
+    print("  ✅ one fetch per host within the TTL")
+
+
+def test_frontier_and_limiter_use_rules():
+    cache = RobotsCache(fetcher=lambda url: (200, ROBOTS))
+    frontier = CrawlFrontier(url_filter=cache.can_fetch)
+    frontier.add({'url': 'https://docs.example.com/private/a', 'technical_score': 1.0})
+    frontier.add({'url': 'https://docs.example.com/api', 'technical_score': 0.5})
+    assert len(frontier) == 1 and frontier.pruned == 1
+    assert 'https://docs.example.com/private/a' in frontier
+
+    limiter = HostRateLimiter(default_rate=5.0, robots=cache)
+    assert limiter.rate_for('https://docs.example.com/api') == 0.5
+
+
+def test_check_is_linear_in_path_length():
+    """Thousands of rules should not slow down a single check"""
+    big = "User-agent: *\n" + "".join(f"Disallow: /section{i}/private\n" for i in range(5000))
+    rules = RobotsRules(big)
+    start = time.monotonic()
+    for i in range(5000):
+        rules.can_fetch(f'https://docs.example.com/section{i}/public/page')
+    assert time.monotonic() - start < 0.5
+    assert not rules.can_fetch('https://docs.example.com/section42/private/x')
+
+
+def main():
+    test_matching_rules()
+    test_agent_groups_and_ties()
+    test_bare_wildcard_rules()
+    test_cache_fetches_once_and_handles_errors()
+    test_frontier_and_limiter_use_rules()
+    test_check_is_linear_in_path_length()
+    print("\n🎉 Robots cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test the streaming sitemap reader (offline)"""
+
+import sys
+import os
+import tempfile
+import io
+import gzip
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from sitemap_reader import iter_sitemap_file, iter_sitemap_urls, parse_lastmod
+from stream_fetch import CappedReader
+from robots_cache import RobotsCache
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*entries):
+    body = ''.join(f'<url><loc>{loc}</loc>' + (f'<lastmod>{mod}</lastmod>' if mod else '') + '</url>'
+                   for loc, mod in entries)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def fake_site():
+    """robots.txt -> gzipped index -> two child sitemaps"""
+    index = (f'<sitemapindex {NS}>'
+             '<sitemap><loc>https://docs.example.com/sm-new.xml</loc><lastmod>2024-06-01</lastmod></sitemap>'
+             '<sitemap><loc>https://docs.example.com/sm-old.xml</loc><lastmod>2023-01-01</lastmod></sitemap>'
+             '</sitemapindex>').encode()
+    files = {
+        'https://docs.example.com/robots.txt': b'User-agent: *\nSitemap: https://docs.example.com/index.xml.gz\n',
+        'https://docs.example.com/index.xml.gz': gzip.compress(index),
+        'https://docs.example.com/sm-new.xml': urlset(('https://docs.example.com/api/a', '2024-06-01T10:00:00Z'),
+                                                      ('https://docs.example.com/api/b', '2023-05-01'),
+                                                      ('https://docs.example.com/api/c', None)),
+        'https://docs.example.com/sm-old.xml': urlset(('https://docs.example.com/api/old', '2023-01-01')),
+    }
+    opened = []
+
+    def opener(url):
+        opened.append(url)
+        return io.BufferedReader(io.BytesIO(files[url])) if url in files else None
+    robots = RobotsCache(fetcher=lambda url: (200, files[url].decode()))
+    return opener, opened, robots
+
+
+def test_index_recursion_and_gzip():
+    print("🧪 Testing robots.txt -> gzipped index -> child sitemaps...")
+    opener, _, robots = fake_site()
+    locs = [e['loc'] for e in iter_sitemap_urls('https://docs.example.com', opener=opener, robots=robots)]
+    assert locs == ['https://docs.example.com/api/a', 'https://docs.example.com/api/b',
+                    'https://docs.example.com/api/c', 'https://docs.example.com/api/old']
+    print(f"  ✅ {len(locs)} urls")
+
+
+def test_lastmod_filter_skips_old_sitemaps():
+    print("🧪 Testing lastmod filtering...")
+    opener, opened, robots = fake_site()
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    locs = [e['loc'] for e in iter_sitemap_urls('https://docs.example.com', since=since, opener=opener,
+                                                robots=robots)]
+    assert locs == ['https://docs.example.com/api/a', 'https://docs.example.com/api/c']
+    assert 'https://docs.example.com/sm-old.xml' not in opened
+    print("  ✅ unchanged pages and child sitemaps skipped")
+
+
+def test_streaming_is_lazy_and_capped():
+    opener, opened, robots = fake_site()
+    stream = iter_sitemap_urls('https://docs.example.com', opener=opener, robots=robots, max_urls=2)
+    next(stream)
+    assert 'https://docs.example.com/sm-old.xml' not in opened
+    assert len(list(stream)) == 1
+
+
+def test_oversized_sitemaps_stop_at_the_byte_limit():
+    print("🧪 Testing the sitemap byte limit...")
+    big = urlset(*((f'https://docs.example.com/p{i}', None) for i in range(20000)))
+    original = os.environ.get('FETCH_MAX_BYTES_SITEMAP')
+    os.environ['FETCH_MAX_BYTES_SITEMAP'] = '50000'
+    try:
+        # A few hundred compressed bytes that inflate far past the limit
+        bomb = io.BufferedReader(io.BytesIO(gzip.compress(big)))
+        inflated = list(iter_sitemap_file(bomb, 'https://docs.example.com/big.xml.gz'))
+        plain = io.BufferedReader(CappedReader(io.BytesIO(big), 50000))
+        read = list(iter_sitemap_file(plain, 'https://docs.example.com/big.xml'))
+    finally:
+        if original is None:
+            os.environ.pop('FETCH_MAX_BYTES_SITEMAP')
+        else:
+            os.environ['FETCH_MAX_BYTES_SITEMAP'] = original
+    assert 0 < len(inflated) < 2000 and 0 < len(read) < 2000
+    print(f"  ✅ stopped after {len(inflated)} of 20000 urls")
+
+
+def test_parse_lastmod():
+    assert parse_lastmod('2024-05-01') == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert parse_lastmod('2024-05-01T12:00:00+02:00') == datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    assert parse_lastmod('yesterday') is None
+
+
+def main():
+    test_index_recursion_and_gzip()
+    test_lastmod_filter_skips_old_sitemaps()
+    test_streaming_is_lazy_and_capped()
+    test_oversized_sitemaps_stop_at_the_byte_limit()
+    test_parse_lastmod()
+    print("\n🎉 Sitemap reader tests passed!")
+
+
+if __name__ == "__main__":
+    main()
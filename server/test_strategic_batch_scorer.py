@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test the vectorized strategic comparison scorer against the per-company path (offline)"""
+
+import sys
+import os
+import random
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from competitive_intelligence_scraper import STRATEGIC_TAXONOMY, CompetitiveIntelligenceScraper
+from store_scrape_to_sqlite import SCHEMA_SQL
+from strategic_batch_scorer import StrategicBatchScorer
+
+COMPANIES = ['Sigma', 'Looker', 'Tableau', 'Hex']
+
+
+def random_text(rnd):
+    words = STRATEGIC_TAXONOMY.keywords + ['the', 'platform', 'Data', 'API-first', 'cloudy', 'REST']
+    return ' '.join(rnd.choice(words) for _ in range(rnd.randint(0, 30)))
+
+
+def make_db(rnd, items=200):
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA_SQL)
+    for i in range(items):
+        conn.execute(
+            "INSERT INTO scraped_items (company, category, url, text_content, scraped_at) VALUES (?, ?, ?, ?, ?)",
+            (rnd.choice(COMPANIES), 'docs', f'https://example.com/{i}', random_text(rnd), f'2024-01-01T00:00:{i % 60:02d}')
+        )
+    return conn
+
+
+def per_company(conn):
+    scraper = CompetitiveIntelligenceScraper()
+    grouped = {}
+    for company, text in conn.execute("SELECT company, text_content FROM scraped_items ORDER BY id"):
+        grouped.setdefault(company, []).append({'company': company, 'text_content': text})
+    return {company: scraper.extract_strategic_comparison_data(items) for company, items in grouped.items()}
+
+
+def test_matches_per_company_scoring():
+    print("🧪 Testing batch scores against extract_strategic_comparison_data...")
+    conn = make_db(random.Random(11))
+    scores = StrategicBatchScorer().score(conn)
+    assert scores == per_company(conn)
+    assert set(scores) == set(COMPANIES)
+    print(f"  ✅ {len(scores)} companies scored identically")
+
+
+def test_incremental_refresh():
+    print("🧪 Testing incremental matrix refresh...")
+    rnd = random.Random(12)
+    conn = make_db(rnd)
+    scorer = StrategicBatchScorer()
+    scorer.score(conn)
+    assert scorer.stats == {'refreshes': 1, 'vectorized': 200}
+
+    scorer.score(conn)
+    assert scorer.stats['refreshes'] == 1, "unchanged table should not be re-vectorized"
+
+    # Re-scrape two items, delete one, add one (for a new company)
+    conn.execute("UPDATE scraped_items SET text_content = ?, scraped_at = 'later' WHERE id IN (3, 50)",
+                 ("api-first cloud native kubernetes rest api",))
+    conn.execute("DELETE FROM scraped_items WHERE id = 7")
+    conn.execute("INSERT INTO scraped_items (company, category, url, text_content, scraped_at) VALUES (?, ?, ?, ?, ?)",
+                 ('Mode', 'docs', 'https://example.com/new', random_text(rnd), 'later'))
+    scores = scorer.score(conn)
+    assert scorer.stats == {'refreshes': 2, 'vectorized': 203}
+    assert scores == per_company(conn) and 'Mode' in scores
+    print("  ✅ only changed items re-vectorized, scores still identical")
+
+
+def test_empty_and_null_text():
+    print("🧪 Testing empty tables and missing text...")
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA_SQL)
+    scorer = StrategicBatchScorer()
+    assert scorer.score(conn) == {}
+    conn.execute("INSERT INTO scraped_items (company, category, url, text_content, scraped_at) VALUES ('Hex', 'docs', 'u', NULL, 't')")
+    assert scorer.score(conn)['Hex']['overall_score'] == 0
+    print("  ✅ empty corpus and NULL text handled")
+
+
+def main():
+    test_matches_per_company_scoring()
+    test_incremental_refresh()
+    test_empty_and_null_text()
+    print("\n🎉 Strategic batch scorer tests passed!")
+
+
+if __name__ == "__main__":
+    main()
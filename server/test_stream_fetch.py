@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Test the capped streaming fetch against a local server (offline)"""
+
+import sys
+import os
+import gzip
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from http_cache import HTTPCache
+from http_client import create_session
+from stream_fetch import stream_get, FetchRejected, FEED_TYPES, max_bytes_for
+
+PAGE = b'<html><body>' + b'docs ' * 2000 + b'</body></html>'
+
+ROUTES = {
+    '/page': ('text/html; charset=utf-8', PAGE, False),
+    '/page.gz': ('text/html', gzip.compress(PAGE), True),
+    '/manual.pdf': ('application/pdf', b'%PDF' + b'0' * 500_000, False),
+    '/feed': ('application/rss+xml', b'<rss><channel></channel></rss>', False),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        content_type, body, gzipped = ROUTES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def rejected(fn) -> bool:
+    try:
+        fn()
+    except FetchRejected:
+        return True
+    return False
+
+
+def test_stream_get():
+    print("🧪 Testing capped streaming fetch...")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    session = create_session()
+    try:
+        assert stream_get(session, f'{base}/page', timeout=5).content == PAGE
+        # Decoded incrementally; the cap applies to decompressed bytes
+        assert stream_get(session, f'{base}/page.gz', timeout=5).content == PAGE
+        assert rejected(lambda: stream_get(session, f'{base}/page.gz', max_bytes=1000, timeout=5))
+
+        assert rejected(lambda: stream_get(session, f'{base}/manual.pdf', timeout=5))
+        assert rejected(lambda: stream_get(session, f'{base}/page', max_bytes=1000, timeout=5))
+        assert rejected(lambda: stream_get(session, f'{base}/page', accept=FEED_TYPES, timeout=5))
+        assert b'<rss>' in stream_get(session, f'{base}/feed', accept=FEED_TYPES, timeout=5).content
+
+        head = stream_get(session, f'{base}/manual.pdf', accept=None, max_bytes=1000, truncate=True, timeout=5)
+        assert len(head.content) == 1000 and head.content.startswith(b'%PDF')
+        # The session is still usable after aborted reads
+        assert stream_get(session, f'{base}/page', timeout=5).text.startswith('<html>')
+
+        cache = HTTPCache(os.path.join(tempfile.mkdtemp(), 'cache.db'))
+        first = cache.get(session, f'{base}/page', category='docs', timeout=5, send=stream_get)
+        second = cache.get(session, f'{base}/page', category='docs', timeout=5, send=stream_get)
+        assert not first.from_cache and second.from_cache and second.content == PAGE
+    finally:
+        server.shutdown()
+    assert max_bytes_for('api_docs') == max_bytes_for('docs')
+    print("  ✅ non-HTML and oversized bodies rejected, gzip decoded, cache integration works")
+
+
+def main():
+    test_stream_get()
+    print("\n🎉 Streaming fetch tests passed!")
+
+
+if __name__ == "__main__":
+    main()
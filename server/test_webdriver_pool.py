@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Test the WebDriver pool and static-first rendering with fake drivers (offline)"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+os.environ.setdefault('ROBOTS_ENFORCE', '0')
+os.environ.setdefault('SCRAPE_HOST_RATE', '1000')
+os.environ.setdefault('SCRAPE_HOST_BURST', '1000')
+
+from webdriver_pool import WebDriverPool, looks_js_shelled, wait_until_ready
+from tech_companies_scraper import TechCompaniesScraper
+
+ARTICLE = ' '.join(['Our REST API supports OAuth tokens, webhooks and SDKs.'] * 20)
+STATIC_PAGE = f'<html><head><title>Docs</title></head><body><nav><a href="/a">A</a></nav><p>{ARTICLE}</p></body></html>'
+SHELL_PAGE = ('<html><head><title>App</title><script src="/bundle.js"></script></head>'
+              '<body><div id="root"></div><noscript>You need to enable JavaScript to run this app.</noscript></body></html>')
+
+
+class FakeDriver:
+    created = 0
+
+    def __init__(self):
+        FakeDriver.created += 1
+        self.url = None
+        self.title = ''
+        self.page_source = ''
+        self.quit_called = False
+
+    def get(self, url):
+        if 'broken' in url:
+            raise RuntimeError('chrome crashed')
+        self.url = url
+        self.title = 'Rendered'
+        self.page_source = f'<html><body><div id="root"><p>{ARTICLE}</p></div></body></html>'
+
+    def execute_script(self, script):
+        return 'complete' if 'readyState' in script else ARTICLE
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = (SHELL_PAGE if self.path == '/shell' else STATIC_PAGE).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_shell_detection():
+    print("🧪 Testing JS-shell detection...")
+    assert not looks_js_shelled(STATIC_PAGE)
+    assert looks_js_shelled(SHELL_PAGE)
+    assert looks_js_shelled('')
+    # A populated mount point is server-rendered content, not a shell
+    assert not looks_js_shelled(f'<html><body><div id="__next"><p>{ARTICLE}</p></div></body></html>')
+    print("  ✅ shells detected, server-rendered pages kept static")
+
+
+def test_pool_reuses_and_replaces_drivers():
+    print("🧪 Testing driver reuse across pages...")
+    pool = WebDriverPool(size=2, factory=FakeDriver, ready_timeout=1)
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(pool.render, [f'https://app.test/p{i}' for i in range(12)]))
+    assert all(title == 'Rendered' for _, title in results)
+    assert pool.stats['created'] <= 2 and pool.stats['renders'] == 12
+
+    try:
+        pool.render('https://app.test/broken')
+    except RuntimeError:
+        pass
+    assert pool.stats['discarded'] == 1
+    pool.render('https://app.test/after')
+    pool.close()
+    print(f"  ✅ 13 renders on {pool.stats['created']} drivers, broken driver replaced")
+
+
+class RenderingDriver:
+    """Document loads after a few polls; body text grows, then stops changing"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.polls = 0
+
+    def execute_script(self, script):
+        self.polls += 1
+        if 'readyState' in script:
+            return 'complete' if self.polls > 2 else 'loading'
+        return self.texts.pop(0) if len(self.texts) > 1 else self.texts[0]
+
+
+def test_ready_wait_shares_one_deadline():
+    print("🧪 Testing readiness waits...")
+    start = time.monotonic()
+    assert wait_until_ready(RenderingDriver(['Sign in', 'Sign in']), timeout=5, settle=0.3)
+    # A sparse page finishes once its text settles, long before the timeout
+    assert time.monotonic() - start < 1.5
+
+    driver = RenderingDriver(['', 'Loading', 'Loading data', ARTICLE])
+    assert wait_until_ready(driver, timeout=5, settle=0.3)
+    assert driver.texts == [ARTICLE]
+
+    start = time.monotonic()
+    assert not wait_until_ready(RenderingDriver(['']), timeout=0.5, settle=0.1)
+    assert time.monotonic() - start < 1.0
+    print("  ✅ ready when the text settles, never past one timeout")
+
+
+def test_static_first_scraping():
+    print("🧪 Testing static-first scraping...")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    scraper = TechCompaniesScraper()
+    scraper.driver_pool = WebDriverPool(size=1, factory=FakeDriver, ready_timeout=1)
+    try:
+        static = scraper.scrape_company_website('Acme', 'docs', f'{base}/docs')
+        shell = scraper.scrape_company_website('Acme', 'marketing', f'{base}/shell')
+    finally:
+        server.shutdown()
+        scraper.cleanup()
+
+    assert static['rendered'] is False and static['title'] == 'Docs'
+    assert static['content']['links'] == [f'{base}/a'] and static['metrics']['word_count'] > 100
+    assert shell['rendered'] is True and shell['title'] == 'Rendered'
+    assert scraper.render_stats == {'static': 1, 'rendered': 1}
+    print("  ✅ only the JS shell was rendered")
+
+
+def main():
+    test_shell_detection()
+    test_pool_reuses_and_replaces_drivers()
+    test_ready_wait_shares_one_deadline()
+    test_static_first_scraping()
+    print("\n🎉 WebDriver pool tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Test the SQLite crawl work queue and the worker loop (offline)"""
+
+import sys
+import os
+import time
+import tempfile
+import multiprocessing
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('HTTP_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'http_cache.db'))
+
+from work_queue import SQLiteWorkQueue, open_work_queue, DONE, DEAD, LEASED, PENDING
+
+
+def new_queue() -> SQLiteWorkQueue:
+    return SQLiteWorkQueue(Path(tempfile.mkdtemp()) / 'queue.db')
+
+
+def test_dedup_and_lease():
+    print("🧪 Testing dedup and leases...")
+    queue = new_queue()
+    assert queue.put('Acme', 'docs', 'https://docs.acme.test/')
+    assert not queue.put('Acme', 'docs', 'https://docs.acme.test/')
+
+    job = queue.lease('w1', lease_seconds=60)
+    assert job['attempts'] == 1 and job['url'] == 'https://docs.acme.test/'
+    assert queue.lease('w2') is None
+    assert queue.complete(job)
+    assert queue.stats()[DONE] == 1
+    assert not queue.put('Acme', 'docs', 'https://docs.acme.test/')
+    assert queue.lease('w2') is None
+    queue.close()
+    print("  ✅ duplicates ignored, one lease per job")
+
+
+def test_retries_dead_letter_and_claims():
+    print("🧪 Testing retries, dead-lettering and page claims...")
+    queue = new_queue()
+    queue.put('Acme', 'pricing', 'https://acme.test/pricing', max_attempts=2)
+
+    job = queue.lease('w1', lease_seconds=0)
+    # The lease has already expired, so another worker takes over and the first loses its rights
+    again = queue.lease('w2', lease_seconds=60)
+    assert again['job_id'] == job['job_id'] and again['attempts'] == 2
+    assert not queue.complete(job)
+    assert queue.fail(again, 'HTTP 500') == DEAD
+    assert queue.stats()[DEAD] == 1
+    assert queue.dead_letters()[0]['last_error'] == 'HTTP 500'
+    assert queue.put('Acme', 'pricing', 'https://acme.test/pricing', requeue_done=True)
+    retry = queue.lease('w1')
+    # A failure with attempts left goes back to pending behind its backoff delay
+    assert queue.fail(retry, 'timeout') == PENDING and queue.lease('w1') is None
+
+    assert queue.claim('Acme|docs|https://docs.acme.test/a', 'job:1')
+    assert queue.claim('Acme|docs|https://docs.acme.test/a', 'job:1')
+    assert not queue.claim('Acme|docs|https://docs.acme.test/a', 'job:2')
+    assert queue.claim('Acme|docs|https://docs.acme.test/b', 'job:2', ttl=0)
+    assert queue.claim('Acme|docs|https://docs.acme.test/b', 'job:3')
+    queue.close()
+    print("  ✅ retries exhausted into the dead-letter set, claims exclusive until expiry")
+
+
+def test_expired_leases_dead_letter():
+    print("🧪 Testing jobs whose leases keep expiring...")
+    queue = new_queue()
+    queue.put('Acme', 'docs', 'https://docs.acme.test/hang')
+    jobs = [queue.lease('w1', lease_seconds=0) for _ in range(6)]
+    assert [job and job['attempts'] for job in jobs] == [1, 2, 3, None, None, None]
+    assert queue.stats()[DEAD] == 1 and queue.stats()[LEASED] == 0
+    assert queue.dead_letters()[0]['last_error'] == 'Lease expired after 3 attempts'
+    # The worker that hung on the last attempt can no longer report the job
+    assert not queue.complete(jobs[2])
+    queue.close()
+    print("  ✅ dead-lettered after max_attempts expired leases")
+
+
+def _drain(db_path: str, results):
+    from crawl_worker import run_worker
+
+    def handler(job, queue, worker_id, conn, fingerprints):
+        time.sleep(0.01)
+        results.append(job['url'])
+        return {}
+
+    queue = open_work_queue(f"sqlite:///{db_path}")
+    run_worker(queue, handlers={'docs': handler})
+    queue.close()
+
+
+def test_workers_drain_without_duplicates():
+    print("🧪 Testing several worker processes draining one queue...")
+    db_path = Path(tempfile.mkdtemp()) / 'queue.db'
+    queue = SQLiteWorkQueue(db_path)
+    urls = [f'https://docs.acme.test/page{i}' for i in range(40)]
+    for url in urls:
+        queue.put('Acme', 'docs', url)
+
+    with multiprocessing.Manager() as manager:
+        results = manager.list()
+        workers = [multiprocessing.Process(target=_drain, args=(str(db_path), results)) for _ in range(4)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join(60)
+        processed = list(results)
+
+    assert sorted(processed) == sorted(urls), len(processed)
+    assert queue.stats()[DONE] == len(urls)
+    queue.close()
+    print(f"  ✅ {len(processed)} jobs processed exactly once by 4 processes")
+
+
+def main():
+    test_dedup_and_lease()
+    test_retries_dead_letter_and_claims()
+    test_expired_leases_dead_letter()
+    test_workers_drain_without_duplicates()
+    print("\n🎉 Work queue tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,13 @@ from datetime import datetime
 from typing import List, Dict
 from urllib.parse import urljoin
 from pathlib import Path
-from bs4 import BeautifulSoup
+
+from rate_limiter import acquire as acquire_rate_limit
+from resilience import resilient_get
+from robots_cache import ensure_allowed as ensure_robots_allowed
+from http_client import get_session
+from stream_fetch import stream_get
+from parsed_document import ParsedDocument
 
 from store_scrape_to_sqlite import (
     BASE_URL,
@@ -64,7 +70,9 @@ DOC_CANDIDATE_PATHS = ["docs", "developers", "reference", "api", "help"]
 
 def fetch(url: str) -> str:
     try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
+        ensure_robots_allowed(url)
+        r = resilient_get(get_session(), url, timeout=15, before_attempt=lambda: acquire_rate_limit(url),
+                          send=stream_get, category='docs', headers=HEADERS)
         if r.status_code == 200:
             return r.text
     except Exception:
@@ -77,7 +85,9 @@ def discover_doc_targets(base: str, limit: int = 5) -> List[str]:
     for p in DOC_CANDIDATE_PATHS:
         u = urljoin(base if base.endswith("/") else base + "/", p)
         try:
-            h = requests.head(u, headers=HEADERS, timeout=8, allow_redirects=True)
+            ensure_robots_allowed(u)
+            acquire_rate_limit(u)
+            h = get_session().head(u, headers=HEADERS, timeout=8, allow_redirects=True)
             if h.status_code == 200 and "text/html" in h.headers.get("Content-Type", ""):
                 targets.append(u)
         except Exception:
@@ -93,11 +103,9 @@ def scrape_doc_page(company: str, url: str) -> Dict:
     html = fetch(url)
     if not html:
         return {}
-    soup = BeautifulSoup(html, "html.parser")
-    title = (soup.find("title").get_text() if soup.find("title") else url)
-    main = soup.find("main") or soup.find("article") or soup.find("body")
-    text = main.get_text(" ", strip=True) if main else soup.get_text(" ", strip=True)
-    return {"company": company, "title": title, "content": text, "url": url}
+    doc = ParsedDocument(html, url)
+    title = doc.title if doc.title is not None else url
+    return {"company": company, "title": title, "content": doc.main_text, "url": url}
 
 
 def ai_analyze_docs(company: str, items: List[Dict]) -> Dict:
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Headless WebDriver Pool
+
+A small pool of headless Chrome drivers that are created on first use and
+reused across pages, with explicit readiness waits (document loaded and body
+text settled) instead of fixed sleeps. Also holds the check used by the
+static-first scrapers to decide whether a page served over plain HTTP is only
+a JavaScript shell that has to be rendered.
+
+Selenium is imported only when a driver is actually created, so static-only
+scraping works without a browser installed.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv('WEBDRIVER_POOL_SIZE', '2'))
+READY_TIMEOUT = float(os.getenv('WEBDRIVER_READY_TIMEOUT', '10'))
+PAGE_LOAD_TIMEOUT = int(os.getenv('WEBDRIVER_PAGE_LOAD_TIMEOUT', '30'))
+# Body text unchanged for this long counts as rendered
+SETTLE_SECONDS = float(os.getenv('WEBDRIVER_SETTLE_SECONDS', '0.5'))
+
+# Fewer visible words than this and the page is treated as empty
+SHELL_MIN_WORDS = int(os.getenv('RENDER_SHELL_MIN_WORDS', '30'))
+# Pages with an empty app mount point (or a "please enable JavaScript" notice)
+# are rendered unless the static text is already this long
+SHELL_SPARSE_WORDS = int(os.getenv('RENDER_SHELL_SPARSE_WORDS', '150'))
+APP_MOUNT_IDS = ('root', 'app', '__next', '__nuxt', 'ember-app', 'svelte', 'main-app')
+NOSCRIPT_MARKERS = ('enable javascript', 'javascript is required', 'javascript is disabled', 'requires javascript')
+
+
+def looks_js_shelled(html: str) -> bool:
+    """Whether statically fetched HTML is a client-side app shell without real content"""
+    if not html:
+        return True
+    soup = BeautifulSoup(html, 'html.parser')
+    noscript = ' '.join(n.get_text(' ', strip=True) for n in soup.find_all('noscript')).lower()
+    for tag in soup(['script', 'style', 'noscript', 'template']):
+        tag.decompose()
+
+    words = len((soup.body or soup).get_text(' ', strip=True).split())
+    if words < SHELL_MIN_WORDS:
+        return True
+
+    mounts = [soup.find(id=mount_id) for mount_id in APP_MOUNT_IDS]
+    empty_mount = any(mount is not None and not mount.get_text(strip=True) for mount in mounts)
+    js_notice = any(marker in noscript for marker in NOSCRIPT_MARKERS)
+    return (empty_mount or js_notice) and words < SHELL_SPARSE_WORDS
+
+
+def create_headless_chrome() -> Any:
+    """Headless Chrome tuned for scraping (no images, no notifications)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    for arg in ('--headless=new', '--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage',
+                '--disable-notifications', '--window-size=1366,900', '--blink-settings=imagesEnabled=false'):
+        options.add_argument(arg)
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+def _wait_for(predicate: Callable[[], bool], deadline: float, interval: float = 0.1) -> bool:
+    while True:
+        try:
+            if predicate():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+
+def wait_until_ready(driver: Any, timeout: float = READY_TIMEOUT, settle: float = SETTLE_SECONDS) -> bool:
+    """
+    Wait (``timeout`` seconds in total) for the document to finish loading and its
+    body text to stop changing, so client-rendered apps get to render without
+    sparse pages (login walls, dashboards) waiting for text that never comes.
+    """
+    deadline = time.monotonic() + timeout
+    if not _wait_for(lambda: driver.execute_script('return document.readyState') == 'complete', deadline):
+        return False
+
+    last_text, changed_at = None, time.monotonic()
+
+    def settled() -> bool:
+        nonlocal last_text, changed_at
+        text = driver.execute_script("return document.body ? document.body.innerText : ''") or ''
+        now = time.monotonic()
+        if text != last_text:
+            last_text, changed_at = text, now
+            return False
+        return bool(text.strip()) and now - changed_at >= settle
+
+    return _wait_for(settled, deadline, interval=0.1)
+
+
+class WebDriverPool:
+    """Up to ``size`` reusable drivers, created lazily and handed out one caller at a time"""
+
+    def __init__(self, size: int = POOL_SIZE, factory: Optional[Callable[[], Any]] = None,
+                 ready_timeout: float = READY_TIMEOUT):
+        self.size = max(1, size)
+        self.ready_timeout = ready_timeout
+        self._factory = factory or create_headless_chrome
+        self._idle: 'queue.LifoQueue[Any]' = queue.LifoQueue()
+        self._drivers: List[Any] = []
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'renders': 0, 'discarded': 0}
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver; one that raises is assumed broken and replaced"""
+        driver = self._checkout()
+        try:
+            yield driver
+        except Exception:
+            self._discard(driver)
+            raise
+        self._idle.put(driver)
+
+    def render(self, url: str) -> Tuple[str, str]:
+        """``(page_source, title)`` of ``url`` once it is ready"""
+        with self.driver() as driver:
+            driver.get(url)
+            if not wait_until_ready(driver, self.ready_timeout):
+                logger.debug(f"{url} not fully ready after {self.ready_timeout}s; using current DOM")
+            self.stats['renders'] += 1
+            return driver.page_source, driver.title
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = [d for d in self._drivers if d is not None], []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def _checkout(self) -> Any:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                create = len(self._drivers) < self.size
+                if create:
+                    # Reserve the slot before the (slow) browser start
+                    self._drivers.append(None)
+            if create:
+                break
+            try:
+                # Re-check periodically: a discarded driver frees a slot without being returned
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+            self.stats['created'] += 1
+        return driver
+
+    def _discard(self, driver: Any):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self.stats['discarded'] += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
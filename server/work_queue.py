@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Durable Crawl Work Queue
+
+Queue of ``(company, category, url)`` crawl jobs that several worker
+processes, on one or more machines, can drain together:
+
+- each job exists once per queue (re-enqueueing a pending or finished job is a no-op)
+- a worker *leases* a job for a limited time; a worker that dies loses its
+  lease and the job becomes available again
+- failed jobs are retried with exponential backoff and dead-lettered after
+  ``max_attempts``; so are jobs whose lease expired on their last attempt
+  (a job that keeps crashing or hanging its worker)
+- ``claim()`` lets workers reserve individual page URLs so that crawls that
+  overlap do not fetch the same page twice
+
+The default backend is a SQLite file (safe for many processes on one
+machine). ``WORK_QUEUE_URL=redis://host:6379/0`` selects a Redis-protocol
+backend (Redis, Valkey, KeyDB...) for workers spread over several machines;
+it needs the optional ``redis`` package.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORK_QUEUE_URL = os.getenv('WORK_QUEUE_URL', f"sqlite:///{Path(__file__).parent / 'work_queue.db'}")
+LEASE_SECONDS = int(os.getenv('WORK_QUEUE_LEASE_SECONDS', '900'))
+MAX_ATTEMPTS = int(os.getenv('WORK_QUEUE_MAX_ATTEMPTS', '3'))
+RETRY_BASE_DELAY = float(os.getenv('WORK_QUEUE_RETRY_DELAY', '30'))   # doubled per attempt
+CLAIM_TTL = int(os.getenv('WORK_QUEUE_CLAIM_TTL', str(6 * 3600)))
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+DEAD = 'dead'
+
+
+def job_key(company: str, category: str, url: str) -> str:
+    return f"{company}|{category}|{url}"
+
+
+def expired_lease_error(attempts: int) -> str:
+    return f"Lease expired after {attempts} attempts"
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt of a job that has failed ``attempts`` times"""
+    return RETRY_BASE_DELAY * (2 ** max(attempts - 1, 0))
+
+
+SCHEMA_SQL = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS work_jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    queue TEXT NOT NULL,
+    company TEXT NOT NULL,
+    category TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (queue, company, category, url)
+);
+CREATE INDEX IF NOT EXISTS idx_work_jobs_ready ON work_jobs (queue, status, available_at);
+CREATE TABLE IF NOT EXISTS work_claims (
+    queue TEXT NOT NULL,
+    claim_key TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (queue, claim_key)
+);
+"""
+
+
+class SQLiteWorkQueue:
+    """Work queue in a SQLite file shared by worker processes on one machine"""
+
+    def __init__(self, db_path: Path, name: str = 'crawl'):
+        self.name = name
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.executescript(SCHEMA_SQL)
+
+    def put(self, company: str, category: str, url: str, payload: Optional[Dict[str, Any]] = None,
+            max_attempts: int = MAX_ATTEMPTS, requeue_done: bool = False) -> bool:
+        """Enqueue a job; returns False if it is already queued (or finished, unless ``requeue_done``)"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO work_jobs
+                    (queue, company, category, url, payload, status, max_attempts, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (self.name, company, category, url, json.dumps(payload or {}), PENDING, max_attempts, now, now, now),
+            )
+            if cursor.rowcount == 0 and requeue_done:
+                cursor = self._conn.execute(
+                    """
+                    UPDATE work_jobs SET status = ?, attempts = 0, available_at = ?, last_error = NULL, updated_at = ?
+                    WHERE queue = ? AND company = ? AND category = ? AND url = ? AND status IN (?, ?)
+                    """,
+                    (PENDING, now, now, self.name, company, category, url, DONE, DEAD),
+                )
+            return cursor.rowcount > 0
+
+    def lease(self, worker_id: str, lease_seconds: int = LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """Take the oldest ready job (or one whose lease has expired) for ``lease_seconds``"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # An expired lease on the last attempt means the job keeps killing or stalling workers
+                for job_id, attempts in self._conn.execute(
+                    """
+                    SELECT job_id, attempts FROM work_jobs
+                    WHERE queue = ? AND status = ? AND lease_expires <= ? AND attempts >= max_attempts
+                    """,
+                    (self.name, LEASED, now),
+                ).fetchall():
+                    self._conn.execute(
+                        """
+                        UPDATE work_jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, last_error = ?,
+                            updated_at = ?
+                        WHERE job_id = ?
+                        """,
+                        (DEAD, expired_lease_error(attempts), now, job_id),
+                    )
+                    logger.warning(f"Dead-lettered job {job_id}: {expired_lease_error(attempts)}")
+                row = self._conn.execute(
+                    """
+                    SELECT job_id FROM work_jobs
+                    WHERE queue = ? AND ((status = ? AND available_at <= ?) OR (status = ? AND lease_expires <= ?))
+                    ORDER BY available_at, job_id LIMIT 1
+                    """,
+                    (self.name, PENDING, now, LEASED, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    """
+                    UPDATE work_jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1,
+                        updated_at = ?
+                    WHERE job_id = ?
+                    """,
+                    (LEASED, worker_id, now + lease_seconds, now, row[0]),
+                )
+                job = self._conn.execute(
+                    "SELECT job_id, company, category, url, payload, attempts, max_attempts FROM work_jobs WHERE job_id = ?",
+                    (row[0],),
+                ).fetchone()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return {
+            'job_id': job[0], 'company': job[1], 'category': job[2], 'url': job[3],
+            'payload': json.loads(job[4] or '{}'), 'attempts': job[5], 'max_attempts': job[6],
+            'lease_owner': worker_id,
+        }
+
+    def extend(self, job: Dict[str, Any], lease_seconds: int = LEASE_SECONDS) -> bool:
+        """Renew a lease for a long-running job; False if the lease was lost"""
+        return self._finish(job, "lease_expires = ?", (time.time() + lease_seconds,), status=LEASED)
+
+    def complete(self, job: Dict[str, Any]) -> bool:
+        return self._finish(job, "lease_owner = NULL, lease_expires = NULL", (), status=DONE)
+
+    def fail(self, job: Dict[str, Any], error: str) -> str:
+        """Schedule a retry with backoff, or dead-letter the job; returns the new status"""
+        status = DEAD if job['attempts'] >= job['max_attempts'] else PENDING
+        self._finish(
+            job, "lease_owner = NULL, lease_expires = NULL, available_at = ?, last_error = ?",
+            (time.time() + retry_delay(job['attempts']), error[:2000]), status=status,
+        )
+        return status
+
+    def claim(self, key: str, owner: str, ttl: int = CLAIM_TTL) -> bool:
+        """Reserve ``key`` (e.g. a page URL) for ``owner``; False if someone else holds a live claim"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO work_claims (queue, claim_key, owner, expires_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (queue, claim_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE work_claims.expires_at <= ? OR work_claims.owner = excluded.owner
+                """,
+                (self.name, key, owner, now + ttl, now),
+            )
+            return cursor.rowcount > 0
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, company, category, url, attempts, last_error FROM work_jobs WHERE queue = ? AND status = ?",
+                (self.name, DEAD),
+            ).fetchall()
+        return [
+            {'job_id': r[0], 'company': r[1], 'category': r[2], 'url': r[3], 'attempts': r[4], 'last_error': r[5]}
+            for r in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM work_jobs WHERE queue = ? GROUP BY status", (self.name,)
+            ).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        self._conn.close()
+
+    def _finish(self, job: Dict[str, Any], assignments: str, params: tuple, status: str) -> bool:
+        # Only the current lease holder may change a leased job
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE work_jobs SET status = ?, {assignments}, updated_at = ? "
+                "WHERE job_id = ? AND status = ? AND lease_owner = ?",
+                (status, *params, time.time(), job['job_id'], LEASED, job['lease_owner']),
+            )
+            return cursor.rowcount > 0
+
+
+# Moves expired leases back to the ready set (or dead-letters them on their last
+# attempt), then pops the first ready job and leases it
+_REDIS_LEASE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for _, id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], id)
+    local job = cjson.decode(redis.call('HGET', KEYS[3], id))
+    if job['attempts'] >= job['max_attempts'] then
+        job['status'] = 'dead'
+        job['lease_owner'] = nil
+        job['last_error'] = 'Lease expired after ' .. job['attempts'] .. ' attempts'
+        redis.call('HSET', KEYS[3], id, cjson.encode(job))
+        redis.call('SADD', KEYS[4], id)
+    else
+        redis.call('ZADD', KEYS[1], ARGV[1], id)
+    end
+end
+local ready = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 1)
+if #ready == 0 then return nil end
+local id = ready[1]
+redis.call('ZREM', KEYS[1], id)
+redis.call('ZADD', KEYS[2], ARGV[2], id)
+local job = cjson.decode(redis.call('HGET', KEYS[3], id))
+job['attempts'] = job['attempts'] + 1
+job['lease_owner'] = ARGV[3]
+job['status'] = 'leased'
+local encoded = cjson.encode(job)
+redis.call('HSET', KEYS[3], id, encoded)
+return encoded
+"""
+
+# Applies a state change only if the caller still holds the lease
+_REDIS_FINISH_SCRIPT = """
+local raw = redis.call('HGET', KEYS[3], ARGV[1])
+if not raw then return 0 end
+local job = cjson.decode(raw)
+if job['status'] ~= 'leased' or job['lease_owner'] ~= ARGV[2] then return 0 end
+redis.call('ZREM', KEYS[2], ARGV[1])
+job['status'] = ARGV[3]
+if ARGV[3] == 'leased' then
+    redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+    return 1
+end
+job['lease_owner'] = nil
+if ARGV[3] == 'pending' then
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[1])
+elseif ARGV[3] == 'dead' then
+    redis.call('SADD', KEYS[4], ARGV[1])
+end
+if ARGV[5] ~= '' then job['last_error'] = ARGV[5] end
+redis.call('HSET', KEYS[3], ARGV[1], cjson.encode(job))
+return 1
+"""
+
+
+class RedisWorkQueue:
+    """Work queue on a Redis-protocol server, for workers on several machines"""
+
+    def __init__(self, url: str, name: str = 'crawl'):
+        import redis  # optional dependency, only needed for this backend
+
+        self.name = name
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        prefix = f"work_queue:{name}"
+        self._ready, self._leased = f"{prefix}:ready", f"{prefix}:leased"
+        self._jobs, self._dead, self._keys = f"{prefix}:jobs", f"{prefix}:dead", f"{prefix}:keys"
+        self._claims = f"{prefix}:claim:"
+        self._lease_script = self._redis.register_script(_REDIS_LEASE_SCRIPT)
+        self._finish_script = self._redis.register_script(_REDIS_FINISH_SCRIPT)
+
+    def put(self, company: str, category: str, url: str, payload: Optional[Dict[str, Any]] = None,
+            max_attempts: int = MAX_ATTEMPTS, requeue_done: bool = False) -> bool:
+        key = job_key(company, category, url)
+        job_id = self._redis.hget(self._keys, key)
+        if job_id is not None:
+            job = json.loads(self._redis.hget(self._jobs, job_id) or '{}')
+            if not requeue_done or job.get('status') not in (DONE, DEAD):
+                return False
+        else:
+            job_id = str(self._redis.incr(f"work_queue:{self.name}:next_id"))
+            # Another producer may have enqueued the same job meanwhile
+            if not self._redis.hsetnx(self._keys, key, job_id):
+                return False
+        job = {
+            'job_id': job_id, 'company': company, 'category': category, 'url': url,
+            'payload': payload or {}, 'attempts': 0, 'max_attempts': max_attempts, 'status': PENDING,
+        }
+        pipe = self._redis.pipeline()
+        pipe.hset(self._jobs, job_id, json.dumps(job))
+        pipe.srem(self._dead, job_id)
+        pipe.zadd(self._ready, {job_id: time.time()})
+        pipe.execute()
+        return True
+
+    def lease(self, worker_id: str, lease_seconds: int = LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        raw = self._lease_script(keys=[self._ready, self._leased, self._jobs, self._dead],
+                                 args=[now, now + lease_seconds, worker_id])
+        if not raw:
+            return None
+        job = json.loads(raw)
+        # cjson turns an empty payload object into an empty list
+        job['payload'] = job.get('payload') or {}
+        return job
+
+    def extend(self, job: Dict[str, Any], lease_seconds: int = LEASE_SECONDS) -> bool:
+        return self._finish(job, LEASED, time.time() + lease_seconds)
+
+    def complete(self, job: Dict[str, Any]) -> bool:
+        return self._finish(job, DONE, 0)
+
+    def fail(self, job: Dict[str, Any], error: str) -> str:
+        status = DEAD if job['attempts'] >= job['max_attempts'] else PENDING
+        self._finish(job, status, time.time() + retry_delay(job['attempts']), error[:2000])
+        return status
+
+    def claim(self, key: str, owner: str, ttl: int = CLAIM_TTL) -> bool:
+        name = self._claims + key
+        if self._redis.set(name, owner, nx=True, ex=ttl):
+            return True
+        return self._redis.get(name) == owner
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        ids = list(self._redis.smembers(self._dead))
+        jobs = [json.loads(raw) for raw in self._redis.hmget(self._jobs, ids) if raw] if ids else []
+        return [{k: job.get(k) for k in ('job_id', 'company', 'category', 'url', 'attempts', 'last_error')}
+                for job in jobs]
+
+    def stats(self) -> Dict[str, int]:
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, DEAD: 0}
+        for raw in self._redis.hvals(self._jobs):
+            status = json.loads(raw).get('status', PENDING)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def close(self):
+        self._redis.close()
+
+    def _finish(self, job: Dict[str, Any], status: str, score: float, error: str = '') -> bool:
+        return bool(self._finish_script(keys=[self._ready, self._leased, self._jobs, self._dead],
+                                        args=[job['job_id'], job['lease_owner'], status, score, error]))
+
+
+def open_work_queue(url: str = WORK_QUEUE_URL, name: str = 'crawl'):
+    """Queue backend for a ``sqlite:///path`` or ``redis://`` URL"""
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisWorkQueue(url, name)
+    if url.startswith('sqlite:///'):
+        return SQLiteWorkQueue(Path(url[len('sqlite:///'):]), name)
+    raise ValueError(f"Unsupported work queue URL: {url}")